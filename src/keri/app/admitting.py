@@ -0,0 +1,185 @@
+# -*- encoding: utf-8 -*-
+"""
+KERI
+keri.app.admitting module
+
+Admission control for witness and mailbox endpoints
+"""
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class Bucket:
+    """
+    Token bucket refilled continuously at .rate tokens per second up to .burst tokens
+
+    Attributes:
+        rate (float): tokens added per second
+        burst (float): maximum number of tokens held
+        tokens (float): tokens currently held
+        stamp (float): monotonic time tokens was last refilled
+
+    """
+    rate: float
+    burst: float
+    tokens: float
+    stamp: float
+
+    def take(self, now):
+        """ Returns True and removes one token if one is available at now """
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens < 1.0:
+            return False
+
+        self.tokens -= 1.0
+        return True
+
+    def wait(self):
+        """ Returns seconds until the next token is available """
+        return max(0.0, (1.0 - self.tokens) / self.rate) if self.rate else float("inf")
+
+
+class Admitter:
+    """
+    Admission control for requests to a witness by source IP address and source AID.
+
+    Every request must take a token from the bucket of its IP address.  Requests from a
+    priority source, the controllers the witness is witnessing for, are exempt from the
+    AID rate limit and only shed when the receive backlog exceeds .backlogMax.  Priority is
+    claimed by unverified messages so the IP bucket still bounds what any one address can
+    send.  Other requests must also take a token from the bucket of their AID when known,
+    and are shed once the backlog exceeds .backlogHigh so that third party traffic gives way
+    to the witness's own controllers before the node is saturated.
+    Mailbox streams are limited to .streamMax open in total and .aidStreams per AID.  A stream
+    slot is released when its stream closes or once it is older than .streamAge so slots of
+    streams whose client went away without the stream being closed are not held forever.
+
+    Buckets idle long enough to have refilled are dropped by .prune so the tables do
+    not grow with the number of distinct sources seen.
+
+    """
+
+    MaxSources = 10000  # bucket table size at which full buckets are pruned
+
+    def __init__(self, rate=10.0, burst=20.0, ipRate=50.0, ipBurst=100.0, backlogHigh=1048576,
+                 backlogMax=4194304, streamMax=1000, aidStreams=4, streamAge=300.0):
+        """
+        Parameters:
+            rate (float): requests per second allowed per source AID
+            burst (float): requests allowed in a burst per source AID
+            ipRate (float): requests per second allowed per source IP address
+            ipBurst (float): requests allowed in a burst per source IP address
+            backlogHigh (int): backlog in bytes above which non priority requests are shed
+            backlogMax (int): backlog in bytes above which all requests are shed
+            streamMax (int): maximum number of open mailbox streams
+            aidStreams (int): maximum number of open mailbox streams per AID
+            streamAge (float): seconds after which the slot of an open mailbox stream expires
+
+        """
+        self.rate = rate
+        self.burst = burst
+        self.ipRate = ipRate
+        self.ipBurst = ipBurst
+        self.backlogHigh = backlogHigh
+        self.backlogMax = backlogMax
+        self.streamMax = streamMax
+        self.aidStreams = aidStreams
+        self.streamAge = streamAge
+        self.aids = dict()  # source AID to Bucket
+        self.ips = dict()  # source IP address to Bucket
+        self.streams = dict()  # AID to list of monotonic times its open mailbox streams were opened, oldest first
+
+    def admit(self, ip, aid=None, priority=False, backlog=0, now=None):
+        """ Returns (admitted, retry) for one request, retry is seconds to wait when not admitted
+
+        Raises no exceptions so callers map the result to their own status codes, shed requests
+        are distinguished from rate limited ones by .shed.
+
+        Parameters:
+            ip (str): source IP address of request
+            aid (str): qb64 source AID of request if known
+            priority (bool): True means request is from a controller of this witness
+            backlog (int): current receive backlog in bytes
+            now (float): monotonic time, defaults to now
+
+        """
+        now = now if now is not None else time.monotonic()
+
+        if self.shed(priority=priority, backlog=backlog):
+            return False, 1.0
+
+        bucket = self.bucket(self.ips, ip, self.ipRate, self.ipBurst, now)
+        if not bucket.take(now):
+            return False, bucket.wait()
+
+        if aid is not None and not priority:
+            bucket = self.bucket(self.aids, aid, self.rate, self.burst, now)
+            if not bucket.take(now):
+                return False, bucket.wait()
+
+        return True, 0.0
+
+    def shed(self, priority=False, backlog=0):
+        """ Returns True when backlog is too large to accept a request with priority """
+        return backlog > (self.backlogMax if priority else self.backlogHigh)
+
+    def open(self, aid, now=None):
+        """ Returns True and counts a new mailbox stream for aid if within limits
+
+        Parameters:
+            aid (str): qb64 AID the mailbox stream is for
+            now (float): monotonic time, defaults to now
+
+        """
+        now = now if now is not None else time.monotonic()
+        self.expire(now)
+
+        if sum(len(stamps) for stamps in self.streams.values()) >= self.streamMax or \
+                len(self.streams.get(aid, [])) >= self.aidStreams:
+            return False
+
+        self.streams.setdefault(aid, []).append(now)
+        return True
+
+    def close(self, aid, stamp=None):
+        """ Uncount a mailbox stream for aid previously counted by .open
+
+        Parameters:
+            aid (str): qb64 AID the mailbox stream is for
+            stamp (float): time given to .open for the stream, None means oldest stream of aid
+
+        """
+        stamps = self.streams.get(aid, [])
+        if stamp is None and stamps:
+            stamps.pop(0)
+        elif stamp in stamps:  # not expired already
+            stamps.remove(stamp)
+
+        if not stamps:
+            self.streams.pop(aid, None)
+
+    def expire(self, now):
+        """ Release slots of mailbox streams opened more than .streamAge before now """
+        for aid in list(self.streams.keys()):
+            stamps = [stamp for stamp in self.streams[aid] if now - stamp < self.streamAge]
+            if stamps:
+                self.streams[aid] = stamps
+            else:
+                del self.streams[aid]
+
+    def bucket(self, buckets, key, rate, burst, now):
+        """ Returns bucket for key in buckets creating a full one if missing """
+        if key not in buckets:
+            if len(buckets) >= self.MaxSources:
+                self.prune(buckets, now)
+            buckets[key] = Bucket(rate=rate, burst=burst, tokens=burst, stamp=now)
+        return buckets[key]
+
+    @staticmethod
+    def prune(buckets, now):
+        """ Remove buckets that would be full at now, they are equivalent to new buckets """
+        for key in [key for key, bucket in buckets.items()
+                    if bucket.tokens + (now - bucket.stamp) * bucket.rate >= bucket.burst]:
+            del buckets[key]
@@ -23,17 +23,23 @@ logger = help.ogler.getLogger()
 
 class WitnessReceiptor(doing.DoDoer):
     """
-    Sends messages to all current witnesses of given identifier (from hab) and waits
-    for receipts from each of those witnesses and propagates those receipts to each
-    of the other witnesses after receiving the complete set.
+    Sends messages to all current witnesses of given identifier (from hab) concurrently and
+    waits for receipts from those witnesses.  Each event is cued as complete as soon as the
+    threshold of accountable duplicity (TOAD) is met.  Receipts are streamed to the other
+    witnesses as they arrive and propagation of late receipts continues in the background
+    until every witness has the full receipt set.
 
-    Removes all Doers and exits as Done once all witnesses have been sent the entire
-    receipt set.  Could be enhanced to have a `once` method that runs once and cleans up
-    and an `all` method that runs and waits for more messages to receipt.
+    Tracks the latency of the most recent receipt from each witness in .latencies.  The
+    .idle property is True once every event has been fully propagated, or has given up on
+    the witnesses that did not answer within .timeout, so short lived callers can wait for
+    background propagation before exiting.
 
     """
 
-    def __init__(self, hby, msgs=None, cues=None, **kwa):
+    Linger = 1.0  # seconds witness connections stay open after the last receipt is sent
+    Timeout = 30.0  # seconds to wait for receipts and propagation of one event
+
+    def __init__(self, hby, msgs=None, cues=None, timeout=None, **kwa):
         """
         For the current event, gather the current set of witnesses, send the event,
         gather all receipts and send them to all other witnesses
@@ -41,15 +47,26 @@ class WitnessReceiptor(doing.DoDoer):
         Parameters:
             hby (Habery): Habitat of the identifier to receipt witnesses
             msgs (Deck): incoming messages to publish to witnesses
-            cues (Deck): outgoing cues of successful messages
+            cues (Deck): outgoing cues of messages that met their TOAD, or with kin "timeout" and
+                the unanswered witnesses of messages that timed out before meeting it
+            timeout (float): seconds to wait for receipts of one event, defaults to .Timeout
 
         """
         self.hby = hby
         self.msgs = msgs if msgs is not None else decking.Deck()
         self.cues = cues if cues is not None else decking.Deck()
+        self.timeout = timeout if timeout is not None else self.Timeout
+        self.unanswered = dict()  # (prefix, sn) of timed out event to witnesses without receipts
+        self.latencies = dict()  # witness prefix to seconds between send and receipt of last event
+        self.eventers = []  # doers of events still being receipted or propagated
 
         super(WitnessReceiptor, self).__init__(doers=[doing.doify(self.receiptDo)], **kwa)
 
+    @property
+    def idle(self):
+        """ True when no events are waiting for receipts or receipt propagation """
+        return not self.msgs and not self.eventers
+
     def receiptDo(self, tymth=None, tock=0.0):
         """
         Returns doifiable Doist compatible generator method (doer dog)
@@ -89,80 +106,117 @@ class WitnessReceiptor(doing.DoDoer):
                 dgkey = dbing.dgKey(ser.preb, ser.saidb)
 
                 # Check to see if we already have all the receipts we need for this event
-                wigs = hab.db.getWigs(dgkey)
-                if len(wigs) == len(wits):  # We have all the receipts, skip
+                if hab.db.cntWigs(dgkey) == len(wits):  # We have all the receipts, skip
                     self.cues.append(evt)
                     continue
 
-                witers = []
-                for wit in wits:
-                    witer = witnesser(hab, wit)
+                eventer = doing.doify(self.eventDo, evt=evt, hab=hab, sn=sn, msg=msg)
+                self.eventers.append(eventer)
+                self.extend([eventer])
 
-                    witers.append(witer)
-                    if "ba" in ser.ked and wit in ser.ked["ba"]:  # Newly added witness, must send full KEL to catch up
-                        for msg in hab.db.clonePreIter(pre=pre):
-                            witer.msgs.append(msg)
+            if done := [eventer for eventer in self.eventers if eventer.done is not None and eventer.done]:
+                self.remove(done)
+                self.eventers = [eventer for eventer in self.eventers if eventer not in done]
 
-                    witer.msgs.append(bytearray(msg))  # make a copy
-                    self.extend([witer])
+            yield self.tock
 
-                    _ = (yield self.tock)
+    def eventDo(self, tymth=None, tock=0.0, evt=None, hab=None, sn=0, msg=None):
+        """
+        Returns doifiable Doist compatible generator method (doer dog) that fans out
+        one event to all witnesses, cues it at TOAD and propagates receipts until
+        every witness has the full set.
+
+        Parameters:
+            tymth is injected function wrapper closure returned by .tymen() of
+                Tymist instance. Calling tymth() returns associated Tymist .tyme.
+            tock is injected initial tock value
+            evt (dict): the cued request being receipted
+            hab (Hab): environment of the controller of the event
+            sn (int): sequence number of the event
+            msg (bytes): the signed event
+
+        """
+        self.wind(tymth)
+        self.tock = tock
+        _ = (yield self.tock)
+
+        ser = coring.Serder(raw=msg)
+        wits = hab.kever.wits
+        toad = hab.kever.toad if hab.kever.toad else len(wits)
+        dgkey = dbing.dgKey(ser.preb, ser.saidb)
+        start = self.tyme
 
-                while True:
-                    wigs = hab.db.getWigs(dgkey)
-                    if len(wigs) == len(wits):
-                        break
-                    _ = yield self.tock
-
-                # generate all rct msgs to send to all witnesses
-                awigers = [coring.Siger(qb64b=bytes(wig)) for wig in wigs]
-
-                # make sure all witnesses have fully receipted KERL and know about each other
-                for witer in witers:
-                    ewits = []
-                    wigers = []
-                    for i, wit in enumerate(wits):
-                        if wit == witer.wit:
-                            continue
-                        ewits.append(wit)
-                        wigers.append(awigers[i])
-
-                    if len(wigers) == 0:
+        witers = []
+        for wit in wits:
+            witer = witnesser(hab, wit)
+            witers.append(witer)
+            if "ba" in ser.ked and wit in ser.ked["ba"]:  # Newly added witness, must send full KEL to catch up
+                for kmsg in hab.db.clonePreIter(pre=ser.pre):
+                    witer.msgs.append(kmsg)
+
+            witer.msgs.append(bytearray(msg))  # make a copy
+
+        self.extend(witers)  # fan out to all witnesses at once
+
+        wigers = dict()  # witness prefix to receipt signature
+        sent = {witer.wit: set() for witer in witers}  # witness prefix to witnesses whose receipts it has
+        cued = False
+        while len(wigers) < len(wits) or any(len(sent[witer.wit]) < len(wits) - 1 for witer in witers):
+            if self.tyme - start > self.timeout:  # give up on witnesses that have not answered
+                self.unanswered[(ser.pre, sn)] = [wit for wit in wits if wit not in wigers]
+                logger.error("Witness receipts of event %s sn %s timed out waiting on %s",
+                             ser.pre, sn, self.unanswered[(ser.pre, sn)])
+                if not cued:  # toad never met so report the failure instead
+                    self.cues.append(dict(evt, kin="timeout", wits=self.unanswered[(ser.pre, sn)]))
+                break
+
+            if hab.db.cntWigs(dgkey) > len(wigers):
+                for wig in hab.db.getWigsIter(dgkey):
+                    wiger = coring.Siger(qb64b=bytes(wig))
+                    if wiger.index >= len(wits):
                         continue
+                    wit = wits[wiger.index]
+                    if wit not in wigers:
+                        wigers[wit] = wiger
+                        self.latencies[wit] = self.tyme - start
+
+            if not cued and len(wigers) >= toad:
+                self.cues.append(evt)
+                cued = True
+
+            # stream receipts received so far to the witnesses that do not yet have them
+            for witer in witers:
+                ewits = [wit for wit in wits if wit in wigers and wit != witer.wit and wit not in sent[witer.wit]]
+                if not ewits:
+                    continue
 
-                    rctMsg = bytearray()
+                rctMsg = bytearray()
 
-                    # Now that the witnesses have not met each other, send them each other's receipts
+                # Witnesses may not have met each other, introduce them on first send
+                if not sent[witer.wit]:
                     if ser.ked['t'] in (coring.Ilks.icp, coring.Ilks.dip):  # introduce new witnesses
-                        rctMsg.extend(self.replay(eids=ewits))
+                        rctMsg.extend(self.replay(eids=[wit for wit in wits if wit != witer.wit]))
                     elif ser.ked['t'] in (coring.Ilks.rot, coring.Ilks.drt) and \
                             ("ba" in ser.ked and witer.wit in ser.ked["ba"]):  # Newly added witness, introduce to all
-                        rctMsg.extend(self.replay(eids=ewits))
+                        rctMsg.extend(self.replay(eids=[wit for wit in wits if wit != witer.wit]))
 
-                    rserder = eventing.receipt(pre=ser.pre,
-                                               sn=sn,
-                                               said=ser.said)
-                    rctMsg.extend(eventing.messagize(serder=rserder, wigers=wigers))
+                rserder = eventing.receipt(pre=ser.pre,
+                                           sn=sn,
+                                           said=ser.said)
+                rctMsg.extend(eventing.messagize(serder=rserder, wigers=[wigers[wit] for wit in ewits]))
 
-                    witer.msgs.append(rctMsg)
-                    _ = (yield self.tock)
+                witer.msgs.append(rctMsg)
+                sent[witer.wit].update(ewits)
 
-                while True:
-                    done = True
-                    for witer in witers:
-                        if not witer.idle:
-                            yield 1.0
-                            done = False
-                            break
-                    if done:
-                        break
+            _ = yield self.tock
 
-                self.remove(witers)
+        while not all(witer.idle for witer in witers) and self.tyme - start <= self.timeout:
+            yield self.tock
 
-                self.cues.append(evt)
-                yield self.tock
+        yield self.Linger  # keep connections open long enough for witnesses to consume the last send
 
-            yield self.tock
+        self.remove(witers)
+        return True
 
     def replay(self, eids):
         msgs = bytearray()
@@ -466,8 +520,17 @@ class HttpWitnesser(doing.DoDoer):
     """
     Interacts with Witnesses on HTTP and SSE for sending events and receiving receipts
 
+    Messages are posted as bulk CESR stream requests of at most CESR_BULK_MAX_SIZE bytes unless
+    the witness refuses the bulk content type with 406 or 415, then that request is resent and
+    all later ones are posted one request per message.  A bulk request failing with any other
+    status, such as 413, is resent one request per message.  A failing request for one message
+    is retried up to Retries times before its response is added to .sent.
+
     """
 
+    Refused = (406, 415)  # response statuses of witnesses that do not accept bulk CESR streams
+    Retries = 3  # times a failing request for one message is resent
+
     def __init__(self, hab, wit, url, msgs=None, sent=None, doers=None, **kwa):
         """
         For the current event, gather the current set of witnesses, send the event,
@@ -480,6 +543,8 @@ class HttpWitnesser(doing.DoDoer):
         self.hab = hab
         self.wit = wit
         self.posted = 0
+        self.bulk = True  # False once the witness has refused a bulk request
+        self.pending = decking.Deck()  # (body, bulk, tries) of each posted request, in posting order
         self.msgs = msgs if msgs is not None else decking.Deck()
         self.sent = sent if sent is not None else decking.Deck()
         self.parser = None
@@ -512,8 +577,7 @@ class HttpWitnesser(doing.DoDoer):
             while not self.msgs:
                 yield self.tock
 
-            msg = self.msgs.popleft()
-            self.posted += httping.streamCESRRequests(client=self.client, ims=msg)
+            self.post(self.msgs.popleft())
             while self.client.requests:
                 yield self.tock
 
@@ -530,11 +594,71 @@ class HttpWitnesser(doing.DoDoer):
 
         while True:
             while self.client.responses:
-                rep = self.client.respond()
-                self.sent.append(rep)
+                self.respond(self.client.respond())
                 yield
             yield
 
+    def post(self, msg):
+        """ Post msg as bulk requests or, for queries and refusing witnesses, one request per message
+
+        Parameters:
+            msg (bytearray): stream of KERI messages with attachments, consumed
+
+        """
+        bulk = self.bulk and coring.Serder(raw=msg).ked["t"] != coring.Ilks.qry  # queries need mailbox stream
+        for body in httping.splitCESRStream(msg, limit=httping.CESR_BULK_MAX_SIZE if bulk else 0):
+            self.request(body, bulk)
+
+    def request(self, body, bulk, tries=0):
+        """ Post body as one request and remember it until its response arrives
+
+        Parameters:
+            body (bytes): KERI messages with attachments, a single message unless bulk
+            bulk (bool): True means post body as a bulk CESR stream request
+            tries (int): number of times body has been posted before
+
+        """
+        if bulk:
+            httping.bulkCESRRequest(client=self.client, ims=bytearray(body))
+        else:
+            httping.streamCESRRequests(client=self.client, ims=bytearray(body))
+        self.pending.append((body, bulk, tries))
+        self.posted += 1
+
+    def respond(self, rep):
+        """ Add response rep to .sent, resending failed requests
+
+        Parameters:
+            rep (Response): response of next posted request
+
+        """
+        body, bulk, tries = self.pending.popleft() if self.pending else (None, False, 0)
+        if body is None or 200 <= rep.status < 300:
+            self.sent.append(rep)
+            return
+
+        if bulk:
+            if rep.status in self.Refused:
+                logger.info("Witness %s refused bulk CESR request, falling back to one request per message",
+                            self.wit)
+                self.bulk = False
+            else:
+                logger.info("Witness %s failed bulk CESR request with %s, resending one request per message",
+                            self.wit, rep.status)
+            self.posted -= 1
+            for msg in httping.splitCESRStream(bytearray(body), limit=0):
+                self.request(msg, False)
+            return
+
+        if tries < self.Retries:
+            logger.info("Witness %s failed request with %s, retrying", self.wit, rep.status)
+            self.posted -= 1
+            self.request(body, False, tries + 1)
+            return
+
+        logger.error("Witness %s failed request with %s after %s retries", self.wit, rep.status, tries)
+        self.sent.append(rep)
+
     @property
     def idle(self):
         return self.posted == len(self.sent)
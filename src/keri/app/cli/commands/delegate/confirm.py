@@ -130,6 +130,12 @@ class ConfirmDoer(doing.DoDoer):
                             while not witDoer.cues:
                                 _ = yield self.tock
 
+                            cue = witDoer.cues.popleft()
+                            if cue.get("kin") == "timeout":
+                                print(f"Timed out waiting for receipts from witnesses {', '.join(cue['wits'])}")
+                                self.remove([self.hbyDoer, self.mbx, self.witq, witDoer])
+                                return False
+
                         print(f'Delegagtor Prefix  {hab.pre}')
                         print(f'\tDelegate {eserder.pre} {typ} Anchored at Seq. No.  {hab.kever.sn}')
 
@@ -143,6 +143,12 @@ class InceptDoer(doing.DoDoer):
             while not self.witDoer.cues:
                 _ = yield self.tock
 
+            cue = self.witDoer.cues.popleft()
+            if cue.get("kin") == "timeout":
+                print(f"Timed out waiting for receipts from witnesses {', '.join(cue['wits'])}")
+                self.remove([self.hbyDoer, self.witDoer, self.mbx, self.swain, self.postman])
+                return
+
         if hab.kever.delegator:
             yield from self.postman.sendEvent(hab=hab, fn=hab.kever.sn)
 
@@ -151,6 +157,9 @@ class InceptDoer(doing.DoDoer):
             print(f'\tPublic key {idx + 1}:  {verfer.qb64}')
         print()
 
+        while not self.witDoer.idle:  # let late receipts propagate to all witnesses
+            _ = yield self.tock
+
         toRemove = [self.hbyDoer, self.witDoer, self.mbx, self.swain, self.postman]
         self.remove(toRemove)
 
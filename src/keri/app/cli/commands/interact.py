@@ -103,11 +103,20 @@ class InteractDoer(doing.DoDoer):
             while not witDoer.cues:
                 _ = yield self.tock
 
+            cue = witDoer.cues.popleft()
+            if cue.get("kin") == "timeout":
+                print(f"Timed out waiting for receipts from witnesses {', '.join(cue['wits'])}")
+                self.remove([self.hbyDoer, witDoer, mbx])
+                return
+
         print(f'Prefix  {hab.pre}')
         print(f'New Sequence No.  {hab.kever.sn}')
         for idx, verfer in enumerate(hab.kever.verfers):
             print(f'\tPublic key {idx+1}:  {verfer.qb64}')
 
+        while not witDoer.idle:  # let late receipts propagate to all witnesses
+            _ = yield self.tock
+
         toRemove = [self.hbyDoer, witDoer, mbx]
         self.remove(toRemove)
 
@@ -0,0 +1,96 @@
+# -*- encoding: utf-8 -*-
+"""
+KERI
+keri.kli.router module
+
+Reply router benchmark command line interface
+"""
+import argparse
+import json
+import time
+
+from hio.base import doing
+
+from keri.core import eventing, routing
+
+d = "Measures reply dispatch throughput of the reply router against the number of registered routes.\n"
+d += "Example:\nrouter bench --routes 5 50 500 --replies 10000\n"
+parser = argparse.ArgumentParser(description=d)
+parser.set_defaults(handler=lambda args: bench(args))
+parser.add_argument('--routes', '-r', help='numbers of registered routes to measure, default is 5 50 500',
+                    type=int, nargs="+", default=[5, 50, 500])
+parser.add_argument('--replies', '-n', help='replies dispatched for each number of routes, default is 10000',
+                    type=int, default=10000)
+parser.add_argument('--report', help='file to write the JSON report to in addition to stdout',
+                    default=None)
+
+
+def bench(args):
+    """ Command line handler returning the doer of a reply router benchmark """
+    return [doing.doify(benchDo, counts=args.routes, replies=args.replies, path=args.report)]
+
+
+def benchDo(tymth, tock=0.0, **opts):
+    """ Dispatch replies through routers of increasing size and print throughput of each
+
+    Parameters:
+        tymth (function): injected function wrapper closure returned by .tymen() of
+            Tymist instance. Calling tymth() returns associated Tymist .tyme.
+        tock (float): injected initial tock value
+
+    """
+    _ = (yield tock)
+
+    report = [measure(routes=count, replies=opts["replies"]) for count in opts["counts"]]
+    print(json.dumps(report, indent=1))
+    if opts["path"] is not None:
+        with open(opts["path"], "w") as f:
+            json.dump(report, f, indent=1)
+
+    return True
+
+
+class Sink:
+    """ Resource that counts replies dispatched to it """
+
+    def __init__(self):
+        self.count = 0
+
+    def processReply(self, **kwa):
+        self.count += 1
+
+
+def measure(routes, replies):
+    """ Returns dict of reply throughput with routes registered for trie and linear search
+
+    Registers the reply routes of a KERI node plus synthetic ones up to routes and dispatches
+    replies spread evenly over all of them, so on average a linear search tests half the routes.
+
+    Parameters:
+        routes (int): number of registered routes
+        replies (int): number of replies dispatched
+
+    """
+    sink = Sink()
+    rtr = routing.Router()
+    templates = ["/end/role/{action}", "/loc/scheme", "/ksn/{aid}", "/tsn/registry/{aid}", "/tsn/credential/{aid}"]
+    templates.extend(f"/bench/{i}/{{aid}}" for i in range(max(routes - len(templates), 0)))
+    for template in templates[:routes]:
+        rtr.addRoute(template, sink)
+
+    aid = "EWVYH1T4J09x5RePLfVyTfno3aHzJ-YqnL9Bm0Kyx6UE"
+    serders = [eventing.reply(route=template.replace("{aid}", aid).replace("{action}", "add"), data=dict())
+               for template in templates[:routes]]
+
+    report = dict(routes=routes, replies=replies)
+    for kind, find in (("trie", rtr._find), ("linear", rtr._scan)):
+        start = time.perf_counter()
+        for i in range(replies):
+            serder = serders[i % len(serders)]
+            route, _ = find(serder.ked["r"])
+            route.resource.processReply(serder=serder)
+        elapsed = time.perf_counter() - start
+        report[kind] = round(replies / elapsed, 1)
+
+    report["dispatched"] = sink.count
+    return report
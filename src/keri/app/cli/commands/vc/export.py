@@ -11,7 +11,6 @@ from hio import help
 from hio.base import doing
 
 from keri.app.cli.common import existing
-from keri.core import eventing, coring
 from keri.vdr import credentialing
 
 logger = help.ogler.getLogger()
@@ -101,75 +100,26 @@ class ExportDoer(doing.DoDoer):
         self.outputCred(said=self.said)
 
     def outputCred(self, said):
-        creder, sadsigers, sadcigars = self.rgy.reger.cloneCred(said=said)
-        if self.chains:
-            chains = creder.crd["e"]
-            saids = []
-            for key, source in chains.items():
-                if key == 'd':
-                    continue
-
-                if not isinstance(source, dict):
-                    continue
-
-                saids.append(source['n'])
-
-            for said in saids:
-                self.outputCred(said)
-
-        if self.kels:
-            issr = creder.issuer
-            self.outputKEL(issr)
-
-        if self.tels:
-            if creder.status is not None:
-                self.outputTEL(creder.status)
-                self.outputTEL(creder.said)
-
-        if self.files:
-            f = open(f"{creder.said}-acdc.cesr", 'w')
-            f.write(creder.raw.decode("utf-8"))
-            if self.sigs:
-                f.write(eventing.proofize(sadtsgs=sadsigers, sadcigars=sadcigars, pipelined=True).decode("utf-8"))
-            f.close()
-        else:
-            sys.stdout.write(creder.raw.decode("utf-8"))
-            if self.sigs:
-                sys.stdout.write(eventing.proofize(sadtsgs=sadsigers, sadcigars=sadcigars, pipelined=True).decode(
-                    "utf-8"))
-
-            sys.stdout.flush()
-
-    def outputTEL(self, regk):
-        f = None
-        if self.files:
-            f = open(f"{regk}-tel.cesr", "w")
-
-        for msg in self.rgy.reger.clonePreIter(pre=regk):
-            if f is not None:
-                f.write(msg.decode("utf-8"))
-            else:
-                serder = coring.Serder(raw=msg)
-                atc = msg[serder.size:]
-                sys.stdout.write(serder.raw.decode("utf-8"))
-                sys.stdout.write(atc.decode("utf-8"))
-
-        if f is not None:
-            f.close()
-
-    def outputKEL(self, pre):
+        """ Stream credential said and its related material to files or stdout, each KEL, TEL and
+        chained credential once
+        """
         f = None
-        if self.files:
-            f = open(f"{pre}-kel.cesr", "w")
-
-        for msg in self.hby.db.clonePreIter(pre=pre):
-            if f is not None:
+        name = None
+        for kind, key, msg in self.rgy.reger.exportIter(saids=[said],
+                                                        db=self.hby.db if self.kels else None,
+                                                        sigs=self.sigs,
+                                                        tels=self.tels,
+                                                        chains=self.chains):
+            if self.files:
+                if name != f"{key}-{kind}.cesr":
+                    if f is not None:
+                        f.close()
+                    name = f"{key}-{kind}.cesr"
+                    f = open(name, "w")
                 f.write(msg.decode("utf-8"))
             else:
-                serder = coring.Serder(raw=msg)
-                atc = msg[serder.size:]
-                sys.stdout.write(serder.raw.decode("utf-8"))
-                sys.stdout.write(atc.decode("utf-8"))
+                sys.stdout.write(msg.decode("utf-8"))
 
         if f is not None:
             f.close()
+        sys.stdout.flush()
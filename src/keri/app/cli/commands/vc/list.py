@@ -17,6 +17,7 @@ from keri.app import indirecting
 from keri.app.cli.common import existing, terming
 from keri.core import scheming
 from keri.help import helping
+from keri.vc import walleting
 from keri.vdr import credentialing, verifying
 
 logger = help.ogler.getLogger()
@@ -38,6 +39,9 @@ parser.add_argument("--issued", "-i", help="Display credentials that this AID ha
                     action="store_true")
 parser.add_argument("--said", "-s", help="Display only the SAID of found credentials, one per line.",
                     action="store_true")
+parser.add_argument("--schema", help="Display only credentials of the schema with this SAID.", default=None)
+parser.add_argument("--status", help="Display only credentials with this status.", choices=["issued", "revoked"],
+                    default=None)
 
 
 def list_credentials(args):
@@ -51,17 +55,22 @@ def list_credentials(args):
                   verbose=args.verbose,
                   poll=args.poll,
                   said=args.said,
-                  issued=args.issued)
+                  issued=args.issued,
+                  schema=args.schema,
+                  status=args.status)
     return [ld]
 
 
 class ListDoer(doing.DoDoer):
 
-    def __init__(self, name, alias, base, bran, verbose=False, poll=False, said=False, issued=False):
+    def __init__(self, name, alias, base, bran, verbose=False, poll=False, said=False, issued=False, schema=None,
+                 status=None):
         self.verbose = verbose
         self.poll = poll
         self.said = said
         self.issued = issued
+        self.schema = schema
+        self.status = status
 
         self.hby = existing.setupHby(name=name, base=base, bran=bran)
         self.hab = self.hby.habByName(alias)
@@ -101,17 +110,19 @@ class ListDoer(doing.DoDoer):
                 yield 1.0
             print("\n")
 
+        wallet = walleting.Wallet(reger=self.rgy.reger)
         if self.issued:
-            saids = self.rgy.reger.issus.get(keys=self.hab.pre)
+            saids = wallet.query(issuer=self.hab.pre, schema=self.schema, status=self.status)
         else:
-            saids = self.rgy.reger.subjs.get(keys=self.hab.pre)
+            saids = wallet.query(subject=self.hab.pre, schema=self.schema, status=self.status)
 
         if self.said:
             for said in saids:
                 print(said.qb64)
         else:
             print(f"Current {'issued' if self.issued else 'received'} credentials for {self.hab.name} ({self.hab.pre}):\n")
-            creds = self.rgy.reger.cloneCreds(saids)
+            cache = dict()  # chained credentials shared by credentials are only expanded once
+            creds = (self.rgy.reger.cloneCreds([saider], cache=cache)[0] for saider in saids)
             for idx, cred in enumerate(creds):
                 sad = cred['sad']
                 status = cred["status"]
@@ -0,0 +1,255 @@
+# -*- encoding: utf-8 -*-
+"""
+KERI
+keri.kli.witness module
+
+Witness load testing command line interface
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from hio.base import doing
+
+from keri import kering
+from keri.app import habbing, indirecting, agenting, directing, storing
+from keri.app.cli.commands.witness import start
+from keri.core import coring
+from keri.help import helping
+from keri.vdr import viring
+
+d = "Runs a local pool of witnesses and measures receipt throughput and latency.\n"
+d += "Example:\nwitness bench --witnesses 3 --controllers 10 --events 5 --protocol tcp\n"
+parser = argparse.ArgumentParser(description=d)
+parser.set_defaults(handler=lambda args: bench(args))
+parser.add_argument('--witnesses', '-w', help='number of witnesses in the pool, default is 3',
+                    type=int, default=3)
+parser.add_argument('--controllers', '-c', help='number of synthetic controllers, default is 10',
+                    type=int, default=10)
+parser.add_argument('--events', '-e', help='events per controller including inception, default is 5',
+                    type=int, default=5)
+parser.add_argument('--toad', help='witness threshold of each controller, default is all witnesses',
+                    type=int, default=None)
+parser.add_argument('--protocol', help='protocol controllers use to reach witnesses, default is tcp',
+                    choices=[kering.Schemes.tcp, kering.Schemes.http], default=kering.Schemes.tcp)
+parser.add_argument('-T', '--tcp', help='first local TCP port of the witness pool, default is 5700',
+                    type=int, default=5700)
+parser.add_argument('-H', '--http', help='first local HTTP port of the witness pool, default is 5800',
+                    type=int, default=5800)
+parser.add_argument('--report', help='file to write the JSON report to in addition to stdout',
+                    default=None)
+parser.add_argument('--workers', help='run each witness in its own processes with this many workers as '
+                                      'witness start does, default runs the pool in this process',
+                    type=int, default=None)
+
+
+def bench(args):
+    """ Command line handler returning the doers of a witness load test """
+    return [Bencher(witnesses=args.witnesses,
+                    controllers=args.controllers,
+                    events=args.events,
+                    toad=args.toad,
+                    protocol=args.protocol,
+                    tcpPort=args.tcp,
+                    httpPort=args.http,
+                    path=args.report,
+                    workers=args.workers)]
+
+
+class Bencher(doing.DoDoer):
+    """ Load test of a local witness pool
+
+    Runs a pool of in process witnesses on consecutive localhost ports and drives a set of
+    synthetic controllers against it.  Each controller incepts with every witness of the pool
+    and then alternates rotations and interactions, submitting its next event as soon as the
+    previous one reaches its witness threshold.  When all events are receipted .report holds
+    throughput, receipt latency percentiles and the largest witness escrow backlog observed.
+
+    With workers each witness is instead launched by witness start's runWitness in a process
+    of its own with that many workers sharing its database, so the pool is measured the way
+    it is deployed.  Timing starts once every witness accepts connections.
+
+    """
+
+    def __init__(self, witnesses=3, controllers=10, events=5, toad=None, protocol=kering.Schemes.tcp,
+                 tcpPort=5700, httpPort=5800, path=None, workers=None):
+        """ Create witness pool and controller environment for load test
+
+        Parameters:
+            witnesses (int): number of witnesses in the pool
+            controllers (int): number of synthetic controllers
+            events (int): number of events per controller including inception
+            toad (int): witness threshold of each controller, all witnesses when None
+            protocol (str): URL scheme controllers use to reach witnesses
+            tcpPort (int): TCP port of first witness, others use consecutive ports
+            httpPort (int): HTTP port of first witness, others use consecutive ports
+            path (str): optional file path to write JSON report to
+            workers (int): worker processes of each witness launched with runWitness, None means
+                           run the pool in this process
+
+        """
+        self.controllers = controllers
+        self.events = events
+        self.toad = toad
+        self.path = path
+        self.report = None
+        self.ports = [tcpPort + i if protocol == kering.Schemes.tcp else httpPort + i for i in range(witnesses)]
+
+        self.whbys = []
+        self.wits = []
+        self.directants = []  # Directant of each witness for its event escrow backlog
+        self.procs = []  # witness processes when run with workers
+        doers = []
+        for i in range(witnesses):
+            alias = f"bench-wit{i}"
+            if workers is None:
+                whby = habbing.Habery(name=alias,
+                                      salt=coring.Salter(raw=f"bench-witness-{i:02}".encode("utf-8")).qb64,
+                                      temp=True)
+                witDoers = indirecting.setupWitness(alias=alias, hby=whby, tcpPort=tcpPort + i,
+                                                    httpPort=httpPort + i)
+                doers.extend(witDoers)
+                self.directants.extend(doer for doer in witDoers if isinstance(doer, directing.Directant))
+                self.whbys.append(whby)
+                self.wits.append(whby.habByName(alias))
+                continue
+
+            base = f"bench-{os.getpid()}"
+            whby = start.openHby(name=alias, base=base)
+            wit = whby.habByName(alias) or whby.makeHab(name=alias, transferable=False)
+            proc = multiprocessing.get_context("spawn").Process(
+                target=launch, kwargs=dict(name=alias, base=base, alias=alias, tcp=tcpPort + i,
+                                           http=httpPort + i, workers=workers))
+            proc.start()
+            self.procs.append(proc)
+            self.directants.append(directing.Directant(hab=wit, server=None))  # only reads shared escrows
+            self.whbys.append(whby)
+            self.wits.append(wit)
+
+        self.hby = habbing.Habery(name="bench", salt=coring.Salter(raw=b"bench-controller").qb64, temp=True)
+        for wit, port in zip(self.wits, self.ports):
+            msgs = bytearray()
+            msgs.extend(wit.makeEndRole(eid=wit.pre, role=kering.Roles.controller, stamp=helping.nowIso8601()))
+            msgs.extend(wit.makeLocScheme(url=f"{protocol}://127.0.0.1:{port}/", scheme=protocol,
+                                          stamp=helping.nowIso8601()))
+            self.hby.psr.parse(ims=msgs)
+
+        self.receiptor = agenting.WitnessReceiptor(hby=self.hby)
+        doers.append(self.receiptor)
+        if protocol == kering.Schemes.http:  # HTTP witnesses return receipts through the mailbox
+            doers.append(indirecting.MailboxDirector(hby=self.hby, topics=["/receipt"]))
+        self.toRemove = list(doers)
+        doers.append(doing.doify(self.benchDo))
+
+        super(Bencher, self).__init__(doers=doers)
+
+    def benchDo(self, tymth, tock=0.0):
+        """ Drive controllers until all events are receipted then report and shut down the pool
+
+        Parameters:
+            tymth (function): injected function wrapper closure returned by .tymen() of
+                Tymist instance. Calling tymth() returns associated Tymist .tyme.
+            tock (float): injected initial tock value
+
+        """
+        self.wind(tymth)
+        self.tock = tock
+        yield self.tock
+
+        while not all(listening(port) for port in self.ports):  # witness processes still starting
+            yield self.tock
+
+        wits = [wit.pre for wit in self.wits]
+        toad = self.toad if self.toad is not None else len(wits)
+        latencies = []
+        lost = 0  # events never receipted because an earlier event of their controller timed out
+        backlog = 0
+        sent = dict()  # controller prefix to perf counter when its current event was submitted
+
+        began = time.perf_counter()
+        for i in range(self.controllers):
+            hab = self.hby.makeHab(name=f"bench-ctl{i}", wits=wits, toad=toad, transferable=True)
+            sent[hab.pre] = time.perf_counter()
+            self.receiptor.msgs.append(dict(pre=hab.pre, sn=0))
+
+        total = self.controllers * self.events
+        while len(latencies) + lost < total:
+            while self.receiptor.cues:
+                cue = self.receiptor.cues.popleft()
+                pre = cue["pre"]
+                if cue.get("kin") == "timeout":  # controller stalls so the rest of its events are lost
+                    lost += self.events - self.hby.habs[pre].kever.sn
+                    continue
+
+                latencies.append(time.perf_counter() - sent[pre])
+
+                hab = self.hby.habs[pre]
+                if hab.kever.sn + 1 < self.events:
+                    if hab.kever.sn % 2 == 0:
+                        hab.rotate()
+                    else:
+                        hab.interact()
+                    sent[pre] = time.perf_counter()
+                    self.receiptor.msgs.append(dict(pre=pre, sn=hab.kever.sn))
+
+            backlog = max(backlog, sum(directant.escrowed() for directant in self.directants))
+            yield self.tock
+
+        elapsed = time.perf_counter() - began
+        self.report = dict(witnesses=len(wits),
+                           controllers=self.controllers,
+                           events=total,
+                           elapsed=round(elapsed, 3),
+                           throughput=round(len(latencies) / elapsed, 3),
+                           p50=round(percentile(latencies, 50), 3),
+                           p99=round(percentile(latencies, 99), 3),
+                           lost=lost,
+                           backlog=backlog)
+
+        print(json.dumps(self.report, indent=1))
+        if self.path is not None:
+            with open(self.path, "w") as f:
+                json.dump(self.report, f, indent=1)
+
+        self.remove(self.toRemove)
+        for proc in self.procs:
+            os.killpg(proc.pid, signal.SIGTERM)  # witness and its workers
+            proc.join()
+        for hby in self.whbys + [self.hby]:
+            hby.close(clear=True)
+        for whby in self.whbys if self.procs else []:  # remove databases the witness processes created
+            whby.cf.close(clear=True)
+            storing.Mailboxer(name=whby.name).close(clear=True)
+            viring.Reger(name=whby.name).close(clear=True)
+
+        return True
+
+
+def launch(**kwa):
+    """ Run one witness with start.runWitness in a process group of its own so it can be stopped
+    together with its workers """
+    os.setpgrp()
+    start.runWitness(**kwa)
+
+
+def listening(port):
+    """ Returns True if a server accepts connections on localhost port """
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+            return True
+    except OSError:
+        return False
+
+
+def percentile(values, p):
+    """ Returns nearest rank p-th percentile of values or 0.0 when values is empty """
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
@@ -7,10 +7,11 @@ Witness command line interface
 """
 import argparse
 import logging
+import multiprocessing
 
 from keri import __version__
 from keri import help
-from keri.app import directing, indirecting, habbing, keeping
+from keri.app import admitting, directing, indirecting, habbing, keeping, storing
 from keri.app.cli.common import existing
 
 d = "Runs KERI witness controller.\n"
@@ -38,6 +39,18 @@ parser.add_argument('--base', '-b', help='additional optional prefix to file loc
 parser.add_argument('--alias', '-a', help='human readable alias for the new identifier prefix', required=True)
 parser.add_argument('--passcode', '-p', help='22 character encryption passcode for keystore (is not saved)',
                     dest="bran", default=None)  # passcode => bran
+parser.add_argument('--mbx-ttl', help='seconds mailbox messages are retained, default is forever',
+                    dest="ttl", type=float, default=None)
+parser.add_argument('--mbx-acked', help='remove mailbox messages once retrieved by the recipient',
+                    dest="acked", action="store_true")
+parser.add_argument('--workers', '-w', help='number of worker processes sharing the ports and database, '
+                                            'default is 1', type=int, default=1)
+parser.add_argument('--rate', help='requests per second allowed per source AID, default is no admission control',
+                    type=float, default=None)
+parser.add_argument('--ip-rate', help='requests per second allowed per source IP address, default is 5 times rate',
+                    dest="ipRate", type=float, default=None)
+parser.add_argument('--backlog', help='unprocessed bytes above which requests other than events of witnessed '
+                                      'controllers are shed, default is 1048576', type=int, default=1048576)
 
 
 def launch(args):
@@ -54,35 +67,93 @@ def launch(args):
                alias=args.alias,
                bran=args.bran,
                tcp=int(args.tcp),
-               http=int(args.http))
+               http=int(args.http),
+               ttl=args.ttl,
+               acked=args.acked,
+               workers=args.workers,
+               rate=args.rate,
+               ipRate=args.ipRate,
+               backlog=args.backlog)
 
     logger.info("\n******* Ended Witness for %s listening: http/%s, tcp/%s"
                 ".******\n\n", args.name, args.http, args.tcp)
 
 
-def runWitness(name="witness", base="", alias="witness", bran="", tcp=5631, http=5632, expire=0.0):
+def runWitness(name="witness", base="", alias="witness", bran="", tcp=5631, http=5632, expire=0.0,
+               ttl=None, acked=False, workers=1, rate=None, ipRate=None, backlog=1048576):
     """
-    Setup and run one witness
+    Setup and run one witness, in worker processes that share the witness ports and
+    database when workers is more than 1
+
+    HTTP requests are rate limited to rate per second per source AID and ipRate per second
+    per source IP address when rate is not None, and shed once backlog bytes are unprocessed
+    """
+    if workers > 1:
+        hby = openHby(name=name, base=base, bran=bran)
+        if hby.habByName(name=alias) is None:  # create witness identifier once before workers share it
+            hby.makeHab(name=alias, transferable=False)
+        hby.close()
+
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=runWorker,
+                             kwargs=dict(name=name, base=base, alias=alias, bran=bran, tcp=tcp, http=http,
+                                         expire=expire, ttl=ttl, acked=acked, primary=(i == 0),
+                                         rate=rate, ipRate=ipRate, backlog=backlog))
+                 for i in range(workers)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        return
+
+    runWorker(name=name, base=base, alias=alias, bran=bran, tcp=tcp, http=http, expire=expire,
+              ttl=ttl, acked=acked, shared=False, rate=rate, ipRate=ipRate, backlog=backlog)
+
+
+def runWorker(name="witness", base="", alias="witness", bran="", tcp=5631, http=5632, expire=0.0,
+              ttl=None, acked=False, shared=True, primary=True, rate=None, ipRate=None, backlog=1048576):
+    """
+    Setup and run one witness process, one of several sharing the witness ports and database when shared
     """
+    hby = openHby(name=name, base=base, bran=bran)
+    hbyDoer = habbing.HaberyDoer(habery=hby)  # setup doer
+    doers = [hbyDoer]
+
+    policies = None
+    if ttl is not None or acked:
+        policies = [storing.RetentionPolicy(age=ttl, acked=acked)]
+
+    admitter = None
+    if rate is not None:
+        ipRate = ipRate if ipRate is not None else rate * 5
+        admitter = admitting.Admitter(rate=rate, burst=rate * 2, ipRate=ipRate, ipBurst=ipRate * 2,
+                                      backlogHigh=backlog, backlogMax=backlog * 4)
+
+    doers.extend(indirecting.setupWitness(alias=alias,
+                                          hby=hby,
+                                          tcpPort=tcp,
+                                          httpPort=http,
+                                          policies=policies,
+                                          shared=shared,
+                                          primary=primary,
+                                          admitter=admitter))
 
+    directing.runController(doers=doers, expire=expire)
+
+
+def openHby(name="witness", base="", bran=""):
+    """ Open and return Habery of the witness creating it if it does not exist """
     ks = keeping.Keeper(name=name,
                         base=base,
                         temp=False,
                         reopen=True)
 
     aeid = ks.gbls.get('aeid')
+    ks.close()  # Habery reopens the keystore
 
     if aeid is None:
         hby = habbing.Habery(name=name, base=base, bran=bran)
     else:
         hby = existing.setupHby(name=name, base=base, bran=bran)
 
-    hbyDoer = habbing.HaberyDoer(habery=hby)  # setup doer
-    doers = [hbyDoer]
-
-    doers.extend(indirecting.setupWitness(alias=alias,
-                                          hby=hby,
-                                          tcpPort=tcp,
-                                          httpPort=http))
-
-    directing.runController(doers=doers, expire=expire)
+    return hby
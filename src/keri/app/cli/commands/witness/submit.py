@@ -93,6 +93,12 @@ class InceptDoer(doing.DoDoer):
             while not self.witDoer.cues:
                 _ = yield self.tock
 
+            cue = self.witDoer.cues.popleft()
+            if cue.get("kin") == "timeout":
+                print(f"Timed out waiting for receipts from witnesses {', '.join(cue['wits'])}")
+                self.remove([self.hbyDoer, self.witDoer, self.mbx])
+                return
+
         print(f'Prefix  {hab.pre}')
         for idx, verfer in enumerate(hab.kever.verfers):
             print(f'\tPublic key {idx + 1}:  {verfer.qb64}')
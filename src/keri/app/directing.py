@@ -6,7 +6,11 @@ keri.app.directing module
 simple direct mode demo support classes
 """
 import itertools
+import socket
+import sys
+
 from hio.base import doing
+from hio.core.tcp import serving
 
 from .. import help
 from ..core import eventing, routing
@@ -16,6 +20,123 @@ from ..vdr.eventing import Tevery
 logger = help.ogler.getLogger()
 
 
+class ReusePortServer(serving.Server):
+    """
+    TCP Server whose listen socket sets SO_REUSEPORT so several worker processes may
+    listen on the same port, with the kernel spreading new connections across them.
+    Usable directly or as the servant of a hio http.Server.
+
+    """
+
+    def open(self):
+        """
+        Opens binds listen socket in non blocking mode with SO_REUSEPORT set before bind.
+        """
+        self.ss = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.ss.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.ss.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+        # Linux TCP allocates twice the requested size
+        bs = 2 * self.bs if sys.platform.startswith('linux') else self.bs
+        if self.ss.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) < bs:
+            self.ss.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.bs)
+        if self.ss.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) < bs:
+            self.ss.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.bs)
+
+        self.ss.setblocking(0)  # non blocking socket
+
+        try:  # bind to listen socket (host, port) to receive connections
+            self.ss.bind(self.ha)
+            self.ss.listen(self.bl)
+        except OSError as ex:
+            self.close()
+            logger.error("Error binding server listen socket.\n%s\n", ex)
+            return False
+
+        self.ha = self.ss.getsockname()  # get resolved ha after bind
+        self.opened = True
+        return True
+
+
+class FlowServerDoer(serving.ServerDoer):
+    """
+    TCP Server Doer with per connection flow control.
+
+    Unlike serving.ServerDoer, which drains every socket into its receive buffer
+    each run, reads at most .budget bytes per connection per run, stops reading
+    a connection once its receive buffer holds .rxMax bytes and services the
+    connections round robin starting one later each run so no connection is
+    always first.  Connections for which .paused(ca) returns True are not read
+    at all, leaving the data in the kernel socket buffer so TCP flow control
+    pushes back on the sender.  Each socket read is of up to the remoter's .bs
+    bytes, so a run may exceed .budget and a buffer may exceed .rxMax by less
+    than one read.
+
+    Attributes:
+        .server (serving.Server): TCP Server instance
+        .budget (int): maximum bytes read from one connection per run
+        .rxMax (int): receive buffer size above which a connection is not read
+        .paused (Callable): function of connection address returning True to skip reading
+        .turn (int): round robin offset of the first connection serviced
+
+    """
+
+    def __init__(self, server, budget=65536, rxMax=1048576, paused=None, **kwa):
+        """
+        Parameters:
+           server (serving.Server): TCP Server instance
+           budget (int): maximum bytes read from one connection per run
+           rxMax (int): receive buffer size above which a connection is not read
+           paused (Callable): function of connection address returning True to skip reading
+        """
+        super(FlowServerDoer, self).__init__(server=server, **kwa)
+        self.budget = budget
+        self.rxMax = rxMax
+        self.paused = paused
+        self.turn = 0
+
+    def recur(self, tyme):
+        """ Service connects, bounded receives for each connection and sends """
+        self.server.serviceConnects()
+
+        ixes = list(self.server.ixes.items())
+        if ixes:
+            self.turn %= len(ixes)
+            ixes = ixes[self.turn:] + ixes[:self.turn]
+            self.turn += 1
+
+        for ca, ix in ixes:
+            if self.paused is not None and self.paused(ca):
+                continue
+            try:
+                self.serviceReceives(ix)
+            except OSError as ex:
+                logger.error("Closing incoming socket on %s.\n%s\n", ca, ex)
+                self.server.removeIx(ca=ca)
+
+        self.server.serviceSendsAllIx()
+
+    def serviceReceives(self, ix):
+        """ Receive from remoter ix until budget spent, buffer full or no more data
+
+        Parameters:
+            ix (serving.Remoter): connection to read
+
+        Returns:
+            int: number of bytes read
+
+        """
+        count = 0
+        while not ix.cutoff and count < self.budget and len(ix.rxbs) < self.rxMax:
+            data = ix.receive()
+            if not data:
+                break
+            ix.rxbs.extend(data)
+            count += len(data)
+
+        return count
+
+
 class Director(doing.Doer):
     """
     Base class for Direct Mode KERI Controller Doer with habitat and TCP Client
@@ -388,7 +509,8 @@ class Directant(doing.DoDoer):
        ._tock is hidden attribute for .tock property
     """
 
-    def __init__(self, hab, server, verifier=None, exchanger=None, doers=None, **kwa):
+    def __init__(self, hab, server, verifier=None, exchanger=None, doers=None, cueHigh=1024,
+                 escrowHigh=10000, shared=False, **kwa):
         """
         Initialize instance.
 
@@ -400,12 +522,21 @@ class Directant(doing.DoDoer):
             db is database instance of local controller's context
             verifier (optional) is Verifier instance of local controller's TEL context
             server is TCP Server instance
+            cueHigh (int): Kevery cue count of a connection above which reading it pauses
+            escrowHigh (int): event escrow backlog above which reading connections that hold
+                more than their share of it pauses
+            shared (bool): True means one of several processes sharing the database of hab
         """
         self.hab = hab
         self.verifier = verifier
         self.exchanger = exchanger
         self.server = server  # use server for cx
         self.rants = dict()
+        self.cueHigh = cueHigh
+        self.escrowHigh = escrowHigh
+        self.shared = shared
+        self.backlog = 0  # event escrow entries as of last service run
+        self.loads = dict()  # connection address to event escrow entries of its sources while over .escrowHigh
         doers = doers if doers is not None else []
         doers.extend([doing.doify(self.serviceDo)])
         super(Directant, self).__init__(doers=doers, **kwa)
@@ -444,6 +575,7 @@ class Directant(doing.DoDoer):
         """
         yield  # enter context
         while True:
+            self.weigh()
             for ca, ix in list(self.server.ixes.items()):
                 if ix.cutoff:
                     self.closeConnection(ca)
@@ -451,7 +583,7 @@ class Directant(doing.DoDoer):
 
                 if ca not in self.rants:  # create Reactant and extend doers with it
                     rant = Reactant(tymth=self.tymth, hab=self.hab, verifier=self.verifier,
-                                    exchanger=self.exchanger, remoter=ix)
+                                    exchanger=self.exchanger, remoter=ix, shared=self.shared)
                     self.rants[ca] = rant
                     # add Reactant (rant) doer to running doers
                     self.extend(doers=[rant])  # open and run rant as doer
@@ -461,6 +593,68 @@ class Directant(doing.DoDoer):
 
             yield
 
+    def escrowed(self):
+        """ Returns number of entries in the event escrows of .hab.db """
+        db = self.hab.db
+        with db.env.begin(write=False) as txn:
+            return sum(txn.stat(sub)["entries"] for sub in (db.ooes, db.pses, db.pwes, db.uwes, db.ldes))
+
+    def weigh(self):
+        """ Update .backlog and, while it is over .escrowHigh, the .loads of connections """
+        self.backlog = self.escrowed()
+        if self.backlog > self.escrowHigh:
+            self.loads = {ca: self.load(rant.kevery) for ca, rant in self.rants.items()}
+        else:
+            self.loads = dict()
+
+    def load(self, kevery):
+        """ Returns number of entries in the event escrows of .hab.db for the source prefixes of
+        kevery, forgetting sources without any
+
+        Parameters:
+            kevery (Kevery): event processor of one connection
+
+        """
+        db = self.hab.db
+        count = 0
+        with db.env.begin(write=False) as txn:
+            for pre in list(kevery.sources):
+                top = f"{pre}.".encode("utf-8")
+                entries = 0
+                for sub in (db.ooes, db.pses, db.pwes, db.uwes, db.ldes):
+                    cursor = txn.cursor(db=sub)
+                    if cursor.set_range(top):
+                        for key in cursor.iternext(keys=True, values=False):
+                            if not key.startswith(top):
+                                break
+                            entries += 1
+                if not entries:
+                    kevery.sources.discard(pre)
+                count += entries
+
+        return count
+
+    def paused(self, ca):
+        """ Returns True when reading connection ca should pause because its Reactant has
+        more than .cueHigh pending cues or, while the event escrows hold more than .escrowHigh
+        entries, the sources of its events hold more than an even share of .escrowHigh of them.
+        Connections not adding to the backlog are still read so escrows can drain.
+
+        Use as the paused function of FlowServerDoer
+
+        Parameters:
+            ca (tuple): connection address of remoter
+
+        """
+        rant = self.rants.get(ca)
+        if rant is None:
+            return False
+
+        if len(rant.kevery.cues) > self.cueHigh:
+            return True
+
+        return self.loads.get(ca, 0) > self.escrowHigh / len(self.rants)
+
     def closeConnection(self, ca):
         """
         Close and remove connection given by ca and remove associated rant at ca.
@@ -530,7 +724,7 @@ class Reactant(doing.DoDoer):
 
     """
 
-    def __init__(self, hab, remoter, verifier=None, exchanger=None, doers=None, **kwa):
+    def __init__(self, hab, remoter, verifier=None, exchanger=None, doers=None, shared=False, **kwa):
         """
         Initialize instance.
 
@@ -544,6 +738,7 @@ class Reactant(doing.DoDoer):
             verifier is Verifier instance of local controller's TEL context
             remoter is TCP Remoter instance
             doers is list of doers (do generator instances, functions or methods)
+            shared (bool): True means one of several processes sharing the database of hab
 
         """
         self.hab = hab
@@ -561,7 +756,8 @@ class Reactant(doing.DoDoer):
         self.kevery = eventing.Kevery(db=self.hab.db,
                                       lax=False,
                                       local=False,
-                                      rvy=rvy)
+                                      rvy=rvy,
+                                      shared=shared)
 
         if self.verifier is not None:
             self.tevery = Tevery(reger=self.verifier.reger,
@@ -645,12 +841,15 @@ class Reactant(doing.DoDoer):
         """
         yield  # enter context
         while True:
+            msgs = bytearray()  # batch all pending receipts into one send
             for msg in self.hab.processCuesIter(self.kevery.cues):
                 if isinstance(msg, list):
                     msg = bytearray(itertools.chain(*msg))
 
-                self.sendMessage(msg, label="chit or receipt or replay")
-                yield  # throttle just do one cue at a time
+                msgs.extend(msg)
+
+            if msgs:
+                self.sendMessage(msgs, label="chit or receipt or replay")
             yield
         return False  # should never get here except forced close
 
@@ -6,6 +6,7 @@ keri.app.forwarding module
 module for enveloping and forwarding KERI message
 """
 
+import itertools
 
 from hio.base import doing
 from hio.help import decking
@@ -23,6 +24,13 @@ class Postman(doing.DoDoer):
     delivers to sends them to one of the target recipient's witnesses for store and forward
     to the intended recipient
 
+    Queued events are grouped by sender and destination witness and each group is sent as
+    one stream.  Each (sender, witness) pair has one witnesser that later batches are appended
+    to, so batches to a witness arrive in order while batches to different witnesses are in
+    flight concurrently.  The sender's KEL is only sent to a witness when the witness has not
+    yet acknowledged a batch carrying the sender's current key state and no batch carrying it
+    is in flight.
+
     """
 
     def __init__(self, hby, evts=None, cues=None, klas=None, **kwa):
@@ -30,6 +38,11 @@ class Postman(doing.DoDoer):
         self.evts = evts if evts is not None else decking.Deck()
         self.cues = cues if cues is not None else decking.Deck()
         self.klas = klas if klas is not None else agenting.HttpWitnesser
+        self.known = dict()  # (sender prefix, witness prefix) to said of latest sender event acknowledged
+        self.pending = dict()  # (sender prefix, witness prefix) to said of sender event in an unacknowledged batch
+        self.witers = dict()  # (sender prefix, witness prefix) to witnesser with batches in flight
+        self.inflight = dict()  # (sender prefix, witness prefix) to Deck of (introduced said, cues) of batches
+        self.acked = dict()  # (sender prefix, witness prefix) to count of witnesser responses already acknowledged
 
         doers = [doing.doify(self.deliverDo)]
         super(Postman, self).__init__(doers=doers, **kwa)
@@ -51,6 +64,7 @@ class Postman(doing.DoDoer):
         _ = (yield self.tock)
 
         while True:
+            batches = dict()  # (sender prefix, witness prefix) to (msg stream, cues, introduced said)
             while self.evts:
                 evt = self.evts.popleft()
                 src = evt["src"]
@@ -67,9 +81,10 @@ class Postman(doing.DoDoer):
                     print(f"exiting because can't find wit for {recp}")
                     continue
 
-                msg = bytearray()
-                msg.extend(introduce(hab, wit))
-                # Transpose the signatures to point to the new location
+                if (hab.pre, wit) not in batches:
+                    kel = self.introduce(hab, wit)
+                    batches[(hab.pre, wit)] = (bytearray(kel), [], hab.kever.serder.said if kel else None)
+                msg, cues, _ = batches[(hab.pre, wit)]
 
                 # create the forward message with payload embedded at `a` field
                 fwd = exchanging.exchange(route='/fwd', modifiers=dict(pre=recp, topic=tpc),
@@ -86,20 +101,75 @@ class Postman(doing.DoDoer):
                                               count=(len(atc) // 4)).qb64b)
                     ims.extend(atc)
 
-                witer = agenting.witnesser(hab=hab, wit=wit)
-
                 msg.extend(ims)
-                witer.msgs.append(bytearray(msg))  # make a copy
-                self.extend([witer])
+                cues.append(dict(dest=recp, topic=tpc, said=srdr.said))
 
-                while not witer.sent:
-                    _ = (yield self.tock)
+            for (pre, wit), (msg, cues, said) in batches.items():  # send all batches concurrently
+                key = (pre, wit)
+                if key not in self.witers:
+                    self.witers[key] = agenting.witnesser(hab=self.hby.habs[pre], wit=wit)
+                    self.inflight[key] = decking.Deck()
+                    self.acked[key] = 0
+                    self.extend([self.witers[key]])
+                self.witers[key].msgs.append(msg)  # pipelined behind earlier batches to the same witness
+                self.inflight[key].append((said, cues))
 
-                self.cues.append(dict(dest=recp, topic=tpc, said=srdr.said))
-                yield self.tock
+            for key, witer in list(self.witers.items()):
+                self.acknowledge(key, witer)
 
             yield self.tock
 
+    def acknowledge(self, key, witer):
+        """ Cue batches of witer that have been sent and record the key state they introduced
+
+        All batches no longer waiting in witer.msgs have been sent once witer is idle. A batch only
+        marks its introduced key state as known when every response confirms it, otherwise the next
+        batch introduces the sender again.  Responses stay in witer.sent so witer stays idle between
+        pipelined batches, only those after the ones already acknowledged are checked.
+
+        Parameters:
+            key (tuple): (sender prefix, witness prefix) of witer
+            witer (Union[HttpWitnesser, TCPWitnesser]): witnesser of the batches of key
+
+        """
+        acked = self.acked.get(key, 0)
+        if len(witer.sent) <= acked or not witer.idle:
+            return
+
+        ok = all(getattr(rep, "status", 200) < 300 for rep in itertools.islice(witer.sent, acked, None))
+        self.acked[key] = len(witer.sent)
+
+        batches = self.inflight[key]
+        for _ in range(len(batches) - len(witer.msgs)):
+            said, cues = batches.popleft()
+            if said is not None:
+                if ok:
+                    self.known[key] = said
+                if self.pending.get(key) == said:
+                    del self.pending[key]
+            self.cues.extend(cues)
+
+        if not batches:
+            self.remove([witer])
+            del self.witers[key]
+            del self.inflight[key]
+            self.acked.pop(key, None)
+
+    def introduce(self, hab, wit):
+        """ Returns KEL of hab for wit unless wit has already been sent the current key state
+
+        Parameters:
+            hab (Hab): local environment of the sender
+            wit (str): qb64 identifier prefix of the destination witness
+
+        """
+        said = hab.kever.serder.said
+        if said in (self.known.get((hab.pre, wit)), self.pending.get((hab.pre, wit))):
+            return bytearray()
+
+        self.pending[(hab.pre, wit)] = said
+        return introduce(hab, wit)
+
     def send(self, src, dest, topic, serder, attachment=None):
         """
         Utility function to queue a msg on the Postman's buffer for
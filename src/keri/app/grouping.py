@@ -325,7 +325,7 @@ class Counselor(doing.DoDoer):
                 if witer and len(kever.wits) > 0:
                     witnessed = False
                     for cue in self.witDoer.cues:
-                        if cue["pre"] == ghab.pre and cue["sn"] == seqner.sn:
+                        if cue["pre"] == ghab.pre and cue["sn"] == seqner.sn and cue.get("kin") != "timeout":
                             witnessed = True
                     if not witnessed:
                         continue
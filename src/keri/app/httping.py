@@ -17,7 +17,9 @@ from keri.end import ending
 logger = help.ogler.getLogger()
 
 CESR_CONTENT_TYPE = "application/cesr+json"
+CESR_BULK_CONTENT_TYPE = "application/cesr"
 CESR_ATTACHMENT_HEADER = "CESR-ATTACHMENT"
+CESR_BULK_MAX_SIZE = 4 * 1024 * 1024  # most bytes accepted in the body of one bulk CESR request
 
 
 class SignatureValidationComponent(object):
@@ -173,10 +175,10 @@ def streamCESRRequests(client, ims, path=None):
         else:  # extracted successfully
             del ims[:serder.size]  # strip off event from front of ims
 
-        attachment = bytearray()
-        while ims and ims[0] != 0x7b:  # not new message so process attachments, must support CBOR and MsgPack
-            attachment.append(ims[0])
-            del ims[:1]
+        idx = ims.find(b'\x7b')  # attachments run to start of next message, must support CBOR and MsgPack
+        idx = idx if idx >= 0 else len(ims)
+        attachment = bytearray(ims[:idx])
+        del ims[:idx]
 
         body = serder.raw
 
@@ -197,3 +199,127 @@ def streamCESRRequests(client, ims, path=None):
     return cnt
 
 
+def splitCESRStream(ims, limit=CESR_BULK_MAX_SIZE):
+    """
+    Splits a stream of KERI messages with their attachments into bodies of at most limit
+    bytes each, only on message boundaries.  A message larger than limit is a body of its
+    own, a limit of 0 puts every message in a body of its own.
+
+    Parameters
+       ims (bytearray):  stream of KERI messages with attachments, consumed
+       limit (int): most bytes in one body
+
+    Returns
+       list: bytes bodies in stream order
+
+    """
+    cold = parsing.Parser.sniff(ims)  # check for spurious counters at front of stream
+    if cold in (parsing.Colds.txt, parsing.Colds.bny):  # not message error out to flush stream
+        raise kering.ColdStartError("Expecting message counter tritet={}"
+                                    "".format(cold))
+
+    bodies = []
+    body = bytearray()
+    while ims:  # extract and deserialize message from ims
+        try:
+            serder = coring.Serder(raw=ims)
+        except kering.ShortageError as ex:  # need more bytes
+            raise kering.ExtractionError("unable to extract a valid message to send as HTTP")
+
+        idx = ims.find(b'\x7b', serder.size)  # attachments run to start of next message
+        idx = idx if idx >= 0 else len(ims)
+        if body and len(body) + idx > limit:
+            bodies.append(bytes(body))
+            body = bytearray()
+        body.extend(ims[:idx])
+        del ims[:idx]
+
+    if body:
+        bodies.append(bytes(body))
+
+    return bodies
+
+
+def bulkCESRRequest(client, ims, path=None, limit=CESR_BULK_MAX_SIZE):
+    """
+    Sends a stream of KERI messages with their attachments as the body of CESR http
+    requests against the provided hio http Client.  The receiving end parses the
+    body as a CESR stream so message count does not determine request count.  Streams
+    longer than limit are split on message boundaries over several requests.
+
+    Queries expect a mailbox stream in response so must be sent with createCESRRequest.
+
+    Parameters
+       client (Client): hio http Client that will send the messages as a CESR stream
+       ims (bytearray):  stream of KERI messages with attachments, consumed
+       path (str): path to post to
+       limit (int): most bytes in the body of one request
+
+    Returns
+       int: Number of requests posted
+
+    """
+    path = path if path is not None else "/"
+
+    bodies = splitCESRStream(ims, limit=limit)
+    for body in bodies:
+        headers = Hict([
+            ("Content-Type", CESR_BULK_CONTENT_TYPE),
+            ("Content-Length", len(body)),
+        ])
+
+        client.request(
+            method="POST",
+            path=path,
+            headers=headers,
+            body=body
+        )
+
+    return len(bodies)
+
+
+def readCesrHttpStream(req, rxbs, size=65536, limit=CESR_BULK_MAX_SIZE):
+    """
+    Reads the CESR stream body of a bulk Falcon HTTP request into rxbs
+
+    The body is read in chunks of size and only appended to rxbs once complete so
+    that a framed parser consuming rxbs never sees a partial message. Bodies larger
+    than limit are refused with 413 before or as soon as they are read past limit.
+
+    Parameters
+        req (falcon.Request): http request with content type CESR_BULK_CONTENT_TYPE
+        rxbs (bytearray): parser input buffer to extend
+        size (int): chunk size for reads from the request stream
+        limit (int): most bytes accepted in the body
+
+    Returns
+        int: number of bytes read
+
+    """
+    if req.content_type != CESR_BULK_CONTENT_TYPE:
+        raise falcon.HTTPError(falcon.HTTP_NOT_ACCEPTABLE,
+                               title="Content type error",
+                               description="Unacceptable content type.")
+
+    if req.content_length is not None and req.content_length > limit:
+        raise falcon.HTTPPayloadTooLarge(title="Payload too large",
+                                         description=f"CESR stream body larger than {limit} bytes.")
+
+    body = bytearray()
+    while chunk := req.bounded_stream.read(size):
+        body.extend(chunk)
+        if len(body) > limit:
+            raise falcon.HTTPPayloadTooLarge(title="Payload too large",
+                                             description=f"CESR stream body larger than {limit} bytes.")
+
+    if not body:
+        return 0
+
+    cold = parsing.Parser.sniff(body)
+    if cold in (parsing.Colds.txt, parsing.Colds.bny):
+        raise falcon.HTTPError(falcon.HTTP_400,
+                               title="Malformed CESR stream",
+                               description="CESR stream must start with a message.")
+
+    rxbs.extend(body)
+    return len(body)
@@ -6,6 +6,7 @@ keri.app.indirecting module
 simple indirect mode demo support classes
 """
 import falcon
+import math
 import time
 from ordered_set import OrderedSet as oset
 
@@ -17,7 +18,7 @@ from hio.help import decking
 
 from . import directing, storing, httping, forwarding, agenting, oobiing
 from .. import help, kering
-from ..core import eventing, parsing, routing
+from ..core import coring, eventing, parsing, routing
 from ..core.coring import Ilks
 from ..db import basing
 from ..end import ending
@@ -29,10 +30,24 @@ from ..vdr.eventing import Tevery
 logger = help.ogler.getLogger()
 
 
-def setupWitness(hby, alias="witness", mbx=None, tcpPort=5631, httpPort=5632):
+def setupWitness(hby, alias="witness", mbx=None, tcpPort=5631, httpPort=5632, policies=None, shared=False,
+                 primary=True, admitter=None):
     """
     Setup witness controller and doers
 
+    Parameters:
+        hby (Habery): environment of the witness
+        alias (str): name of the witness Hab
+        mbx (Mailboxer): mailbox storage, created if None
+        tcpPort (int): TCP port to listen on
+        httpPort (int): HTTP port to listen on
+        policies (Iterable[RetentionPolicy]): mailbox retention policies, no compaction if None
+        shared (bool): True means one of several worker processes sharing the witness database
+            and ports, so listen with SO_REUSEPORT and coordinate writes with the other workers
+        primary (bool): False means a secondary worker that leaves OOBI resolution and mailbox
+            compaction to the primary worker
+        admitter (Admitter): admission control of HTTP requests, no limits if None
+
     """
     cues = decking.Deck()
     doers = []
@@ -45,7 +60,7 @@ def setupWitness(hby, alias="witness", mbx=None, tcpPort=5631, httpPort=5632):
     reger = viring.Reger(name=hab.name, db=hab.db, temp=False)
     verfer = verifying.Verifier(hby=hby, reger=reger)
 
-    mbx = mbx if mbx is not None else storing.Mailboxer(name=alias, temp=hby.temp)
+    mbx = mbx if mbx is not None else storing.Mailboxer(name=alias, temp=hby.temp, shared=shared)
     forwarder = forwarding.ForwardHandler(hby=hby, mbx=mbx)
     exchanger = exchanging.Exchanger(hby=hby, handlers=[forwarder])
     oobiery = ending.Oobiery(hby=hby)
@@ -60,7 +75,8 @@ def setupWitness(hby, alias="witness", mbx=None, tcpPort=5631, httpPort=5632):
                           lax=True,
                           local=False,
                           rvy=rvy,
-                          cues=cues)
+                          cues=cues,
+                          shared=shared)
     kvy.registerReplyRoutes(router=rvy.rtr)
 
     tvy = Tevery(reger=verfer.reger,
@@ -75,26 +91,35 @@ def setupWitness(hby, alias="witness", mbx=None, tcpPort=5631, httpPort=5632):
                             exc=exchanger,
                             rvy=rvy)
 
-    httpEnd = HttpEnd(rxbs=parser.ims, mbx=mbx)
+    httpEnd = HttpEnd(rxbs=parser.ims, mbx=mbx, hab=hab, admitter=admitter)
     app.add_route("/", httpEnd)
 
-    server = http.Server(port=httpPort, app=app)
+    if shared:
+        server = http.Server(port=httpPort, app=app, servant=directing.ReusePortServer(ha=("", httpPort)))
+    else:
+        server = http.Server(port=httpPort, app=app)
     httpServerDoer = http.ServerDoer(server=server)
 
     # setup doers
     regDoer = basing.BaserDoer(baser=verfer.reger)
 
-    server = serving.Server(host="", port=tcpPort)
-    serverDoer = serving.ServerDoer(server=server)
-
-    directant = directing.Directant(hab=hab, server=server, verifier=verfer)
+    if shared:
+        server = directing.ReusePortServer(host="", port=tcpPort)
+    else:
+        server = serving.Server(host="", port=tcpPort)
+    directant = directing.Directant(hab=hab, server=server, verifier=verfer, shared=shared)
+    serverDoer = directing.FlowServerDoer(server=server, paused=directant.paused)
 
     witStart = WitnessStart(hab=hab, parser=parser, cues=cues,
                             kvy=kvy, tvy=tvy, rvy=rvy, exc=exchanger, replies=rep.reps,
                             responses=rep.cues, queries=httpEnd.qrycues)
 
     doers.extend(oobiRes)
-    doers.extend([regDoer, exchanger, directant, serverDoer, httpServerDoer, rep, witStart, oobiery])
+    doers.extend([regDoer, exchanger, directant, serverDoer, httpServerDoer, rep, witStart])
+    if primary:
+        doers.append(oobiery)
+    if primary and policies:
+        doers.append(storing.MailboxCompactor(mbx=mbx, policies=policies))
 
     return doers
 
@@ -841,12 +866,19 @@ class HttpEnd:
     of the provided Habitat.
 
     This also handles `req`, `exn` and `tel` messages that respond with a KEL replay.
+
+    Requests with content type application/cesr carry a stream of any number of messages
+    with their attachments as the body and are parsed as one CESR stream.
+
+    With an admitter requests are rate limited by source IP address and AID with 429 responses
+    and shed with 503 responses when the backlog in rxbs is too large.  Key events of controllers
+    witnessed by hab are given priority over other requests.
     """
 
     TimeoutQNF = 30
     TimeoutMBX = 5
 
-    def __init__(self, rxbs=None, mbx=None, qrycues=None):
+    def __init__(self, rxbs=None, mbx=None, qrycues=None, hab=None, admitter=None):
         """
         Create the KEL HTTP server from the Habitat with an optional Falcon App to
         register the routes with.
@@ -855,12 +887,16 @@ class HttpEnd:
              rxbs (bytearray): output queue of bytes for message processing
              mbx (Mailboxer): Mailbox storage
              qrycues (Deck): inbound qry response queues
+             hab (Hab): witness environment used to recognize priority events
+             admitter (Admitter): admission control of requests, no limits if None
 
         """
         self.rxbs = rxbs if rxbs is not None else bytearray()
 
         self.mbx = mbx
         self.qrycues = qrycues if qrycues is not None else decking.Deck()
+        self.hab = hab
+        self.admitter = admitter
 
     def on_post(self, req, rep):
         """
@@ -882,11 +918,20 @@ class HttpEnd:
                schema:
                  type: object
                  description: KERI event message
+             application/cesr:
+               schema:
+                 type: string
+                 format: binary
+                 description: CESR stream of KERI messages with attachments
         responses:
            200:
               description: Mailbox query response for server sent events
            204:
               description: KEL or EXN event accepted.
+           429:
+              description: Rate limit of source exceeded, retry after Retry-After seconds.
+           503:
+              description: Backlog too large or too many mailbox streams, retry after Retry-After seconds.
         """
         if req.method == "OPTIONS":
             rep.status = falcon.HTTP_200
@@ -895,14 +940,31 @@ class HttpEnd:
         rep.set_header('Cache-Control', "no-cache")
         rep.set_header('connection', "close")
 
+        if req.content_type == httping.CESR_BULK_CONTENT_TYPE:  # multiple messages in one CESR stream body
+            body = bytearray()
+            httping.readCesrHttpStream(req=req, rxbs=body)
+            for serder in self.messages(body):  # one admission per message in the stream
+                self.admit(req=req, serder=serder)
+            self.rxbs.extend(body)
+            rep.status = falcon.HTTP_204
+            return
+
         cr = httping.parseCesrHttpRequest(req=req)
         serder = eventing.Serder(ked=cr.payload, kind=eventing.Serials.json)
         msg = bytearray(serder.raw)
         msg.extend(cr.attachments.encode("utf-8"))
 
-        self.rxbs.extend(msg)
+        self.admit(req=req, serder=serder)
 
         ilk = serder.ked["t"]
+        aid = self.source(serder)
+        stamp = time.monotonic()
+        if ilk in (Ilks.qry,) and self.admitter is not None and not self.admitter.open(aid, now=stamp):
+            # refuse before queueing so no reply is cued for a stream that will never read it
+            raise falcon.HTTPServiceUnavailable(title="Too many mailbox streams", retry_after=self.TimeoutMBX)
+
+        self.rxbs.extend(msg)
+
         if ilk in (Ilks.icp, Ilks.rot, Ilks.ixn, Ilks.dip, Ilks.drt, Ilks.exn, Ilks.rpy):
             rep.set_header('Content-Type', "application/json")
             rep.status = falcon.HTTP_204
@@ -912,23 +974,120 @@ class HttpEnd:
         elif ilk in (Ilks.qry,):
             rep.set_header('Content-Type', "text/event-stream")
             rep.status = falcon.HTTP_200
-            rep.stream = QryRpyMailboxIterable(mbx=self.mbx, cues=self.qrycues, said=serder.said)
+            rep.stream = QryRpyMailboxIterable(mbx=self.mbx, cues=self.qrycues, said=serder.said,
+                                               timeout=self.TimeoutQNF, admitter=self.admitter, aid=aid,
+                                               stamp=stamp)
+
+    def admit(self, req, serder):
+        """ Raise HTTP error if the request carrying serder is not admitted by .admitter
+
+        Parameters:
+            req (Request): Falcon HTTP request
+            serder (Serder): first message of the request
+
+        """
+        if self.admitter is None:
+            return
+
+        priority = self.priority(serder)
+        admitted, retry = self.admitter.admit(ip=req.remote_addr, aid=self.source(serder),
+                                              priority=priority, backlog=len(self.rxbs))
+        if admitted:
+            return
+
+        if self.admitter.shed(priority=priority, backlog=len(self.rxbs)):
+            raise falcon.HTTPServiceUnavailable(title="Backlog too large", retry_after=math.ceil(retry))
+        raise falcon.HTTPTooManyRequests(title="Rate limit exceeded", retry_after=math.ceil(retry))
+
+    def priority(self, serder):
+        """ Returns True if serder is a key event of a controller witnessed by .hab """
+        if self.hab is None:
+            return False
+
+        ked = serder.ked
+        ilk = ked["t"]
+        if ilk in (Ilks.icp, Ilks.dip):
+            return self.hab.pre in ked["b"]
+        if ilk in (Ilks.rot, Ilks.drt, Ilks.ixn):
+            if ilk in (Ilks.rot, Ilks.drt) and self.hab.pre in ked["ba"]:
+                return True
+            kever = self.hab.kevers[ked["i"]] if ked["i"] in self.hab.kevers else None
+            return kever is not None and self.hab.pre in kever.wits
+
+        return False
+
+    @staticmethod
+    def messages(ims):
+        """ Generator of Serders of the messages in CESR stream ims, leaves ims unchanged
+
+        Attachments are taken to run to the start of the next message as in
+        httping.streamCESRRequests.  Stops at the first bytes that are not a message so the
+        parser reports the error.
+
+        Parameters:
+            ims (bytearray): stream of KERI messages with attachments
+
+        """
+        off = 0
+        while off < len(ims):
+            try:
+                _, _, _, size = coring.sniff(bytes(ims[off:off + 64]))  # version string is at the front
+                serder = eventing.Serder(raw=bytes(ims[off:off + size]))
+            except (kering.KeriError, ValueError):
+                return
+
+            yield serder
+            off = ims.find(b'\x7b', off + serder.size)  # attachments run to start of next message
+            if off < 0:
+                return
+
+    @staticmethod
+    def source(serder):
+        """ Returns qb64 AID serder is from or about, None if it has none """
+        ked = serder.ked
+        if "i" in ked:
+            return ked["i"]
+        q = ked.get("q")
+        return q.get("i") if isinstance(q, dict) else None
 
 
 class QryRpyMailboxIterable:
+    """
+    Server sent event stream answering a mailbox query once the query has been processed.
+
+    The mailbox stream slot taken from the admitter is released when the mailbox stream
+    ends, when no reply to the query arrives within timeout seconds and, because the HTTP
+    server drops streams of disconnected clients without closing them, when the stream is
+    garbage collected.
+
+    """
 
-    def __init__(self, cues, mbx, said, retry=5000):
+    def __init__(self, cues, mbx, said, retry=5000, timeout=None, admitter=None, aid=None, stamp=None):
         self.mbx = mbx
         self.retry = retry
         self.cues = cues
         self.said = said
+        self.timeout = timeout
+        self.admitter = admitter
+        self.aid = aid
+        self.stamp = stamp
+        self.start = None
         self.iter = None
+        self.closed = False
 
     def __iter__(self):
         return self
 
     def __next__(self):
+        if self.closed:
+            raise StopIteration
+
         if self.iter is None:
+            self.start = self.start if self.start is not None else time.monotonic()
+            if self.timeout is not None and time.monotonic() - self.start > self.timeout:
+                self.close()
+                raise StopIteration
+
             if self.cues:
                 cue = self.cues.popleft()
                 serder = cue["serder"]
@@ -942,10 +1101,36 @@ class QryRpyMailboxIterable:
 
             return b''
 
-        return next(self.iter)
+        try:
+            return next(self.iter)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self):
+        """ Close mailbox stream and release its admitter slot, safe to call more than once """
+        self.closed = True
+        if self.iter is not None:
+            self.iter.close()
+            self.iter = None
+        if self.admitter is not None:
+            self.admitter.close(self.aid, stamp=self.stamp)
+            self.admitter = None
+
+    def __del__(self):
+        self.close()
 
 
 class MailboxIterable:
+    """
+    Server sent event stream of mailbox messages for the topics of an identifier prefix.
+
+    Subscribes to the Mailboxer for each topic so the topic index is only scanned when a
+    message has been stored in that topic since the last scan.  An idle stream costs no
+    database access.  On a shared mailbox a new write transaction only wakes the topics
+    whose stored message count changed.
+
+    """
 
     TimeoutMBX = 30000000
 
@@ -954,9 +1139,16 @@ class MailboxIterable:
         self.pre = pre
         self.topics = topics
         self.retry = retry
+        self.pending = set()  # topics with messages stored since last scan
+        self.version = None  # mailbox version at last scan of a shared mailbox
+        self.counts = dict()  # topic to count of messages stored at last check of a shared mailbox
 
     def __iter__(self):
         self.start = self.end = time.perf_counter()
+        for topic, idx in self.topics.items():
+            self.mbx.ackTopic(self.pre + topic, idx)  # recipient has everything below idx
+            self.mbx.subscribe(self.pre + topic, self)
+        self.pending = set(self.topics)  # catch up on anything stored before subscribing
         return self
 
     def __next__(self):
@@ -965,8 +1157,17 @@ class MailboxIterable:
                 self.end = time.perf_counter()
                 return bytearray(f"retry: {self.retry}\n\n".encode("utf-8"))
 
+            if self.mbx.shared and (version := self.mbx.version()) != self.version:
+                self.version = version  # another process may have stored without notifying us
+                for topic in self.topics:
+                    if (count := self.mbx.count(self.pre + topic)) != self.counts.get(topic):
+                        self.counts[topic] = count
+                        self.pending.add(topic)
+
             data = bytearray()
-            for topic, idx in self.topics.items():
+            pending, self.pending = self.pending, set()
+            for topic in [topic for topic in self.topics if topic in pending]:
+                idx = self.topics[topic]
                 key = self.pre + topic
                 for fn, _, msg in self.mbx.cloneTopicIter(key, idx):
                     data.extend(bytearray("id: {}\nevent: {}\nretry: {}\ndata: ".format(fn, topic, self.retry).encode(
@@ -980,4 +1181,21 @@ class MailboxIterable:
             self.end = time.perf_counter()
             return data
 
+        self.close()
         raise StopIteration
+
+    def notify(self, topic):
+        """ Mark topic for scanning on next iteration, called by Mailboxer.storeMsg
+
+        Parameters:
+            topic (bytes): full topic key (prefix + topic) that received a message
+
+        """
+        topic = topic.decode("utf-8")
+        if topic.startswith(self.pre):
+            self.pending.add(topic[len(self.pre):])
+
+    def close(self):
+        """ Unsubscribe from all topics, called by the WSGI server when the client stream ends """
+        for topic in self.topics:
+            self.mbx.unsubscribe(self.pre + topic, self)
@@ -884,6 +884,36 @@ class CredentialEnd(doing.DoDoer):
                 type: string
              description:  type of credential to return, [issued|received]
              required: true
+           - in: query
+             name: schema
+             schema:
+                type: string
+             description:  SAID of schema of credentials to return
+             required: false
+           - in: query
+             name: status
+             schema:
+                type: string
+             description:  status of credentials to return, [issued|revoked]
+             required: false
+           - in: query
+             name: after
+             schema:
+                type: string
+             description:  SAID of last credential of previous page, credentials are returned in SAID order
+             required: false
+           - in: query
+             name: offset
+             schema:
+                type: integer
+             description:  number of matching credentials to skip
+             required: false
+           - in: query
+             name: limit
+             schema:
+                type: integer
+             description:  maximum number of credentials to return
+             required: false
         responses:
            200:
               description: Credential list.
@@ -905,18 +935,42 @@ class CredentialEnd(doing.DoDoer):
                        "".format(alias)
             return
 
-        creds = []
+        filters = dict(schema=req.params.get("schema"),
+                       status=req.params.get("status"),
+                       after=req.params.get("after"),
+                       offset=req.get_param_as_int("offset", min_value=0, default=0),
+                       limit=req.get_param_as_int("limit", min_value=0))
+
+        saiders = []
+        reger = None
         if typ == "issued":
-            saids = self.rgy.reger.issus.get(keys=hab.pre)
-            creds = self.rgy.reger.cloneCreds(saids)
+            reger = self.rgy.reger
+            saiders = walleting.Wallet(reger=reger).query(issuer=hab.pre, **filters)
 
         elif typ == "received":
-            saids = self.verifier.reger.subjs.get(keys=hab.pre)
-            creds = self.verifier.reger.cloneCreds(saids)
+            reger = self.verifier.reger
+            saiders = walleting.Wallet(reger=reger).query(subject=hab.pre, **filters)
 
         rep.status = falcon.HTTP_200
         rep.content_type = "application/json"
-        rep.data = json.dumps(creds).encode("utf-8")
+        rep.stream = self.streamCreds(reger, saiders)
+
+    @staticmethod
+    def streamCreds(reger, saiders):
+        """ Returns iterator of bytes of JSON array of credentials cloned one at a time as streamed
+
+        Parameters:
+            reger (Reger): credential database
+            saiders (Iterable): of Saider of credentials to stream
+
+        """
+        cache = dict()  # chained credentials shared by credentials are only expanded once
+        yield b'['
+        for idx, saider in enumerate(saiders):
+            if idx:
+                yield b','
+            yield json.dumps(reger.cloneCreds([saider], cache=cache)[0]).encode("utf-8")
+        yield b']'
 
     def on_get_export(self, _, rep, alias, said):
         """ Credentials GET endpoint
@@ -969,43 +1023,8 @@ class CredentialEnd(doing.DoDoer):
 
     def outputCred(self, hab, said):
         out = bytearray()
-        creder, sadsigers, sadcigars = self.rgy.reger.cloneCred(said=said)
-        chains = creder.crd["e"]
-        saids = []
-        for key, source in chains.items():
-            if key == 'd':
-                continue
-
-            if not isinstance(source, dict):
-                continue
-
-            saids.append(source['n'])
-
-        for said in saids:
-            out.extend(self.outputCred(hab, said))
-
-        issr = creder.issuer
-        for msg in self.hby.db.clonePreIter(pre=issr):
-            serder = coring.Serder(raw=msg)
-            atc = msg[serder.size:]
-            out.extend(serder.raw)
-            out.extend(atc)
-
-        if creder.status is not None:
-            for msg in self.rgy.reger.clonePreIter(pre=creder.status):
-                serder = coring.Serder(raw=msg)
-                atc = msg[serder.size:]
-                out.extend(serder.raw)
-                out.extend(atc)
-
-            for msg in self.rgy.reger.clonePreIter(pre=creder.said):
-                serder = coring.Serder(raw=msg)
-                atc = msg[serder.size:]
-                out.extend(serder.raw)
-                out.extend(atc)
-
-        out.extend(creder.raw)
-        out.extend(eventing.proofize(sadtsgs=sadsigers, sadcigars=sadcigars, pipelined=True))
+        for _, _, msg in self.rgy.reger.exportIter(saids=[said], db=self.hby.db):
+            out.extend(msg)
 
         return out
 
@@ -1519,12 +1538,13 @@ class CredentialEnd(doing.DoDoer):
 
 class PresentationEnd:
     """
-    ReST API for admin of credential presentation requests
+    ReST API for admin of credential presentation requests and verification of presentations
 
     """
 
-    def __init__(self, rep):
+    def __init__(self, rep, verifier=None):
         self.rep = rep
+        self.verifier = verifier
 
     def on_post(self, req, rep):
         """  Presentation POST endpoint
@@ -1567,6 +1587,52 @@ class PresentationEnd:
 
         rep.status = falcon.HTTP_202
 
+    def on_post_verify(self, req, rep):
+        """  Presentation verification POST endpoint
+
+        Parameters:
+            req: falcon.Request HTTP request
+            rep: falcon.Response HTTP response
+
+        ---
+        summary: Verify credential presentations
+        description: Verify the credentials of presentation proof payloads as one batch, each verified credential
+                     must be held and not revoked
+        tags:
+           - Presentation
+        requestBody:
+            required: true
+            content:
+              application/json:
+                schema:
+                  type: object
+                  properties:
+                    presentations:
+                      type: array
+                      description: presentation proof payloads with verifiableCredential list of SAIDs
+                      items:
+                        type: object
+        responses:
+           200:
+              description: credential SAID to null if verified or the reason it is not
+           400:
+              description: no presentations provided
+
+        """
+        body = req.get_media()
+        presentations = body.get("presentations")
+        if not presentations or not isinstance(presentations, list):
+            rep.status = falcon.HTTP_400
+            rep.text = "presentations is required, none provided"
+            return
+
+        verdicts = protocoling.verifyPresentations(self.verifier, presentations=presentations)
+
+        rep.status = falcon.HTTP_200
+        rep.content_type = "application/json"
+        rep.data = json.dumps({said: None if verdict is None else str(verdict)
+                               for said, verdict in verdicts.items()}).encode("utf-8")
+
 
 class MultisigEndBase(doing.DoDoer):
 
@@ -3203,8 +3269,9 @@ def loadEnds(app, *,
     registryEnd = RegistryEnd(hby=hby, rgy=rgy, registrar=registrar)
     app.add_route("/registries", registryEnd)
 
-    presentationEnd = PresentationEnd(rep=rep)
+    presentationEnd = PresentationEnd(rep=rep, verifier=verifier)
     app.add_route("/presentation", presentationEnd)
+    app.add_route("/presentation/verify", presentationEnd, suffix="verify")
 
     multiIcpEnd = MultisigInceptEnd(hby=hby, counselor=counselor, notifier=notifier)
     app.add_route("/groups/{alias}/icp", multiIcpEnd)
@@ -3293,7 +3360,7 @@ def setup(hby, rgy, servery, bootConfig, *, controller="", insecure=False, stati
     issueHandler = protocoling.IssueHandler(hby=hby, rgy=rgy, notifier=notifier)
     requestHandler = protocoling.PresentationRequestHandler(hby=hby, wallet=wallet)
     applyHandler = protocoling.ApplyHandler(hby=hby, rgy=rgy, verifier=verifier, name=hby.name)
-    proofHandler = protocoling.PresentationProofHandler(proofs=proofs)
+    proofHandler = protocoling.PresentationProofHandler(proofs=proofs, verifier=verifier)
 
     handlers.extend([issueHandler, requestHandler, proofHandler, applyHandler])
 
@@ -3,8 +3,12 @@
 keri.app.storing module
 
 """
+import datetime
 import itertools
 import random
+import weakref
+from dataclasses import dataclass
+from typing import Optional
 
 from hio.base import doing
 from hio.help import decking
@@ -12,6 +16,7 @@ from ordered_set import OrderedSet as oset
 
 from . import httping, agenting, forwarding
 from .. import help
+from ..help import helping
 from ..core import coring
 from ..core.coring import MtrDex
 from ..db import dbing, subing
@@ -20,6 +25,30 @@ from ..peer import exchanging
 logger = help.ogler.getLogger()
 
 
+@dataclass
+class RetentionPolicy:
+    """
+    Retention policy for mailbox topics whose route starts with .topic.
+
+    The route of a topic key is the part starting at the first '/' after the
+    recipient prefix, so topic "/receipt" matches "{pre}/receipt" for every pre.
+    The empty topic matches every topic key.  When several policies match, the
+    one with the longest .topic applies.
+
+    Attributes:
+        topic (str): route prefix this policy applies to
+        age (float): seconds after storage an entry expires, None means never
+        count (int): maximum number of entries retained per topic, None means unlimited
+        acked (bool): True means entries below the index acknowledged by the
+            recipient are removed
+
+    """
+    topic: str = ""
+    age: Optional[float] = None
+    count: Optional[int] = None
+    acked: bool = False
+
+
 class Mailboxer(dbing.LMDBer):
     """
     Mailboxer stores exn messages in order and provider iterator access at an index.
@@ -29,17 +58,25 @@ class Mailboxer(dbing.LMDBer):
     AltTailDirPath = ".keri/mbx"
     TempPrefix = "keri_mbx_"
 
-    def __init__(self, name="mbx", headDirPath=None, reopen=True, **kwa):
+    def __init__(self, name="mbx", headDirPath=None, reopen=True, shared=False, **kwa):
         """
 
         Parameters:
             headDirPath:
             perm:
             reopen:
+            shared (bool): True means other processes store to and compact the same mailbox
             kwa:
         """
+        self.shared = shared
         self.tpcs = None
         self.msgs = None
+        self.mdts = None
+        self.mrcs = None
+        self.acks = None
+        self.tcts = None
+        self.cursor = b''  # topic key where the next compaction batch resumes
+        self.subs = dict()  # topic bytes to WeakSet of subscribers with .notify(topic)
 
         super(Mailboxer, self).__init__(name=name, headDirPath=headDirPath, reopen=reopen, **kwa)
 
@@ -53,6 +90,10 @@ class Mailboxer(dbing.LMDBer):
 
         self.tpcs = self.env.open_db(key=b'tpcs.', dupsort=True)
         self.msgs = subing.Suber(db=self, subkey='msgs.')  # key states
+        self.mdts = subing.Suber(db=self, subkey='mdts.')  # message digest to datetime first stored
+        self.mrcs = subing.Suber(db=self, subkey='mrcs.')  # message digest to hex count of topic references
+        self.acks = subing.Suber(db=self, subkey='acks.')  # topic key to hex next index requested by recipient
+        self.tcts = subing.Suber(db=self, subkey='tcts.')  # topic key to hex count of messages ever stored in topic
 
         return self.env
 
@@ -109,6 +150,10 @@ class Mailboxer(dbing.LMDBer):
             topic (qb64b):
 
         """
+        if self.shared and not self.lockDepth:  # reference counts are read, modify, write
+            with self.locked():
+                return self.storeMsg(topic, msg)
+
         if hasattr(topic, "encode"):
             topic = topic.encode("utf-8")
 
@@ -117,7 +162,80 @@ class Mailboxer(dbing.LMDBer):
 
         digb = coring.Diger(ser=msg, code=MtrDex.Blake3_256).qb64b
         self.appendToTopic(topic=topic, val=digb)
-        return self.msgs.pin(keys=digb, val=msg)
+        refs = self.mrcs.get(keys=digb)
+        self.mrcs.pin(keys=digb, val=f"{(int(refs, 16) if refs else 0) + 1:x}")
+        self.mdts.put(keys=digb, val=helping.nowIso8601())
+        result = self.msgs.pin(keys=digb, val=msg)
+        self.tcts.pin(keys=topic, val=f"{self.count(topic) + 1:x}")
+        self.notify(topic)
+        return result
+
+    def version(self):
+        """ Returns id of the last write transaction committed to the mailbox by any process
+
+        Subscribers are only notified of messages stored by this process so streams on a
+        shared mailbox compare versions to detect messages stored by other processes.
+
+        """
+        return self.env.info()["last_txnid"]
+
+    def count(self, topic):
+        """ Returns number of messages ever stored in topic
+
+        Unlike the topic ordinals the count never goes back when acknowledged messages are
+        compacted, so streams on a shared mailbox compare counts to find the topics that
+        another process stored to.
+
+        Parameters:
+            topic (Option(bytes|str)): full topic key (prefix + topic)
+
+        """
+        cnt = self.tcts.get(keys=topic)
+        return int(cnt, 16) if cnt else 0
+
+    def subscribe(self, topic, sub):
+        """ Register sub to be notified when a message is stored in topic
+
+        Subscribers are held weakly so an abandoned stream does not leak.
+
+        Parameters:
+            topic (Option(bytes|str)): full topic key (prefix + topic) to watch
+            sub (object): subscriber with .notify(topic) method
+
+        """
+        if hasattr(topic, "encode"):
+            topic = topic.encode("utf-8")
+
+        if topic not in self.subs:
+            self.subs[topic] = weakref.WeakSet()
+        self.subs[topic].add(sub)
+
+    def unsubscribe(self, topic, sub):
+        """ Remove sub from the subscribers of topic
+
+        Parameters:
+            topic (Option(bytes|str)): full topic key (prefix + topic) being watched
+            sub (object): subscriber previously registered with .subscribe
+
+        """
+        if hasattr(topic, "encode"):
+            topic = topic.encode("utf-8")
+
+        if (subs := self.subs.get(topic)) is not None:
+            subs.discard(sub)
+            if not subs:
+                del self.subs[topic]
+
+    def notify(self, topic):
+        """ Wake each subscriber of topic
+
+        Parameters:
+            topic (bytes): full topic key (prefix + topic) that received a message
+
+        """
+        if (subs := self.subs.get(topic)) is not None:
+            for sub in list(subs):
+                sub.notify(topic)
 
     def cloneTopicIter(self, topic, fn=0):
         """
@@ -133,6 +251,196 @@ class Mailboxer(dbing.LMDBer):
             if msg := self.msgs.get(keys=dig):
                 yield ion, topic, msg.encode("utf-8")
 
+    def ackTopic(self, topic, idx):
+        """ Record that the recipient has retrieved every entry of topic below idx
+
+        Parameters:
+            topic (Option(bytes|str)): full topic key (prefix + topic)
+            idx (int): next index requested by the recipient
+
+        """
+        if hasattr(topic, "encode"):
+            topic = topic.encode("utf-8")
+
+        acked = self.acks.get(keys=topic)
+        if acked is None or int(acked, 16) < idx:
+            self.acks.pin(keys=topic, val=f"{idx:x}")
+
+    def remTopicMsg(self, iokey, dig):
+        """ Remove one topic index entry and the message when no other topic references it
+
+        Parameters:
+            iokey (bytes): topic index key with ordinal suffix
+            dig (bytes): digest of the message at iokey
+
+        """
+        self.delIoSetIokey(db=self.tpcs, iokey=iokey)
+        refs = self.mrcs.get(keys=dig)
+        refs = int(refs, 16) - 1 if refs else 0
+        if refs > 0:
+            self.mrcs.pin(keys=dig, val=f"{refs:x}")
+        else:
+            self.mrcs.rem(keys=dig)
+            self.mdts.rem(keys=dig)
+            self.msgs.rem(keys=dig)
+
+    def compact(self, policies, limit=100, now=None):
+        """ Remove up to limit expired or acknowledged topic entries
+
+        Walks the topic index from .cursor so successive calls spread the work
+        over the whole database in bounded batches.  The last entry of every
+        topic is always retained so that appended ordinals remain monotonic.
+
+        Parameters:
+            policies (Iterable[RetentionPolicy]): retention policies to apply
+            limit (int): maximum number of entries removed by this call
+            now (datetime): current time, defaults to now in UTC
+
+        Returns:
+            int: number of topic entries removed
+
+        """
+        if self.shared and not self.lockDepth:
+            with self.locked():
+                return self.compact(policies, limit=limit, now=now)
+
+        policies = sorted(policies, key=lambda p: len(p.topic), reverse=True)
+        if not policies:
+            return 0
+
+        now = now if now is not None else helping.nowUTC()
+        removals = []
+        start, self.cursor = self.cursor, b''
+        for topic, entries in self.getTopicsIter(start=start):
+            if len(removals) >= limit:
+                self.cursor = topic
+                break
+
+            policy = self.policyFor(topic, policies)
+            if policy is None:
+                continue
+
+            removals.extend(self.expired(topic, entries, policy, now)[:limit - len(removals)])
+
+        for iokey, dig in removals:  # remove after the read transaction has completed
+            self.remTopicMsg(iokey, dig)
+
+        return len(removals)
+
+    def getTopicsIter(self, start=b''):
+        """ Iterate (topic, [(iokey, dig)]) over every topic starting at start and wrapping around
+
+        Parameters:
+            start (bytes): topic key to begin at
+
+        """
+        for begin, end in ((start, None), (b'', start)) if start else ((b'', None),):
+            topic, entries = None, []
+            for iokey, dig in self.getAllItemIter(db=self.tpcs, key=begin, split=False):
+                key, _ = dbing.unsuffix(bytes(iokey))
+                if end is not None and key >= end:
+                    break
+                if key != topic:
+                    if entries:
+                        yield topic, entries
+                    topic, entries = key, []
+                entries.append((iokey, bytes(dig)))
+            if entries:
+                yield topic, entries
+
+    @staticmethod
+    def policyFor(topic, policies):
+        """ Returns the first RetentionPolicy in policies matching the route of topic or None
+
+        Parameters:
+            topic (bytes): full topic key (prefix + topic)
+            policies (list): RetentionPolicy instances ordered longest .topic first
+
+        """
+        topic = topic.decode("utf-8")
+        route = topic[topic.index("/"):] if "/" in topic else ""
+        for policy in policies:
+            if route.startswith(policy.topic):
+                return policy
+        return None
+
+    def expired(self, topic, entries, policy, now):
+        """ Returns list of (iokey, dig) of entries of topic removable under policy
+
+        Parameters:
+            topic (bytes): full topic key (prefix + topic)
+            entries (list): (iokey, dig) tuples of topic in insertion order
+            policy (RetentionPolicy): policy to apply
+            now (datetime): current time
+
+        """
+        keep = entries[-1:]  # always retain last entry so ordinals stay monotonic
+        entries = entries[:-1]
+        cut = 0
+        if policy.count is not None:
+            cut = max(cut, len(entries) + len(keep) - policy.count)
+        if policy.acked:
+            acked = self.acks.get(keys=topic)
+            if acked is not None:
+                acked = int(acked, 16)
+                cut = max(cut, sum(1 for iokey, _ in entries if dbing.unsuffix(iokey)[1] < acked))
+        if policy.age is not None:
+            expiry = now - datetime.timedelta(seconds=policy.age)
+            for iokey, dig in entries[cut:]:
+                dts = self.mdts.get(keys=dig)
+                if dts is None or helping.fromIso8601(dts) > expiry:
+                    break
+                cut += 1
+
+        return entries[:min(cut, len(entries))]
+
+    def stats(self):
+        """ Returns dict of storage metrics keyed by recipient prefix
+
+        Each value is a dict with the number of topics, topic entries and total
+        message bytes stored for the recipient.
+
+        """
+        stats = dict()
+        for topic, entries in self.getTopicsIter():
+            topic = topic.decode("utf-8")
+            pre = topic[:topic.index("/")] if "/" in topic else topic
+            stat = stats.setdefault(pre, dict(topics=0, msgs=0, size=0))
+            stat["topics"] += 1
+            stat["msgs"] += len(entries)
+            for _, dig in entries:
+                if msg := self.msgs.get(keys=dig):
+                    stat["size"] += len(msg)
+
+        return stats
+
+
+class MailboxCompactor(doing.Doer):
+    """
+    Doer that periodically removes expired or acknowledged mailbox entries in
+    bounded batches according to retention policies.
+
+    """
+
+    def __init__(self, mbx, policies, batch=100, tock=1.0, **kwa):
+        """
+        Parameters:
+            mbx (Mailboxer): mailbox storage to compact
+            policies (Iterable[RetentionPolicy]): retention policies to apply
+            batch (int): maximum number of entries removed per run
+            tock (float): seconds between runs
+
+        """
+        self.mbx = mbx
+        self.policies = list(policies)
+        self.batch = batch
+        super(MailboxCompactor, self).__init__(tock=tock, **kwa)
+
+    def recur(self, tyme):
+        """ Remove one batch of expired entries """
+        self.mbx.compact(self.policies, limit=self.batch)
+        return False
+
 
 class Respondant(doing.DoDoer):
     """
@@ -250,6 +558,7 @@ class Respondant(doing.DoDoer):
         _ = (yield self.tock)
 
         while True:
+            rcts = dict()  # receipts batched by topic so a burst is delivered as one mailbox message
             while self.cues:  # iteratively process each cue in cues
                 msg = bytearray()
                 cue = self.cues.popleft()
@@ -265,8 +574,10 @@ class Respondant(doing.DoDoer):
                         if match := owits.intersection(self.hby.prefixes):
                             pre = match.pop()
                             hab = self.hby.habs[pre]
-                            msg.extend(hab.receipt(serder))
-                            self.mbx.storeMsg(topic=serder.preb + b'/receipt', msg=msg)
+                            topic = serder.preb + b'/receipt'
+                            if topic not in rcts:
+                                rcts[topic] = bytearray()
+                            rcts[topic].extend(hab.receipt(serder))
 
                 elif cueKin in ("replay",):
                     src = cue["src"]
@@ -334,4 +645,7 @@ class Respondant(doing.DoDoer):
                         del atc[:serder.size]
                         self.postman.send(src=src, dest=dest, topic="reply", serder=serder, attachment=atc)
 
+            for topic, msgs in rcts.items():
+                self.mbx.storeMsg(topic=topic, msg=msgs)
+
             yield self.tock
@@ -1790,6 +1790,7 @@ class Kever:
             self.fn = fn
             self.dater = Dater(dts=dts)
             self.db.states.pin(keys=self.prefixer.qb64, val=self.state())
+            self.db.changed("kel", self.prefixer.qb64)
 
     @property
     def kevers(self):
@@ -2051,6 +2052,7 @@ class Kever:
                 self.fn = fn
                 self.dater = Dater(dts=dts)
                 self.db.states.pin(keys=self.prefixer.qb64, val=self.state())
+                self.db.changed("kel", self.prefixer.qb64)
 
 
         elif ilk == Ilks.ixn:  # subsequent interaction event
@@ -2098,6 +2100,7 @@ class Kever:
                 self.fn = fn
                 self.dater = Dater(dts=dts)
                 self.db.states.pin(keys=self.prefixer.qb64, val=self.state())
+                self.db.changed("kel", self.prefixer.qb64)
 
         else:  # unsupported event ilk so discard
             raise ValidationError("Unsupported ilk = {} for evt = {}.".format(ilk, ked))
@@ -2633,6 +2636,7 @@ class Kevery:
                 non-idempotent way. Useful for reinitializing the Kevers from
                 a persisted KEL without updating non-idempotent first seen .fels
                 and timestamps.
+        shared (bool): True means db is shared with other processes that log events
 
 
     Properties:
@@ -2653,7 +2657,7 @@ class Kevery:
     TimeoutQNF = 300   # seconds to timeout query not found escrows
 
     def __init__(self, *, evts=None, cues=None, db=None, rvy=None,
-                 lax=True, local=False, cloned=False, direct=True, check=False):
+                 lax=True, local=False, cloned=False, direct=True, check=False, shared=False):
         """
         Initialize instance:
 
@@ -2676,6 +2680,9 @@ class Kevery:
                 non-idempotent way. Useful for reinitializing the Kevers from
                 a persisted KEL without updating non-idempotent first seen .fels
                 and timestamps.
+            shared (bool): True means other processes log events to the same db so
+                process each event under the db lock against fresh key state
+                False means this process is the only writer of db
         """
         self.evts = evts if evts is not None else decking.Deck()  # subclass of deque
         self.cues = cues if cues is not None else decking.Deck()  # subclass of deque
@@ -2688,6 +2695,8 @@ class Kevery:
         self.cloned = True if cloned else False  # process as cloned
         self.direct = True if direct else False  # process as direct mode
         self.check = True if check else False  # process as check mode
+        self.shared = True if shared else False  # db shared with other processes
+        self.sources = set()  # prefixes of events and witness receipts processed that may be escrowed
 
     @property
     def kevers(self):
@@ -2720,6 +2729,15 @@ class Kevery:
                  the sequence number
 
         """
+        if self.shared and not self.db.lockDepth:  # key state may have been changed by another process
+            with self.db.locked():
+                self.db.refresh(pre)
+                return self.fetchWitnessState(pre, sn)
+
+        if (kever := self.kevers.get(pre)) is not None and sn >= kever.lastEst.s:
+            # current establishment state covers sn, avoids walking back over a burst of ixns
+            return [coring.Prefixer(qb64=wit) for wit in kever.wits]
+
         preb = pre.encode("utf-8")
         for digb in self.db.getKelBackIter(preb, sn):
             dgkey = dgKey(preb, digb)
@@ -2766,6 +2784,13 @@ class Kevery:
                 If cloned mode then dater maybe provided (not None)
                 When dater provided then use dater for first seen datetime
         """
+        if self.shared and not self.db.lockDepth:  # first seen ordering across processes
+            with self.db.locked():
+                self.db.refresh(serder.pre)
+                return self.processEvent(serder, sigers, wigers=wigers, seqner=seqner, saider=saider,
+                                         firner=firner, dater=dater)
+
+        self.sources.add(serder.pre)
         # fetch ked ilk  pre, sn, dig to see how to process
         ked = serder.ked
         try:  # see if code of pre is supported and matches size of pre
@@ -2924,6 +2949,12 @@ class Kevery:
             ilk  # rct
             dig  # qb64 digest of receipted event
         """
+        if self.shared and not self.db.lockDepth:  # witness list of fresh key state
+            with self.db.locked():
+                self.db.refresh(serder.pre)
+                return self.processReceiptWitness(serder, wigers)
+
+        self.sources.add(serder.pre)
         # fetch  pre dig to process
         ked = serder.ked
         pre = serder.pre
@@ -3830,6 +3861,10 @@ class Kevery:
 
         """
         ked = serder.ked
+        if self.shared and not self.db.lockDepth and "i" in ked["q"]:  # answer from fresh key state
+            with self.db.locked():
+                self.db.refresh(ked["q"]["i"])
+                return self.processQuery(serder, source=source, sigers=sigers, cigars=cigars)
 
         ilk = ked["t"]
         route = ked["r"]
@@ -23,6 +23,18 @@ class Router:
     Reply message router that accepts registration of route `r` handlers and dispatches
     reply messages to the appropriate handler.
 
+    Route templates are compiled into a trie of path segments so finding the handler of a
+    reply costs one lookup per segment of its route however many routes are registered.
+    Literal segments are matched before parameters, parameters in registration order.
+    Parameters may be typed as {name:type} with a type in .Converters, a segment that
+    does not convert does not match.
+
+    Attributes:
+        routes (list): registered Route instances
+        trie (RouteNode): root of segment trie of templated routes
+        stats (dict): route template to count of replies dispatched to it
+        misses (int): count of replies with a route no template matched
+
     """
 
     defaultResourceFunc = "processReply"
@@ -35,6 +47,12 @@ class Router:
 
         """
         self.routes = routes if routes is not None else list()
+        self.trie = RouteNode()
+        self.stats = dict()
+        self.misses = 0
+        for route in self.routes:
+            if route.template is not None:
+                self.trie.insert(route)
 
     def addRoute(self, routeTemplate, resource, suffix=None):
         """ Add a route between a route template and a resource
@@ -50,40 +68,61 @@ class Router:
         """
 
         fields, regex = compile_uri_template(routeTemplate)
-        self.routes.append(Route(regex=regex, fields=fields, resource=resource, suffix=suffix))
+        route = Route(regex=regex, fields=fields, resource=resource, suffix=suffix, template=routeTemplate)
+        self.routes.append(route)
+        self.trie.insert(route)
 
     def dispatch(self, serder, saider, cigars, tsgs):
-        """
+        """ Dispatch reply message to the handler of the resource registered for its route
 
         Parameters:
-            serder:
-            saider:
-            cigars:
-            tsgs:
-
-        Returns:
+            serder (Serder): reply event message
+            saider (Saider): SAIDer of the reply
+            cigars (list): of non-transferable signature tuples
+            tsgs (list): of transferable signature tuples
 
         """
         ked = serder.ked
         # Dispatch based on route
         r = ked["r"]
-        route, match = self._find(route=r)
+        route, kwargs = self._find(route=r)
         if route is None:
+            self.misses += 1
             raise kering.ValidationError(f"No resource is registered to handle route {r}")
 
         fname = self.defaultResourceFunc
         if route.suffix is not None:
             fname += route.suffix
 
-        kwargs = match.groupdict()
         for name in route.fields:
             if name not in kwargs:
                 raise kering.ValidationError(f"parameter {name} not found in route {r}")
 
+        self.stats[route.template] = self.stats.get(route.template, 0) + 1
         fn = getattr(route.resource, fname, self.processRouteNotFound)
         fn(serder=serder, saider=saider, route=r, cigars=cigars, tsgs=tsgs, **kwargs)
 
     def _find(self, route):
+        """ Find the route registered for reply route in the segment trie
+
+        Falls back to a linear search of preregistered routes that have no template.
+
+        Parameters:
+            route (str): the route from the `r` of the reply message
+
+        Returns:
+            Route: the Route object with the resource that is registered to process this rpy message
+            dict: the parameters captured from the route converted to their types
+
+        """
+        found, params = self.trie.match(route)
+        if found is None and any(r.template is None for r in self.routes):
+            found, match = self._scan(route, routes=[r for r in self.routes if r.template is None])
+            params = match.groupdict() if match is not None else None
+
+        return found, params
+
+    def _scan(self, route, routes=None):
         """ Linear seach thru added routes, returning the first one that matchs
 
         Searches through the registered routes until a regex in one of the routes matches
@@ -91,13 +130,14 @@ class Router:
 
         Parameters:
             route (str): the route from the `r` of the reply message
+            routes (list): Routes to search, defaults to all registered routes
 
         Returns:
             Route: the Route object with the resource that is registered to process this rpy message
             re.Match:  the regular expression match that contains the grouping of matched parameters.
 
         """
-        for r in self.routes:
+        for r in (routes if routes is not None else self.routes):
             if res := r.regex.search(route):
                 return r, res
 
@@ -522,10 +562,11 @@ class Route:
         .fields(set): field names for matches in regex
         .resource(object): the handler for this route
         .suffix(Optional(str)): a suffix to be applied to the handler method
+        .template(Optional(str)): route template the route was compiled from
 
     """
 
-    def __init__(self, regex, fields, resource, suffix=None):
+    def __init__(self, regex, fields, resource, suffix=None, template=None):
         """ Initialize instance of route
 
         Parameters:
@@ -533,12 +574,119 @@ class Route:
             fields(set): field names for matches in regex
             resource(object): the handler for this route
             suffix(Optional(str)): a suffix to be applied to the handler method
+            template(Optional(str)): route template the route was compiled from
 
         """
         self.regex = regex
         self.fields = fields
         self.resource = resource
         self.suffix = suffix
+        self.template = template
+
+
+def decimal(segment):
+    """ Returns int of route segment of decimal digits, raises ValueError otherwise """
+    if not segment.isdecimal():
+        raise ValueError(f"invalid decimal route segment {segment}")
+    return int(segment)
+
+
+def hexadecimal(segment):
+    """ Returns int of route segment of hex digits, raises ValueError otherwise """
+    if not segment or segment.strip("0123456789abcdefABCDEF"):
+        raise ValueError(f"invalid hex route segment {segment}")
+    return int(segment, 16)
+
+
+# route template parameter type to converter of route segment to parameter value
+Converters = dict(str=str, int=decimal, hex=hexadecimal)
+
+
+class RouteNode:
+    """ Node of the segment trie of a Router
+
+    Attributes:
+        literals (dict): lower cased literal segment to child RouteNode
+        params (list): (name, type, child RouteNode) of parameter segments in registration order
+        route (Optional(Route)): route whose template ends at this node
+
+    """
+    __slots__ = ("literals", "params", "route")
+
+    def __init__(self):
+        self.literals = dict()
+        self.params = []
+        self.route = None
+
+    def insert(self, route):
+        """ Add route to the trie below this node by the segments of its template
+
+        The first route registered for a template is kept as with a linear search.
+
+        """
+        node = self
+        for segment in segments(normalize(route.template)):
+            if m := re.fullmatch(r'{([a-zA-Z]\w*)(?::(\w+))?}', segment):
+                name, kind = m.group(1), m.group(2) or "str"
+                if kind not in Converters:
+                    raise kering.ConfigurationError(f"unknown type {kind} of parameter {name} in route "
+                                                    f"{route.template}")
+                for pname, pkind, child in node.params:
+                    if (pname, pkind) == (name, kind):
+                        node = child
+                        break
+                else:
+                    child = RouteNode()
+                    node.params.append((name, kind, child))
+                    node = child
+            else:
+                node = node.literals.setdefault(segment.lower(), RouteNode())
+
+        if node.route is None:
+            node.route = route
+
+    def match(self, route):
+        """ Returns (Route, params) of route matched below this node or (None, None)
+
+        Parameters:
+            route (str): the route from the `r` of the reply message
+
+        """
+        if not route.startswith('/'):
+            return None, None
+        return self._match(segments(route), 0, {})
+
+    def _match(self, parts, index, params):
+        if index == len(parts):
+            return (self.route, params) if self.route is not None else (None, None)
+
+        part = parts[index]
+        if (child := self.literals.get(part.lower())) is not None:
+            found, captured = child._match(parts, index + 1, params)
+            if found is not None:
+                return found, captured
+
+        if part:
+            for name, kind, child in self.params:
+                try:
+                    value = Converters[kind](part)
+                except ValueError:
+                    continue
+                found, captured = child._match(parts, index + 1, {**params, name: value})
+                if found is not None:
+                    return found, captured
+
+        return None, None
+
+
+def normalize(template):
+    """ Returns route template without trailing slash except for the root template '/' """
+    return template[:-1] if template != '/' and template.endswith('/') else template
+
+
+def segments(route):
+    """ Returns list of '/' separated segments of route after its leading '/' """
+    return [] if route == '/' else route[1:].split('/')
 
 
 def compile_uri_template(template):
@@ -587,7 +735,8 @@ def compile_uri_template(template):
 
     # template names should be able to start with A-Za-z
     # but also contain 0-9_ in the remaining portion
-    expression_pattern = r'{([a-zA-Z]\w*)}'
+    # optionally typed as {name:type}
+    expression_pattern = r'{([a-zA-Z]\w*)(?::\w+)?}'
 
     # Get a list of field names
     fields = set(re.findall(expression_pattern, template))
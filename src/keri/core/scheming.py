@@ -6,6 +6,7 @@ self-addressing and schema support
 """
 
 import json
+from collections import OrderedDict
 
 import cbor2 as cbor
 import jsonschema
@@ -45,6 +46,7 @@ class CacheResolver:
             return
 
         self.db.schema.pin(key, schemer)
+        self.db.changed("schema", key)
 
     def resolve(self, uri):
         schemer = self.db.schema.get(uri)
@@ -83,6 +85,94 @@ class CacheResolver:
         return jsonschema.RefResolver("", scer, handlers={"did": self.handler})
 
 
+class ValidatorCache:
+    """ Least recently used cache of compiled JSON Schema validators keyed by schema SAID
+
+    Schema SAIDs are immutable so a compiled validator never needs to be invalidated.  The
+    external $refs of a schema are resolved once when it is compiled and stored with the
+    validator so cached validators do not depend on the resolver or database they were
+    compiled with.  Schemas without a SAID or with $refs that can not be resolved yet are
+    compiled on every use and not cached.
+
+    """
+
+    def __init__(self, size=256):
+        """ Create empty cache
+
+        Parameters:
+            size (int): maximum number of compiled validators retained
+
+        """
+        self.size = size
+        self.validators = OrderedDict()
+
+    def validator(self, schema, resolver=None, scer=b''):
+        """ Returns compiled validator for schema from cache, compiling and caching it if missing
+
+        Parameters:
+            schema (dict): JSON schema to validate against
+            resolver (CacheResolver): resolver of external $refs in schema
+            scer (bytes): source document for lazy reference resolution of uncached validators
+
+        Raises:
+            jsonschema.exceptions.SchemaError: if schema is not valid JSON Schema
+
+        """
+        said = schema.get(Ids.dollar) if isinstance(schema, dict) else None
+        if said is not None and said in self.validators:
+            self.validators.move_to_end(said)
+            return self.validators[said]
+
+        cls = jsonschema.validators.validator_for(schema)
+        cls.check_schema(schema)
+
+        store = self.refs(schema, resolver=resolver)
+        if store is None:  # unresolved references so resolve lazily and do not cache
+            kwargs = dict(resolver=resolver.resolver(scer=scer)) if resolver is not None else dict()
+            return cls(schema, **kwargs)
+
+        kwargs = dict(resolver=jsonschema.RefResolver("", schema, store=store)) if store else dict()
+        validator = cls(schema, **kwargs)
+        if said is not None:
+            self.validators[said] = validator
+            if len(self.validators) > self.size:
+                self.validators.popitem(last=False)
+
+        return validator
+
+    @staticmethod
+    def refs(schema, resolver=None):
+        """ Returns dict of external $ref URIs of schema mapped to resolved schema, None if any is unresolved
+
+        Parameters:
+            schema (dict): JSON schema with external $refs to resolve
+            resolver (CacheResolver): resolver of external $refs
+
+        """
+        store = dict()
+        pending = [schema]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, dict):
+                ref = node.get("$ref")
+                if isinstance(ref, str) and not ref.startswith("#"):
+                    uri = ref.split("#")[0]
+                    if uri not in store:
+                        sed = resolver.handler(uri) if resolver is not None else None
+                        if sed is None:
+                            return None
+                        store[uri] = sed
+                        pending.append(sed)
+                pending.extend(node.values())
+            elif isinstance(node, list):
+                pending.extend(node)
+
+        return store
+
+
+Validators = ValidatorCache()  # process wide cache of compiled validators
+
+
 class JSONSchema:
     """ JSON Schema support class
     """
@@ -224,10 +314,9 @@ class JSONSchema:
         """
         try:
             d = json.loads(raw)
-            kwargs = dict()
-            if self.resolver is not None:
-                kwargs["resolver"] = self.resolver.resolver(scer=raw)
-            jsonschema.validate(instance=d, schema=schema, **kwargs)
+            validator = Validators.validator(schema, resolver=self.resolver, scer=raw)
+            if (error := jsonschema.exceptions.best_match(validator.iter_errors(d))) is not None:
+                raise error
         except jsonschema.exceptions.ValidationError as ex:
             raise kering.ValidationError(f'Credential validation exception: {ex}')
         except jsonschema.exceptions.SchemaError as ex:
@@ -128,6 +128,8 @@ class OobiRecord:
     eid: str = None
     role: str = None
     date: str = None
+    etag: str = None  # digest of last resolved response, sent as If-None-Match
+    state: str = None  # said of latest event of cid when last resolved
 
 
 @dataclass
@@ -765,6 +767,18 @@ class Baser(dbing.LMDBer):
         # exchange pathed attachments
         self.epath = subing.IoSetSuber(db=self, subkey=".epath")
 
+        # exchange partial signature escrow index by sender key state waited for
+        # maps (sender prefix, sn hex) to set of exn SAIDs
+        self.epwt = subing.IoSetSuber(db=self, subkey='epwt.')
+
+        # exchange partial signature escrow time index
+        # maps (Dater qb64 of escrow time, exn SAID) to exn SAID
+        self.epst = subing.Suber(db=self, subkey='epst.')
+
+        # exchange messages seen within the replay window spilled from memory
+        # maps (exn SAID, sender) to Dater of when it expires from the window
+        self.esen = subing.CesrSuber(db=self, subkey='esen.', klas=coring.Dater)
+
         # KSN support datetime stamps and signatures indexed and not-indexed
         # all ksn  kdts (key state datetime serializations) maps said to date-time
         self.kdts = subing.CesrSuber(db=self, subkey='kdts.', klas=coring.Dater)
@@ -807,12 +821,24 @@ class Baser(dbing.LMDBer):
                                   schema=OobiRecord,
                                   sep=">")  # Use seperator not a allowed in URLs so no splitting occurs.
 
+        # OOBIs that failed to load and are not retried, keyed by oobi URL
+        self.foobi = koming.Komer(db=self,
+                                  subkey='foobi.',
+                                  schema=OobiRecord,
+                                  sep=">")  # Use seperator not a allowed in URLs so no splitting occurs.
+
         # OOBIs with outstand client requests.
         self.coobi = koming.Komer(db=self,
                                   subkey='coobi.',
                                   schema=OobiRecord,
                                   sep=">")  # Use seperator not a allowed in URLs so no splitting occurs.
 
+        # resolved OOBIs cached with response digest and key state, keyed by oobi URL
+        self.roobi = koming.Komer(db=self,
+                                  subkey='roobi.',
+                                  schema=OobiRecord,
+                                  sep=">")  # Use seperator not a allowed in URLs so no splitting occurs.
+
         # JSON schema SADs keys by the SAID
         self.schema = subing.SchemerSuber(db=self,
                                           subkey='schema.')
@@ -836,6 +862,22 @@ class Baser(dbing.LMDBer):
 
         return self.env
 
+    def refresh(self, pre):
+        """
+        Drop the in memory Kever for pre when the key state saved in the database has a
+        later event than the cached Kever, as happens when another process sharing the
+        database logs an event.  The next access to .kevers reloads it from .states.
+
+        Parameters:
+            pre (str): qb64 identifier prefix
+        """
+        if not dict.__contains__(self._kevers, pre):
+            return
+
+        state = self.states.get(keys=pre)
+        if state is not None and state.ked["d"] != dict.__getitem__(self._kevers, pre).serder.said:
+            dict.__delitem__(self._kevers, pre)
+
     def reload(self):
         """
         Reload stored prefixes and Kevers from .habs
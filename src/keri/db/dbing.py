@@ -45,11 +45,13 @@ l
 
 """
 
+import fcntl
 import os
 import shutil
 import stat
+import weakref
 from collections import abc
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from typing import Union
 
 import lmdb
@@ -346,6 +348,10 @@ class LMDBer(filing.Filer):
         """
         self.env = None
         self.readonly = True if readonly else False
+        self.lockfile = None  # open lock file while .locked by this process
+        self.lockDepth = 0  # nesting depth of .locked in this process
+        self.watchers = dict()  # topic to WeakSet of watchers with .changed(topic, key)
+        self.rtxn = None  # read transaction shared by all reads while in .reading context
         super(LMDBer, self).__init__(**kwa)
 
 
@@ -403,7 +409,106 @@ class LMDBer(filing.Filer):
         return(super(LMDBer, self).close(clear=clear))
 
 
+    @contextmanager
+    def locked(self):
+        """
+        Context manager that holds an exclusive lock on the database shared by all processes
+        that open the same .path.  LMDB serializes individual write transactions across
+        processes but not a read, validate and write sequence made of several transactions,
+        so processes that share a database use this to make such a sequence atomic.
+        Reentrant within a process.
+        """
+        if self.lockDepth == 0:
+            self.lockfile = open(os.path.join(self.path, "lock.keri"), "a")
+            fcntl.flock(self.lockfile, fcntl.LOCK_EX)
+        self.lockDepth += 1
+        try:
+            yield self
+        finally:
+            self.lockDepth -= 1
+            if self.lockDepth == 0:
+                fcntl.flock(self.lockfile, fcntl.LOCK_UN)
+                self.lockfile.close()
+                self.lockfile = None
+
+
     # For subdbs with no duplicate values allowed at each key. (dupsort==False)
+    @contextmanager
+    def reading(self):
+        """ Context manager in which all reads by this process share one read transaction
+
+        Reads within the context see one consistent snapshot of the database however many
+        sub dbs they touch, and avoid the cost of a transaction per read. Writes made within
+        the context are not seen by its reads. Reentrant. Iterators over the database must be
+        exhausted before the context exits.
+
+        Usage:
+
+        with dber.reading():
+            ...
+
+        """
+        if self.rtxn is not None:  # already reading
+            yield self.rtxn
+            return
+
+        with self.env.begin(write=False, buffers=True) as txn:
+            self.rtxn = txn
+            try:
+                yield txn
+            finally:
+                self.rtxn = None
+
+    def reader(self, db):
+        """ Returns context manager of a read transaction on db, the shared .rtxn when in .reading
+
+        Parameters:
+            db (lmdb._Database): instance of named sub db
+
+        """
+        if self.rtxn is not None:
+            return nullcontext(self.rtxn)
+        return self.env.begin(db=db, write=False, buffers=True)
+
+    def watch(self, topic, watcher):
+        """ Register watcher to be told by .changed when data of topic is written by this process
+
+        Watchers are held weakly so an abandoned watcher does not leak.
+
+        Parameters:
+            topic (str): kind of data to watch such as "kel" or "schema"
+            watcher (object): watcher with .changed(topic, key) method
+
+        """
+        if topic not in self.watchers:
+            self.watchers[topic] = weakref.WeakSet()
+        self.watchers[topic].add(watcher)
+
+    def unwatch(self, topic, watcher):
+        """ Remove watcher from the watchers of topic
+
+        Parameters:
+            topic (str): kind of data being watched
+            watcher (object): watcher previously registered with .watch
+
+        """
+        if (watchers := self.watchers.get(topic)) is not None:
+            watchers.discard(watcher)
+            if not watchers:
+                del self.watchers[topic]
+
+    def changed(self, topic, key):
+        """ Tell each watcher of topic that data at key of topic has been written
+
+        Parameters:
+            topic (str): kind of data written
+            key (str): qb64 identifier of data written such as a prefix or SAID
+
+        """
+        if (watchers := self.watchers.get(topic)) is not None:
+            for watcher in list(watchers):
+                watcher.changed(topic, key)
+
     def putVal(self, db, key, val):
         """
         Write serialized bytes val to location key in db
@@ -445,8 +550,8 @@ class LMDBer(filing.Filer):
             key is bytes of key within sub db's keyspace
 
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            return( txn.get(key))
+        with self.reader(db) as txn:
+            return( txn.get(key, db=db))
 
 
     def delVal(self, db, key):
@@ -469,8 +574,8 @@ class LMDBer(filing.Filer):
         Parameters:
             db is opened named sub db with dupsort=True
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             count = 0
             for _, _ in cursor:
                 count += 1
@@ -495,8 +600,8 @@ class LMDBer(filing.Filer):
             split (bool): True means split key at sep before returning
             sep (bytes): separator char for key
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             if not cursor.set_range(key):  #  moves to val at key >= key, first if empty
                 return  # no values end of db
 
@@ -530,8 +635,8 @@ class LMDBer(filing.Filer):
                         from multiple branches of the key space. If top key is
                         empty then gets all items in database
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             if cursor.set_range(key):  # move to val at key >= key if any
                 for ckey, cval in cursor.iternext():  # get key, val at cursor
                     ckey = bytes(ckey)
@@ -646,8 +751,8 @@ class LMDBer(filing.Filer):
             pre is bytes of itdentifier prefix
             on is int ordinal number to resume replay
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             key = onKey(pre, on)  # start replay at this enty 0 is earliest
             if not cursor.set_range(key):  #  moves to val at key >= key
                 return  # no values end of db
@@ -674,8 +779,8 @@ class LMDBer(filing.Filer):
             key is key location in db to resume replay,
                    If empty then start at first key in database
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             if not cursor.set_range(key):  #  moves to val at key >= key, first if empty
                 return  # no values end of db
 
@@ -864,10 +969,10 @@ class LMDBer(filing.Filer):
             ion (int): starting ordinal value, default 0
 
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
+        with self.reader(db) as txn:
             vals = []
             iokey = suffix(key, ion, sep=sep)  # start ion th value for key zeroth default
-            cursor = txn.cursor()
+            cursor = txn.cursor(db=db)
             if cursor.set_range(iokey):  # move to val at key >= iokey if any
                 for iokey, val in cursor.iternext():  # get iokey, val at cursor
                     ckey, cion = unsuffix(iokey, sep=sep)
@@ -892,9 +997,9 @@ class LMDBer(filing.Filer):
             key (bytes): Apparent effective key
             ion (int): starting ordinal value, default 0
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
+        with self.reader(db) as txn:
             iokey = suffix(key, ion, sep=sep)  # start ion th value for key zeroth default
-            cursor = txn.cursor()
+            cursor = txn.cursor(db=db)
             if cursor.set_range(iokey):  # move to val at key >= iokey if any
                 for iokey, val in cursor.iternext():  # get key, val at cursor
                     ckey, cion = unsuffix(iokey, sep=sep)
@@ -920,8 +1025,8 @@ class LMDBer(filing.Filer):
         val = None
         ion = None  # no last value
         iokey = suffix(key, ion=MaxSuffix, sep=sep)  # make iokey at max and walk back
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()  # create cursor to walk back
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)  # create cursor to walk back
             if not cursor.set_range(iokey):  # max is past end of database
                 # Three possibilities for max past end of database
                 # 1. last entry in db is for same key
@@ -1055,10 +1160,10 @@ class LMDBer(filing.Filer):
             ion (int): starting ordinal value, default 0
 
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
+        with self.reader(db) as txn:
             items = []
             iokey = suffix(key, ion, sep=sep)  # start ion th value for key zeroth default
-            cursor = txn.cursor()
+            cursor = txn.cursor(db=db)
             if cursor.set_range(iokey):  # move to val at key >= iokey if any
                 for iokey, val in cursor.iternext():  # get iokey, val at cursor
                     ckey, cion = unsuffix(iokey, sep=sep)
@@ -1083,9 +1188,9 @@ class LMDBer(filing.Filer):
             key (bytes): Apparent effective key
             ion (int): starting ordinal value, default 0
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
+        with self.reader(db) as txn:
             iokey = suffix(key, ion, sep=sep)  # start ion th value for key zeroth default
-            cursor = txn.cursor()
+            cursor = txn.cursor(db=db)
             if cursor.set_range(iokey):  # move to val at key >= iokey if any
                 for iokey, val in cursor.iternext():  # get key, val at cursor
                     ckey, cion = unsuffix(iokey, sep=sep)
@@ -1174,8 +1279,8 @@ class LMDBer(filing.Filer):
             key is bytes of key within sub db's keyspace
         """
 
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             vals = []
             if cursor.set_key(key):  # moves to first_dup
                 vals = [val for val in cursor.iternext_dup()]
@@ -1193,8 +1298,8 @@ class LMDBer(filing.Filer):
             key is bytes of key within sub db's keyspace
         """
 
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             val = None
             if cursor.set_key(key):  # move to first_dup
                 if cursor.last_dup(): # move to last_dup
@@ -1202,7 +1307,7 @@ class LMDBer(filing.Filer):
             return val
 
 
-    def getValsIter(self, db, key):
+    def getValsIter(self, db, key, val=b''):
         """
         Return iterator of all dup values at key in db
         Raises StopIteration error when done or if empty
@@ -1212,15 +1317,30 @@ class LMDBer(filing.Filer):
         Parameters:
             db is opened named sub db with dupsort=True
             key is bytes of key within sub db's keyspace
+            val is bytes of dup value to resume at, the first dup >= val.
+                If empty then start at first dup
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
-            vals = []
-            if cursor.set_key(key):  # moves to first_dup
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
+            found = cursor.set_range_dup(key, val) if val else cursor.set_key(key)
+            if found:  # moves to first_dup >= val
                 for val in cursor.iternext_dup():
                     yield val
 
 
+    def hasVal(self, db, key, val):
+        """
+        Return True if val is one of the dup values at key in db, False otherwise
+
+        Parameters:
+            db is opened named sub db with dupsort=True
+            key is bytes of key within sub db's keyspace
+            val is bytes of dup value
+        """
+        with self.reader(db) as txn:
+            return txn.cursor(db=db).set_key_dup(key, val)
+
+
     def cntVals(self, db, key):
         """
         Return count of dup values at key in db, or zero otherwise
@@ -1229,8 +1349,8 @@ class LMDBer(filing.Filer):
             db is opened named sub db with dupsort=True
             key is bytes of key within sub db's keyspace
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             count = 0
             if cursor.set_key(key):  # moves to first_dup
                 count = cursor.count()
@@ -1248,8 +1368,8 @@ class LMDBer(filing.Filer):
             db is opened named sub db
             pre is bytes of key within sub db's keyspace pre.on
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             key = onKey(pre, on)  # start replay at this enty 0 is earliest
             count = 0
             if not cursor.set_range(key):  #  moves to val at key >= key
@@ -1350,8 +1470,8 @@ class LMDBer(filing.Filer):
             key is bytes of key within sub db's keyspace
         """
 
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             vals = []
             if cursor.set_key(key):  # moves to first_dup
                 # slice off prepended ordering proem
@@ -1371,8 +1491,8 @@ class LMDBer(filing.Filer):
             key is bytes of key within sub db's keyspace
         """
 
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             vals = []
             if cursor.set_key(key):  # moves to first_dup
                 for val in cursor.iternext_dup():
@@ -1391,8 +1511,8 @@ class LMDBer(filing.Filer):
             key is bytes of key within sub db's keyspace
         """
 
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             val = None
             if cursor.set_key(key):  # move to first_dup
                 if cursor.last_dup(): # move to last_dup
@@ -1421,8 +1541,8 @@ class LMDBer(filing.Filer):
                     Othewise don't skip for first pass
         """
 
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             items = []
             if cursor.set_range(key):  # moves to first_dup at key
                 found = True
@@ -1455,8 +1575,8 @@ class LMDBer(filing.Filer):
                     Othewise don't skip for first pass
         """
 
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             if cursor.set_range(key):  # moves to first_dup at key
                 found = True
                 if skip and key and cursor.key() == key:  # skip to next key
@@ -1476,8 +1596,8 @@ class LMDBer(filing.Filer):
             key is bytes of key within sub db's keyspace
         """
 
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             count = 0
             if cursor.set_key(key):  # moves to first_dup
                 count = cursor.count()
@@ -1554,8 +1674,8 @@ class LMDBer(filing.Filer):
             pre is bytes of itdentifier prefix prepended to sn in key
                 within sub db's keyspace
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             key = snKey(pre, cnt:=0)
             while cursor.set_key(key):  # moves to first_dup
                 for val in cursor.iternext_dup():
@@ -1581,8 +1701,8 @@ class LMDBer(filing.Filer):
             pre is bytes of itdentifier prefix prepended to sn in key
                 within sub db's keyspace
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             key = snKey(pre, cnt := fn)
             while cursor.set_key(key):  # moves to first_dup
                 for val in cursor.iternext_dup():
@@ -1610,8 +1730,8 @@ class LMDBer(filing.Filer):
             pre is bytes of itdentifier prefix prepended to sn in key
                 within sub db's keyspace
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             key = snKey(pre, cnt:=0)
             while cursor.set_key(key):  # moves to first_dup
                 if cursor.last_dup(): # move to last_dup
@@ -1642,8 +1762,8 @@ class LMDBer(filing.Filer):
             pre is bytes of itdentifier prefix prepended to sn in key
                 within sub db's keyspace
         """
-        with self.env.begin(db=db, write=False, buffers=True) as txn:
-            cursor = txn.cursor()
+        with self.reader(db) as txn:
+            cursor = txn.cursor(db=db)
             key = snKey(pre, cnt:=0)
             while cursor.set_range(key):  #  moves to first dup of key >= key
                 key = cursor.key()  # actual key
@@ -1358,7 +1358,7 @@ class DupSuber(SuberBase):
         return self._des(val) if val is not None else val
 
 
-    def getIter(self, keys: Union[str, Iterable]):
+    def getIter(self, keys: Union[str, Iterable], start: Union[str, bytes]=b""):
         """
         Gets dup vals iterator at key made from keys
 
@@ -1366,14 +1366,29 @@ class DupSuber(SuberBase):
 
         Parameters:
             keys (tuple): of key strs to be combined in order to form key
+            start (str): dup val to resume at, the first dup >= start.
+                If empty then start at first dup
 
         Returns:
             iterator:  vals each of str. Raises StopIteration when done
 
         """
-        for val in self.db.getValsIter(db=self.sdb, key=self._tokey(keys)):
+        for val in self.db.getValsIter(db=self.sdb, key=self._tokey(keys),
+                                       val=self._ser(start)):
             yield self._des(val)
 
+    def has(self, keys: Union[str, Iterable], val: Union[str, bytes]):
+        """
+        Returns True if val is a dup val at key made from keys, False otherwise
+
+        Parameters:
+            keys (tuple): of key strs to be combined in order to form key
+            val (str): dup val to look for
+
+        """
+        return self.db.hasVal(db=self.sdb, key=self._tokey(keys),
+                              val=self._ser(val))
+
 
     def cnt(self, keys: Union[str, Iterable]):
         """
@@ -1521,7 +1536,7 @@ class CesrDupSuber(DupSuber):
 
 
 
-    def getIter(self, keys: Union[str, Iterable]):
+    def getIter(self, keys: Union[str, Iterable], start: Union[str, bytes]=b""):
         """
         Gets dup vals iterator at key made from keys
 
@@ -1529,12 +1544,15 @@ class CesrDupSuber(DupSuber):
 
         Parameters:
             keys (tuple): of key strs to be combined in order to form key
+            start (str): qb64 of dup val to resume at, the first dup >= start.
+                If empty then start at first dup
 
         Returns:
             iterator:  vals each of self.klas. Raises StopIteration when done
 
         """
-        for val in self.db.getValsIter(db=self.sdb, key=self._tokey(keys)):
+        for val in self.db.getValsIter(db=self.sdb, key=self._tokey(keys),
+                                       val=self._ser(start)):
             yield self.klas(qb64b=bytes(val))
 
 
@@ -452,16 +452,56 @@ class OOBIEnd:
         if eid:
             eids.append(eid)
 
+        etag = self.etag(hab=hab, aid=aid, role=role, eids=eids)
+        if etag in (req.if_none_match or []):  # requester already has this key and endpoint state
+            rep.status = falcon.HTTP_NOT_MODIFIED
+            rep.set_header(OOBI_AID_HEADER, aid)
+            rep.etag = etag
+            return
+
         msgs = hab.replyToOobi(aid=aid, role=role, eids=eids)
         if msgs:
             rep.status = falcon.HTTP_200  # This is the default status
             rep.set_header(OOBI_AID_HEADER, aid)
+            rep.etag = etag
             rep.content_type = "application/json+cesr"
             rep.data = bytes(msgs)
         else:
             rep.status = falcon.HTTP_NOT_FOUND
 
 
+    def etag(self, hab, aid, role=None, eids=None):
+        """ Returns entity tag of the state an OOBI response for aid is generated from
+
+        The response itself is not stable because replies are restamped on every request so
+        the tag is the digest of the key state of aid and hab and of the endpoint role and
+        location records included in the response.
+
+        Parameters:
+            hab (Hab): environment responding to the OOBI
+            aid (str): qb64 identifier prefix of OOBI
+            role (str): requested role for OOBI rpy message
+            eids (list): qb64 identifier prefixes of participants in role
+
+        """
+        eids = eids if eids is not None else []
+        ser = bytearray("".join([aid, role or "", hab.pre] + eids).encode("utf-8"))
+        for pre in (aid, hab.pre):
+            if pre in self.hby.kevers:
+                ser.extend(self.hby.kevers[pre].serder.saidb)
+
+        ends = oset(self.hby.kevers[aid].wits if aid in self.hby.kevers else [])
+        for (_, erole, eid), end in self.hby.db.ends.getItemIter(keys=(aid, "")):
+            ser.extend(f"{erole}{eid}{end.enabled}{end.allowed}".encode("utf-8"))
+            ends.add(eid)
+
+        for eid in ends:
+            for (_, scheme), loc in self.hby.db.locs.getItemIter(keys=(eid, "")):
+                ser.extend(f"{eid}{scheme}{loc.url}".encode("utf-8"))
+
+        return coring.Diger(ser=bytes(ser)).qb64
+
+
 WEB_DIR_PATH = os.path.dirname(
     os.path.abspath(
         sys.modules.get(__name__).__file__))
@@ -549,14 +589,31 @@ def setup(name="who", temp=False, tymth=None, sith=None, count=1,
 class Oobiery(doing.DoDoer):
     """ Resolver for OOBIs
 
+    OOBIs are requested concurrently, bounded by .limit outstanding requests in total and
+    by .hostLimit outstanding requests to any one host.  Resolved OOBIs are cached in .roobi
+    with the entity tag of the response and the resulting key state so re-resolving an OOBI
+    whose key state has not changed is a conditional request that the OOBI endpoint
+    answers with 304 Not Modified.  Failed OOBIs are retried with exponential backoff up to
+    .RetryTries times.  OOBIs that can not succeed on retry, such as invalid URLs, unknown
+    OOBIs and responses of the wrong content type, are not retried.  OOBIs that are not
+    retried are moved to .foobi.
+
     """
 
-    def __init__(self, hby, cues=None):
+    RetryDelay = 1.0  # initial delay in seconds before retrying a failed OOBI
+    RetryMax = 300.0  # maximum delay in seconds between retries of a failed OOBI
+    RetryTries = 10  # failures of an OOBI after which it is no longer retried
+    Timeout = 30.0  # seconds to wait for a response before treating the request as failed
+
+    def __init__(self, hby, cues=None, limit=16, hostLimit=4, timeout=None):
         """  DoDoer to handle the request and parsing of OOBIs
 
         Parameters:
             hby (Habery): database environment
             cues (decking.Deck): outbound cues from processing oobis
+            limit (int): maximum number of outstanding OOBI requests
+            hostLimit (int): maximum number of outstanding OOBI requests per host
+            timeout (float): seconds to wait for a response to an OOBI request
         """
 
         self.hby = hby
@@ -568,7 +625,11 @@ class Oobiery(doing.DoDoer):
         self.parser = parsing.Parser(framed=True, kvy=kvy, rvy=rvy)
 
         self.cues = cues if cues is not None else decking.Deck()
-        self.clients = dict()
+        self.limit = limit
+        self.hostLimit = hostLimit
+        self.timeout = timeout if timeout is not None else self.Timeout
+        self.clients = dict()  # url to (client, clientDoer, host, tyme requested) of outstanding requests
+        self.retries = dict()  # url to (number of tries, tyme of next retry) of failed OOBIs
 
         super(Oobiery, self).__init__(doers=[doing.doify(self.scoobiDo), doing.doify(self.clientsDo),
                                              doing.doify(self.retryDo)])
@@ -594,6 +655,8 @@ class Oobiery(doing.DoDoer):
             for (url, ), obr in self.hby.db.oobis.getItemIter():
                 try:
                     purl = parse.urlparse(url)
+                    if not self.available(purl):  # leave in table until there is capacity
+                        continue
 
                     if purl.path == "/oobi":  # Self and Blinded Introductions
                         params = parse.parse_qs(purl.query)
@@ -629,8 +692,11 @@ class Oobiery(doing.DoDoer):
 
                         self.request(url, purl, obr)
 
+                    else:
+                        self.failed(url, obr, f"unknown OOBI URL {url}", final=True)
+
                 except ValueError as ex:
-                    print("error requesting invalid OOBI URL {}", url)
+                    self.failed(url, obr, f"error requesting invalid OOBI URL {url}", final=True)
                 yield self.tock
 
             yield self.tock
@@ -652,24 +718,45 @@ class Oobiery(doing.DoDoer):
             for (url, ), obr in self.hby.db.coobi.getItemIter():
                 if url not in self.clients:
                     purl = parse.urlparse(url)
-                    self.request(url, purl, obr)
+                    if self.available(purl):
+                        self.request(url, purl, obr)
                     continue
 
-                (client, clientDoer) = self.clients[url]
+                (client, clientDoer, _, start) = self.clients[url]
+
+                if not client.responses:
+                    if self.tyme - start > self.timeout:  # unreachable or unresponsive host
+                        self.remove([clientDoer])
+                        del self.clients[url]
+                        self.failed(url, obr, f"{url} timed out")
 
-                if client.responses:
+                else:
                     response = client.responses.popleft()
                     self.remove([clientDoer])
+                    del self.clients[url]
+
+                    if response.get("errored"):
+                        self.failed(url, obr, f"{url} failed: {response.get('error')}")
+
+                    elif response["status"] == 404:
+                        self.failed(url, obr, f"{url} not found", final=True)
+
+                    elif response["status"] == 304:  # cached resolution is still current
+                        cobr = self.hby.db.roobi.get(keys=(url,))
+                        if cobr is None:  # cache dropped since request so request again without etag
+                            self.hby.db.coobi.rem(keys=(url,))
+                            obr.etag = None
+                            self.hby.db.oobis.pin(keys=(url,), val=obr)
+                            continue
+
+                        if obr.oobialias is not None and cobr.cid:
+                            self.org.replace(pre=cobr.cid, data=dict(alias=obr.oobialias))
 
-                    if response["status"] == 404:
-                        print(f"{url} not found")
                         self.hby.db.coobi.rem(keys=(url,))
-                        self.hby.db.eoobi.pin(keys=(url,), val=obr)
+                        self.resolved(url, cobr)
 
                     elif not response["status"] == 200:
-                        self.hby.db.coobi.rem(keys=(url,))
-                        print("invalid status for oobi response: {}".format(response["status"]))
-                        self.cues.append(dict(kin="failed", oobi=url))
+                        self.failed(url, obr, "invalid status for oobi response: {}".format(response["status"]))
 
                     elif response["headers"]["Content-Type"] == "application/json+cesr":
                         self.parser.parse(ims=bytearray(response["body"]))
@@ -679,34 +766,37 @@ class Oobiery(doing.DoDoer):
                         if obr.oobialias is not None and obr.cid:
                             self.org.replace(pre=obr.cid, data=dict(alias=obr.oobialias))
 
+                        obr.etag = self.etag(response)
+                        obr.state = self.hby.kevers[obr.cid].serder.said if obr.cid in self.hby.kevers else None
                         self.hby.db.coobi.rem(keys=(url,))
-                        self.cues.append(dict(kin="resolved", oobi=url))
+                        self.resolved(url, obr)
 
                     elif response["headers"]["Content-Type"] == "application/schema+json":
                         try:
                             schemer = scheming.Schemer(raw=bytearray(response["body"]))
-                            if schemer.said == obr.said:
-                                self.hby.db.schema.pin(keys=(schemer.said,), val=schemer)
-                                self.cues.append(dict(kin="resolved", oobi=url))
-                            else:
-                                self.cues.append(dict(kin="failed", oobi=url))
-
                         except Exception:
-                            self.cues.append(dict(kin="failed", oobi=url))
-
-                        self.hby.db.coobi.rem(keys=(url,))
+                            self.failed(url, obr, f"invalid schema for oobi response from {url}", final=True)
+                            continue
+
+                        if schemer.said == obr.said:
+                            self.hby.db.schema.pin(keys=(schemer.said,), val=schemer)
+                            self.hby.db.changed("schema", schemer.said)
+                            obr.etag = self.etag(response)
+                            self.hby.db.coobi.rem(keys=(url,))
+                            self.resolved(url, obr)
+                        else:
+                            self.failed(url, obr, f"schema from {url} does not match {obr.said}", final=True)
 
                     else:
-                        self.cues.append(dict(kin="failed", oobi=url))
-                        print("invalid content type for oobi response: {}"
-                              .format(response["headers"]["Content-Type"]))
+                        self.failed(url, obr, "invalid content type for oobi response: {}"
+                                    .format(response["headers"].get("Content-Type")), final=True)
 
                 yield self.tock
 
             yield self.tock
 
     def retryDo(self, tymth, tock=0.0):
-        """ Process Client responses by parsing the messages and removing the client/doer
+        """ Move failed OOBIs back to be resolved once their backoff delay has passed
 
         Parameters:
             tymth (function): injected function wrapper closure returned by .tymen() of
@@ -718,14 +808,80 @@ class Oobiery(doing.DoDoer):
         self.tock = tock
         yield self.tock
 
-        retryDelay = 10.0
         while True:
             for (url, ), obr in self.hby.db.eoobi.getItemIter():
+                _, due = self.retries.get(url, (0, self.tyme))
+                if self.tyme < due:
+                    continue
+
                 self.hby.db.eoobi.rem(keys=(url,))
                 self.hby.db.oobis.pin(keys=(url,), val=obr)
-                yield retryDelay
 
-            yield retryDelay
+            yield self.tock
+
+    def backoff(self, url):
+        """ Schedule next retry of failed OOBI url with exponentially increasing delay """
+        tries, _ = self.retries.get(url, (0, self.tyme))
+        delay = min(self.RetryDelay * 2 ** tries, self.RetryMax)
+        self.retries[url] = (tries + 1, self.tyme + delay)
+
+    def failed(self, url, obr, msg, final=False):
+        """ Move OOBI url that failed to resolve to be retried after backoff, or to .foobi once
+        final or retried .RetryTries times, and cue the failure
+
+        Parameters:
+            url (str): OOBI URL
+            obr (OobiRecord): record of the OOBI being resolved
+            msg (str): reason for failure
+            final (bool): True means retrying can not succeed
+
+        """
+        print(msg)
+        self.hby.db.oobis.rem(keys=(url,))
+        self.hby.db.coobi.rem(keys=(url,))
+        tries, _ = self.retries.get(url, (0, self.tyme))
+        if final or tries + 1 >= self.RetryTries:
+            self.retries.pop(url, None)
+            self.hby.db.foobi.pin(keys=(url,), val=obr)
+        else:
+            self.hby.db.eoobi.pin(keys=(url,), val=obr)
+            self.backoff(url)
+        self.cues.append(dict(kin="failed", oobi=url))
+
+    def resolved(self, url, obr):
+        """ Cache resolved OOBI record obr for url and cue successful resolution """
+        self.retries.pop(url, None)
+        self.hby.db.roobi.pin(keys=(url,), val=obr)
+        self.cues.append(dict(kin="resolved", oobi=url))
+
+    @staticmethod
+    def etag(response):
+        """ Returns unquoted entity tag of client response or None if the response has none """
+        etag = response["headers"].get("ETag")
+        return etag.strip('"') if etag else None
+
+    def cached(self, url):
+        """ Returns True if resolution of url is cached and still matches local key state
+
+        Parameters:
+            url (str): OOBI URL
+
+        """
+        cobr = self.hby.db.roobi.get(keys=(url,))
+        if cobr is None or cobr.etag is None:
+            return False
+
+        if cobr.said is not None:  # data OOBI
+            return self.hby.db.schema.get(keys=(cobr.said,)) is not None
+
+        return cobr.cid in self.hby.kevers and self.hby.kevers[cobr.cid].serder.said == cobr.state
+
+    def available(self, purl):
+        """ Returns True if a new request to the host of parsed url purl is within limits """
+        if len(self.clients) >= self.limit:
+            return False
+
+        return len([host for (_, _, host, _) in self.clients.values() if host == purl.netloc]) < self.hostLimit
 
     def request(self, url, purl, obr):
 
@@ -733,12 +889,17 @@ class Oobiery(doing.DoDoer):
         clientDoer = http.clienting.ClientDoer(client=client)
         self.extend([clientDoer])
 
+        headers = dict()
+        if self.cached(url):
+            headers["If-None-Match"] = f'"{self.hby.db.roobi.get(keys=(url,)).etag}"'
+
         client.request(
             method="GET",
             path=purl.path,
             qargs=parse.parse_qs(purl.query),
+            headers=headers,
         )
 
-        self.clients[url] = (client, clientDoer)
+        self.clients[url] = (client, clientDoer, purl.netloc, self.tyme)
         self.hby.db.oobis.rem(keys=(url,))
         self.hby.db.coobi.pin(keys=(url,), val=obr)
@@ -4,7 +4,9 @@ keri.peer.exchanging module
 
 """
 import logging
-from datetime import timedelta
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 
 from hio.base import doing
 from hio.help import decking
@@ -22,8 +24,19 @@ logger = help.ogler.getLogger()
 class Exchanger(doing.DoDoer):
     """
      Peer to Peer KERI message Exchanger.
+
+     Messages are queued per route as they are parsed and are signature verified and
+     delivered to the handler of their route by .processQueues. Each route's queue holds
+     at most the handler's .queueSize messages and no more than the handler's .concurrency
+     messages are left undrained in its .msgs at once so one slow handler only backs up
+     its own route.
     """
 
+    QueueSize = 1024  # default most messages queued for a route before new ones are dropped
+    Concurrency = 8  # default most messages delivered to a handler and not yet drained
+    TimeoutPSE = 3600  # seconds to timeout partially signed exchange message escrow
+    SweepInterval = 60.0  # seconds between full passes over partially signed escrow
+
     def __init__(self, hby, handlers, controller=None, cues=None, delta=ExchangeMessageTimeWindow, **kwa):
         """ Initialize instance
 
@@ -40,29 +53,48 @@ class Exchanger(doing.DoDoer):
         self.kevers = self.hby.kevers
         self.delta = delta
         self.routes = dict()
+        self.queues = dict()  # route to Deck of messages waiting for verification and delivery
+        self.stats = dict()  # route to RouteStats
+        self.seen = Seener(db=self.hby.db, delta=self.delta)
+        self.woken = set()  # sender prefixes with key state written since last escrow processing
+        self.rewake = set()  # SAIDs of escrowed messages that received more signatures
+        self.swept = None  # monotonic time of last full pass over partially signed escrow
+        self.unescrowed = 0
+        self.expired = 0
+        self.hby.db.watch("kel", self)
         self.cues = cues if cues is not None else decking.Deck()  # subclass of deque
 
-        doers = []
+        doers = [doing.doify(self.queueDo)]
         for handler in handlers:
-            if handler.resource in self.routes:
-                raise ValidationError("unable to register behavior {}, it has already been registered"
-                                      "".format(handler.resource))
-
-            self.routes[handler.resource] = handler
+            self.register(handler)
             doers.append(handler)
 
         super(Exchanger, self).__init__(doers=doers, **kwa)
 
-    def addHandler(self, handler):
+    def register(self, handler):
+        """ Register handler for its route with an empty queue """
         if handler.resource in self.routes:
             raise ValidationError("unable to register behavior {}, it has already been registered"
                                   "".format(handler.resource))
 
         self.routes[handler.resource] = handler
+        self.queues[handler.resource] = decking.Deck()
+        self.stats[handler.resource] = RouteStats()
+
+    def addHandler(self, handler):
+        self.register(handler)
         self.doers.append(handler)
 
+    def metrics(self):
+        """ Returns dict of route to dict of queue depth, delivered but undrained messages and RouteStats
+        """
+        return {route: dict(depth=len(self.queues[route]), inflight=len(behavior.msgs),
+                            **self.stats[route].asdict())
+                for route, behavior in self.routes.items()}
+
     def processEvent(self, serder, source=None, sigers=None, cigars=None, **kwargs):
-        """ Process one serder event with attached indexed signatures representing a Peer to Peer exchange message.
+        """ Queue one serder event with attached indexed signatures representing a Peer to Peer
+        exchange message for verification and delivery to the handler of its route
 
         Parameters:
             serder (Serder): instance of event to process
@@ -72,9 +104,6 @@ class Exchanger(doing.DoDoer):
 
         """
         route = serder.ked["r"]
-        payload = serder.ked["a"]
-        # dts = serder.ked["dt"]
-        modifiers = serder.ked["q"] if 'q' in serder.ked else dict()
         pathed = kwargs["pathed"] if "pathed" in kwargs else []
 
         if route not in self.routes:
@@ -85,7 +114,124 @@ class Exchanger(doing.DoDoer):
 
         if self.controller is not None and self.controller != source.qb64:
             raise AuthZError("Message {} is from invalid source {}"
-                             "".format(payload, source.qb64))
+                             "".format(serder.ked["a"], source.qb64))
+
+        queue = self.queues[route]
+        stats = self.stats[route]
+        keys = self.sender(serder, source, cigars)
+        if keys in self.seen:  # replayed or duplicate, reject before any signature work
+            if sigers and self.hby.db.epse.get(keys=(serder.said,)) is not None:  # more sigs for escrowed
+                for siger in sigers:
+                    self.hby.db.esigs.add(keys=(serder.said,), val=siger)
+                self.rewake.add(serder.said)
+                return
+
+            stats.duplicates += 1
+            raise ValidationError("duplicate exchange message = {} for route {} within replay window"
+                                  "".format(serder.said, route))
+
+        if len(queue) >= getattr(behavior, "queueSize", self.QueueSize):
+            stats.dropped += 1
+            raise ValidationError("queue full for route {}, dropped exchange message = {}"
+                                  "".format(route, serder.said))
+
+        self.seen.add(keys)
+        stats.received += 1
+        queue.append(dict(serder=serder, source=source, sigers=sigers, cigars=cigars, pathed=pathed,
+                          stamp=time.monotonic()))
+
+    @staticmethod
+    def sender(serder, source=None, cigars=None, **kwa):
+        """ Returns (SAID, sender) keys of exchange message in the replay index
+
+        Identical exchange messages from different senders share a SAID so the sender
+        prefix, or the verfer of the first non-trans signature, is part of the key.
+
+        """
+        if source is not None:
+            return serder.said, source.qb64
+        return serder.said, cigars[0].verfer.qb64 if cigars else ""
+
+    def processQueues(self):
+        """ Verify and deliver queued messages of each route to its handler
+
+        Stops delivering to a handler once .concurrency of its messages are waiting in its .msgs.
+
+        """
+        for route, queue in self.queues.items():
+            behavior = self.routes[route]
+            stats = self.stats[route]
+            concurrency = getattr(behavior, "concurrency", self.Concurrency)
+            while queue and len(behavior.msgs) < concurrency:
+                msg = queue.popleft()
+                stamp = msg.pop("stamp")
+                try:
+                    self.processExchange(**msg)
+                except Exception as ex:  # log and drop, partially signed are escrowed
+                    stats.failed += 1
+                    if not self.escrowed(ex, msg["serder"]):  # dropped so a retry may be processed
+                        self.seen.discard(self.sender(**msg))
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.exception("Exchanger message processing error: %s\n", ex.args[0])
+                    else:
+                        logger.error("Exchanger message processing error: %s\n", ex.args[0])
+                else:
+                    stats.record(time.monotonic() - stamp)
+
+    def escrowed(self, ex, serder):
+        """ Returns True when processing serder failed with ex because it is held in the
+        partially signed escrow, so its replay key stays seen while more signatures arrive.
+        A message whose non-trans signatures do not verify is not escrowed.
+
+        Parameters:
+            ex (Exception): error raised processing serder
+            serder (Serder): exchange message
+
+        """
+        return (isinstance(ex, MissingSignatureError) and
+                self.hby.db.epse.get(keys=(serder.said,)) is not None)
+
+    def queueDo(self, tymth, tock=0.0):
+        """ Doer generator method that processes the route queues every run
+
+        Parameters:
+            tymth (function): injected function wrapper closure returned by .tymen() of
+                Tymist instance. Calling tymth() returns associated Tymist .tyme.
+            tock (float): injected initial tock value
+
+        Returns:  doifiable Doist compatible generator method
+
+        """
+        self.wind(tymth)
+        self.tock = tock
+        yield self.tock
+
+        while True:
+            self.processQueues()
+            yield self.tock
+
+    def processExchange(self, serder, source=None, sigers=None, cigars=None, pathed=None):
+        """ Verify signatures of one exchange message and deliver it to the handler of its route
+
+        Parameters:
+            serder (Serder): instance of event to process
+            source (Prefixer): identifier prefix of event sender
+            sigers (list): of Siger instances of attached controller indexed sigs
+            cigars (list): of Cigar instances of attached non-trans sigs
+            pathed (list): of bytes of attached paths
+
+        """
+        route = serder.ked["r"]
+        payload = serder.ked["a"]
+        # dts = serder.ked["dt"]
+        modifiers = serder.ked["q"] if 'q' in serder.ked else dict()
+        pathed = pathed if pathed is not None else []
+
+        if route not in self.routes:
+            raise AttributeError("unregistered route {} for exchange message = {}"
+                                 "".format(route, serder.pretty()))
+
+        behavior = self.routes[route]
 
         # delta = behavior.delta if behavior.delta is not None else self.delta
         # delta = self.delta
@@ -98,7 +244,7 @@ class Exchanger(doing.DoDoer):
 
         if source is not None and sigers is not None:
             if source.qb64 not in self.hby.kevers:
-                if self.escrowPSEvent(serder=serder, source=source, sigers=sigers, pathed=pathed):
+                if self.escrowPSEvent(serder=serder, source=source, sigers=sigers, pathed=pathed, sn=0):
                     self.cues.append(dict(kin="query", q=dict(r="ksn", pre=source.qb64)))
                 raise MissingSignatureError(f"Unable to find sender {source.qb64} in kevers"
                                             f" for evt = {serder.ked}.")
@@ -110,7 +256,8 @@ class Exchanger(doing.DoDoer):
             ssigers, indices = eventing.verifySigs(raw=serder.raw, sigers=sigers, verfers=verfers)
             if not tholder.satisfy(indices):  # at least one but not enough
                 psigers = self.hby.db.esigs.get(keys=(serder.said,))
-                if self.escrowPSEvent(serder=serder, source=source, sigers=sigers, pathed=pathed):
+                if self.escrowPSEvent(serder=serder, source=source, sigers=sigers, pathed=pathed,
+                                      sn=kever.sn + 1):
                     self.cues.append(dict(kin="query", q=dict(r="ksn", pre=source.qb64)))
                 raise MissingSignatureError("Failure satisfying sith = {} on sigs for {}"
                                             " for evt = {}.".format(tholder.sith,
@@ -160,14 +307,28 @@ class Exchanger(doing.DoDoer):
         """
         self.processEscrowPartialSigned()
 
-    def escrowPSEvent(self, serder, source, sigers, pathed):
+    def changed(self, topic, key):
+        """ Wake exchange messages escrowed waiting on key state of key, called by database on write
+
+        Parameters:
+            topic (str): kind of data written, "kel"
+            key (str): qb64 prefix of key state written
+
+        """
+        self.woken.add(key)
+
+    def escrowPSEvent(self, serder, source, sigers, pathed, sn=0):
         """ Escrow event that does not have enough signatures.
 
+        Indexed by the sender prefix and sequence number of the key state it waits for and by
+        the time it was first escrowed.
+
         Parameters:
             serder (Serder): instance of event
             source (Prefixer): of the origin of the exn
             sigers (list): of Siger instances of indexed controller sigs
             pathed (list): list of bytes of attached paths
+            sn (int): sequence number of sender key state that may satisfy the signatures
 
         """
         dig = serder.said
@@ -175,17 +336,78 @@ class Exchanger(doing.DoDoer):
             self.hby.db.esigs.add(keys=(dig,), val=siger)
         self.hby.db.epath.pin(keys=(dig,), vals=[bytes(p) for p in pathed])
         self.hby.db.esrc.put(keys=(dig,), val=source)
-        return self.hby.db.epse.put(keys=(dig,), val=serder)
+        self.hby.db.epwt.add(keys=(source.qb64, f"{sn:032x}"), val=dig)
+        if self.hby.db.epse.put(keys=(dig,), val=serder):
+            dater = coring.Dater(dts=helping.toIso8601(helping.nowUTC()))
+            self.hby.db.epst.put(keys=(dater.qb64, dig), val=dig)
+            return True
+        return False
+
+    def removePSEvent(self, dig):
+        """ Remove exchange message dig from partially signed escrow
+
+        Entries of dig in the key state index are removed with it, time index entries are
+        removed lazily as they are next read.
+
+        """
+        if (source := self.hby.db.esrc.get(keys=(dig,))) is not None:
+            for keys in [keys for keys, val in self.hby.db.epwt.getItemIter(keys=(source.qb64, "")) if val == dig]:
+                self.hby.db.epwt.rem(keys=keys, val=dig)
+        self.hby.db.epse.rem(dig)
+        self.hby.db.esigs.rem(dig)
+        self.hby.db.esrc.rem(dig)
+        self.hby.db.epath.rem(dig)
+
+    def escrowMetrics(self):
+        """ Returns dict of counts of partially signed escrow
+
+        escrowed is number of messages in escrow, waiting is number of senders whose key state
+        they wait for, woken is senders with key state written since last processing,
+        unescrowed and expired are messages removed from escrow by this Exchanger
+        """
+        return dict(escrowed=self.hby.db.cnt(self.hby.db.epse.sdb),
+                    waiting=len({keys[0] for keys, _ in self.hby.db.epwt.getItemIter()}),
+                    woken=len(self.woken), unescrowed=self.unescrowed, expired=self.expired)
 
     def processEscrowPartialSigned(self):
-        """ Process escrow of partially signed messages """
-        for (dig,), serder in self.hby.db.epse.getItemIter():
+        """ Process escrow of partially signed messages
+
+        Expires messages escrowed longer than .TimeoutPSE from the time index. Retries only
+        messages woken by their sender's key state reaching the sequence number they wait for
+        or by more signatures arriving, except for a full pass over the escrow on the first
+        call and every .SweepInterval seconds.
+
+        """
+        self.expirePSEvents()
+
+        now = time.monotonic()
+        if self.swept is None or now - self.swept >= self.SweepInterval:
+            self.swept = now
+            self.woken.clear()
+            self.rewake.clear()
+            digs = [dig for (dig,), _ in self.hby.db.epse.getItemIter()]
+        else:
+            digs = list(self.rewake)
+            self.rewake.clear()
+            while self.woken:
+                pre = self.woken.pop()
+                kever = self.hby.kevers[pre] if pre in self.hby.kevers else None
+                for keys, dig in self.hby.db.epwt.getItemIter(keys=(pre, "")):
+                    if kever is not None and int(keys[1], 16) <= kever.sn:
+                        self.hby.db.epwt.rem(keys=keys, val=dig)
+                        digs.append(dig)
+
+        for dig in dict.fromkeys(digs):
+            serder = self.hby.db.epse.get(keys=(dig,))
+            if serder is None:  # already unescrowed
+                continue
+
             sigers = self.hby.db.esigs.get(keys=(dig,))
             source = self.hby.db.esrc.get(keys=(dig,))
             pathed = [bytearray(p.encode("utf-8")) for p in self.hby.db.epath.get(keys=(dig,))]
 
             try:
-                self.processEvent(serder=serder, source=source, sigers=sigers, pathed=pathed)
+                self.processExchange(serder=serder, source=source, sigers=sigers, pathed=pathed)
 
             except MissingSignatureError as ex:
                 if logger.isEnabledFor(logging.DEBUG):
@@ -193,20 +415,158 @@ class Exchanger(doing.DoDoer):
                 else:
                     logger.info("Exchange partially signed failed: %s\n", ex.args[0])
             except Exception as ex:
-                self.hby.db.epse.rem(dig)
-                self.hby.db.esigs.rem(dig)
-                self.hby.db.esrc.rem(dig)
+                self.removePSEvent(dig)
+                self.unescrowed += 1
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.info("Exchange partially signed unescrowed: %s\n", ex.args[0])
                 else:
                     logger.info("Exchange partially signed unescrowed: %s\n", ex.args[0])
             else:
-                self.hby.db.epse.rem(dig)
-                self.hby.db.esigs.rem(dig)
-                self.hby.db.esrc.rem(dig)
+                self.removePSEvent(dig)
+                self.unescrowed += 1
                 logger.info("Exchanger unescrow succeeded in valid exchange: "
                             "creder=\n%s\n", serder.pretty())
 
+    def expirePSEvents(self):
+        """ Remove messages escrowed longer than .TimeoutPSE, oldest first from the time index """
+        now = helping.nowUTC()
+        for keys, dig in self.hby.db.epst.getItemIter():
+            if now - coring.Dater(qb64=keys[0]).datetime < timedelta(seconds=self.TimeoutPSE):
+                break
+
+            self.hby.db.epst.rem(keys=keys)
+            if self.hby.db.epse.get(keys=(dig,)) is not None:
+                self.removePSEvent(dig)
+                self.expired += 1
+                logger.info("Exchanger partially signed escrow expired: %s\n", dig)
+
+
+class RouteStats:
+    """ Counts and delivery latency of exchange messages of one route
+
+    Attributes:
+        received (int): messages queued
+        duplicates (int): messages rejected as already seen within the replay window
+        dropped (int): messages dropped because the queue was full
+        failed (int): messages that failed verification or were escrowed
+        delivered (int): messages delivered to the handler
+        latency (float): seconds from queueing to delivery of last delivered message
+        total (float): seconds from queueing to delivery summed over delivered messages
+        peak (float): most seconds from queueing to delivery of any delivered message
+
+    """
+    __slots__ = ("received", "duplicates", "dropped", "failed", "delivered", "latency", "total", "peak")
+
+    def __init__(self):
+        self.received = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.failed = 0
+        self.delivered = 0
+        self.latency = 0.0
+        self.total = 0.0
+        self.peak = 0.0
+
+    def record(self, latency):
+        """ Record delivery of a message latency seconds after it was queued """
+        self.delivered += 1
+        self.latency = latency
+        self.total += latency
+        self.peak = max(self.peak, latency)
+
+    def asdict(self):
+        """ Returns dict of counts and latencies with mean latency """
+        return dict(received=self.received, duplicates=self.duplicates, dropped=self.dropped, failed=self.failed,
+                    delivered=self.delivered, latency=self.latency, peak=self.peak,
+                    mean=self.total / self.delivered if self.delivered else 0.0)
+
+
+class Seener:
+    """ Index of (SAID, sender) keys of exchange messages seen within the replay window
+
+    Keys are held in memory in time buckets, each one .Buckets-th of the window wide, and
+    forgotten when their bucket falls out of the window. Once more than .size keys are held
+    the oldest bucket is spilled to .db.esen with the time it leaves the window, where
+    entries are removed once expired.
+
+    """
+    Buckets = 10  # time buckets per replay window
+    MaxSeen = 4096  # keys held in memory before the oldest bucket is spilled to the database
+
+    def __init__(self, db, delta=ExchangeMessageTimeWindow, size=MaxSeen):
+        """ Initialize instance
+
+        Parameters:
+            db (Baser): database to spill keys to
+            delta (timedelta): replay window a key is remembered for after it is seen
+            size (int): most keys held in memory
+
+        """
+        self.db = db
+        self.delta = delta
+        self.size = size
+        self.width = max(delta.total_seconds() / self.Buckets, 1.0)  # seconds per bucket
+        self.saids = dict()  # (SAID, sender) to bucket it was seen in
+        self.buckets = OrderedDict()  # bucket to list of keys seen in it, oldest first
+        self.pruned = None  # bucket .db.esen was last pruned in
+
+    def __contains__(self, keys):
+        self.expire()
+        if keys in self.saids:
+            return True
+
+        dater = self.db.esen.get(keys=keys)
+        return dater is not None and dater.datetime > helping.nowUTC()
+
+    def __len__(self):
+        return len(self.saids)
+
+    def bucket(self, dt):
+        """ Returns bucket of datetime dt """
+        return int(dt.timestamp() // self.width)
+
+    def add(self, keys):
+        """ Record (SAID, sender) keys as seen now """
+        self.expire()
+        bucket = self.bucket(helping.nowUTC())
+        self.saids[keys] = bucket
+        self.buckets.setdefault(bucket, []).append(keys)
+        if len(self.saids) > self.size:
+            self.spill()
+
+    def discard(self, keys):
+        """ Forget (SAID, sender) keys so the message is processed if seen again """
+        self.saids.pop(keys, None)
+        self.db.esen.rem(keys=keys)
+
+    def spill(self):
+        """ Move oldest bucket from memory to .db.esen """
+        bucket, saids = self.buckets.popitem(last=False)
+        expiry = datetime.fromtimestamp((bucket + 1) * self.width, tz=timezone.utc) + self.delta
+        dater = coring.Dater(dts=helping.toIso8601(expiry))
+        for keys in saids:
+            if self.saids.get(keys) == bucket:
+                del self.saids[keys]
+                self.db.esen.pin(keys=keys, val=dater)
+
+    def expire(self):
+        """ Forget buckets that have fallen out of the window and prune expired .db.esen entries """
+        now = helping.nowUTC()
+        current = self.bucket(now)
+        while self.buckets:
+            bucket = next(iter(self.buckets))
+            if (bucket + 1) * self.width + self.delta.total_seconds() > now.timestamp():
+                break
+            for keys in self.buckets.pop(bucket):
+                if self.saids.get(keys) == bucket:
+                    del self.saids[keys]
+
+        if self.pruned != current:
+            self.pruned = current
+            expired = [keys for keys, dater in self.db.esen.getItemIter() if dater.datetime <= now]
+            for keys in expired:
+                self.db.esen.rem(keys=keys)
+
 
 def exchange(route, payload, date=None, modifiers=None, version=coring.Version, kind=coring.Serials.json):
     """ Create an `exn` message with the specified route and payload
@@ -8,8 +8,7 @@ import json
 from hio.base import doing
 from hio.help import decking
 
-from .. import help
-from ..app import signing
+from .. import help, kering
 from ..peer import exchanging
 
 logger = help.ogler.getLogger()
@@ -373,19 +372,23 @@ class PresentationProofHandler(doing.Doer):
     """
 
     resource = "/presentation/proof"
+    TimeoutHeld = 3600.0  # seconds a proof of a credential not yet verified is held for retry
 
-    def __init__(self, cues=None, proofs=None, **kwa):
+    def __init__(self, cues=None, proofs=None, verifier=None, **kwa):
         """ Initialize instance
 
         Parameters:
             cues (decking.Deck): outbound cue messages
             proofs (decking.Deck): inbound proof request `exn` messages
+            verifier (Verifier): verifier of presented credentials, None means proofs are not verified
             **kwa (dict): keyword arguments passes to super Doer
 
         """
         self.msgs = decking.Deck()
         self.cues = cues if cues is not None else decking.Deck()
         self.proofs = proofs if proofs is not None else decking.Deck()
+        self.verifier = verifier
+        self.held = dict()  # (sender prefix, credential SAID) of proofs not yet verified to tyme first held
 
         super(PresentationProofHandler, self).__init__(**kwa)
 
@@ -410,6 +413,7 @@ class PresentationProofHandler(doing.Doer):
         yield self.tock
 
         while True:
+            presentations = []
             while self.msgs:
                 msg = self.msgs.popleft()
                 payload = msg["payload"]
@@ -422,23 +426,91 @@ class PresentationProofHandler(doing.Doer):
                     raise ValueError("invalid presentation proof payload")
 
                 pe = payload["presentation_submission"]
-                vcs = payload["verifiableCredential"]
 
                 if "descriptor_map" not in pe:
                     raise ValueError("invalud presentation submission in proof payload")
 
                 # TODO:  Find verifiable credential in vcs based on `path`
-                dm = pe["descriptor_map"]
-                print(dm)
+                presentations.append((pre, payload))
 
-                vcs.reverse()
-                for vc in vcs:
-                    self.proofs.append((pre, vc))
+            if presentations or self.held:  # verify all presentations received since last run as one batch
+                proofs = list(self.held)
+                proofs.extend((pre, vc) for pre, payload in presentations
+                              for vc in reversed(payload["verifiableCredential"]))
+                verdicts = dict()
+                if self.verifier is not None:
+                    verdicts = verifyPresentations(self.verifier,
+                                                   presentations=[dict(verifiableCredential=[vc for _, vc in proofs])])
 
-                yield
+                for pre, vc in proofs:
+                    self.prove(pre, vc, verdicts.get(vc))
 
             yield
 
+    def prove(self, pre, vc, verdict):
+        """ Add proof of credential vc from pre to .proofs when verified, hold it while the credential
+        is not yet verified by the Verifier, which may still be processing or escrowing it, and reject
+        it when the credential is revoked or failed
+
+        Parameters:
+            pre (str): qb64 identifier prefix of the sender of the proof
+            vc (str): SAID of the credential
+            verdict (Optional(Exception)): None if verified else the exception saying why not
+
+        """
+        if verdict is None:
+            self.held.pop((pre, vc), None)
+            self.proofs.append((pre, vc))
+            return
+
+        if isinstance(verdict, kering.MissingEntryError):
+            first = self.held.setdefault((pre, vc), self.tyme)
+            if self.tyme - first <= self.TimeoutHeld:
+                return
+            verdict = f"not verified within {self.TimeoutHeld} seconds"
+
+        self.held.pop((pre, vc), None)
+        logger.info("Presentation proof from %s of credential %s rejected: %s", pre, vc, verdict)
+
+
+def verifyPresentations(verifier, creds=None, presentations=None):
+    """ Verify many credentials and presentations as one batch
+
+    Credentials in creds are verified together by verifier so issuer key state, schema and
+    registry lookups are shared by all credentials that have them in common. Credentials
+    referenced by presentations are then checked against the held credentials and the
+    revocation snapshot of their registry, loaded once per registry.
+
+    Parameters:
+        verifier (Verifier): verifier of credentials with registry database
+        creds (Iterable): each entry is dict of creder, sadsigers and sadcigars of a credential
+        presentations (Iterable): payloads of /presentation/proof messages
+
+    Returns:
+        dict: credential SAID to verdict, None if verified, held and not revoked else the
+              exception saying why not
+
+    """
+    verdicts = verifier.processCredentials(creds) if creds else dict()
+    reger = verifier.reger
+
+    saids = [said for said, verdict in verdicts.items() if verdict is None]
+    for payload in (presentations if presentations is not None else []):
+        saids.extend(payload.get("verifiableCredential", []))
+
+    for said in saids:
+        if verdicts.get(said) is not None:  # already failed in this batch
+            continue
+
+        if reger.saved.get(keys=said) is None or (creder := reger.creds.get(keys=said)) is None:
+            verdicts[said] = kering.MissingEntryError(f"credential {said} not verified")
+        elif said in reger.snapshot(creder.status):
+            verdicts[said] = kering.InvalidCredentialStateError(f"credential {said} is revoked")
+        else:
+            verdicts[said] = None
+
+    return verdicts
+
 
 def presentationExchangeExn(db, reger, credentials):
     """ Create a presentation exchange.
@@ -459,32 +531,14 @@ def presentationExchangeExn(db, reger, credentials):
     vcs = []
 
     for idx, (creder, sadsigers, sadcigars) in enumerate(credentials):
-        said = creder.said
-        regk = creder.status
-
-        issr = creder.crd["i"]
-
-        msgs = bytearray()
-        for msg in db.clonePreIter(pre=issr):
-            msgs.extend(msg)
-
-        for msg in reger.clonePreIter(pre=regk):
-            msgs.extend(msg)
-
-        for msg in reger.clonePreIter(pre=said):
-            msgs.extend(msg)
-
         dm.append(dict(
             id=creder.schema,
             format="cesr",
             path="$.verifiableCredential[{}]".format(idx)
         ))
 
-        craw = signing.provision(creder, sadsigers=sadsigers, sadcigars=sadcigars)
         vcs.append(creder.said)
-
-        sources = reger.sources(db, creder)
-        vcs.extend([creder.said for creder, msgs in sources])
+        vcs.extend([source.said for source in reger.graph(reger.nodes(creder))])
 
     d = dict(
         presentation_submission=dict(
@@ -7,6 +7,7 @@ from hio.base import doing
 
 from .. import help
 from ..app import agenting
+from ..core.coring import Ilks
 from ..vdr import viring
 
 logger = help.ogler.getLogger()
@@ -41,14 +42,81 @@ class Wallet:
             schema: qb64 SAID of the schema for the credential
 
         """
-        saiders = self.reger.schms.get(keys=schema.encode("utf-8"))
+        return list(self.credentials(schema=schema))
 
-        creds = []
-        for saider in saiders:
-            creder, sadsigers, sadcigars = self.reger.cloneCred(said=saider.qb64)
-            creds.append((creder, sadsigers, sadcigars))
+    def credentials(self, **kwa):
+        """
+        Returns iterator of (creder, sadsigers, sadcigars) for each credential matching the
+        filters of .query, each credential is only cloned from the database when reached
+
+        Parameters:
+            **kwa (dict): filters and page of credentials passed to .query
+
+        """
+        for saider in self.query(**kwa):
+            yield self.reger.cloneCred(said=saider.qb64)
+
+    def query(self, schema=None, issuer=None, subject=None, status=None, after=None, offset=0, limit=None):
+        """
+        Returns iterator of Saider of each saved credential matching all filters in SAID order
+
+        The smallest of the schema, issuer and subject indexes of the filters drives the query
+        and the other filters are checked with index lookups without loading credentials. For
+        cursor based paging pass the SAID of the last credential of a page as after.
+
+        Parameters:
+            schema (str): qb64 SAID of schema of credentials
+            issuer (str): qb64 AID of issuer of credentials
+            subject (str): qb64 AID of subject of credentials
+            status (str): "issued" or "revoked"
+            after (str): qb64 SAID of credential after which to start
+            offset (int): number of matching credentials to skip
+            limit (int): maximum number of credentials to return, all if None
 
-        return creds
+        """
+        filters = [(index, key) for index, key in ((self.reger.schms, schema),
+                                                   (self.reger.issus, issuer),
+                                                   (self.reger.subjs, subject)) if key is not None]
+        if filters:
+            filters.sort(key=lambda filter: filter[0].cnt(keys=filter[1]))
+            index, key = filters.pop(0)
+            saiders = index.getIter(keys=key, start=after if after is not None else b"")
+        else:
+            saiders = (saider for (said,), saider in self.reger.saved.getItemIter()
+                       if after is None or said >= after)
+
+        if limit is not None and limit <= 0:
+            return
+
+        for saider in saiders:
+            said = saider.qb64
+            if said == after:
+                continue
+            if not all(index.has(keys=key, val=said) for index, key in filters):
+                continue
+            if status is not None and self.status(said) != status:
+                continue
+            if offset > 0:
+                offset -= 1
+                continue
+
+            yield saider
+            if limit is not None:
+                limit -= 1
+                if limit == 0:
+                    return
+
+    def status(self, said):
+        """ Returns "issued" or "revoked" status of credential with qb64 SAID said, None if unknown """
+        rec = self.reger.vcst.get(keys=said)
+        if rec is None and (creder := self.reger.creds.get(keys=said)) is not None \
+                and creder.status in self.reger.tevers:
+            rec = self.reger.tevers[creder.status].vcRecord(said)
+
+        if rec is None:
+            return None
+
+        return "revoked" if rec.ilk in (Ilks.rev, Ilks.brv) else "issued"
 
 
 class WalletDoer(doing.DoDoer):
@@ -5,6 +5,8 @@ keri.vdr.credentialing module
 
 VC issuer support
 """
+import time
+
 from hio.base import doing
 from hio.help import decking
 
@@ -246,6 +248,14 @@ class Registry:
     def registries(self):
         return self.reger.registries
 
+    def revocations(self):
+        """ Returns reply message of the revocation snapshot of this registry signed by its issuer
+
+        Peers can use the snapshot to check revocation of many credentials of this registry locally.
+
+        """
+        return self.hab.reply(route=f"/tsn/revoked/{self.regk}", data=self.reger.snapshot(self.regk).sad)
+
     def rotate(self, toad=None, cuts=None, adds=None):
         """ Rotate backer list for registry
 
@@ -358,6 +368,8 @@ class Registry:
 
 class Registrar(doing.DoDoer):
 
+    MaxAnchors = 1000  # TEL event seals anchored in one key event by .bulkIssue
+
     def __init__(self, hby, rgy, counselor):
         self.hby = hby
         self.rgy = rgy
@@ -428,38 +440,37 @@ class Registrar(doing.DoDoer):
 
         """
         registry = self.rgy.regs[regk]
-        hab = registry.hab
 
         iserder = registry.issue(said=said, dt=dt)
+        return self.anchor(registry=registry, serders=[iserder], aids=aids)[0]
 
-        vcid = iserder.ked["i"]
-        rseq = coring.Seqner(snh=iserder.ked["s"])
-        rseal = SealEvent(vcid, rseq.snh, iserder.said)._asdict()
+    def bulkIssue(self, regk, saids, dts=None, aids=None):
+        """
+        Create and process the credential issuance TEL events of many credentials on the given registry
 
-        if hab.phab is None:
-            if registry.estOnly:
-                hab.rotate(data=[rseal])
-            else:
-                hab.interact(data=[rseal])
+        The seals of up to .MaxAnchors issuance events are anchored in one key event so the credentials
+        are witnessed, multisig signed and disseminated together instead of one key event each.
 
-            seqner = coring.Seqner(sn=hab.kever.sn)
-            saider = hab.kever.serder.saider
-            registry.anchorMsg(pre=vcid, regd=iserder.said, seqner=seqner, saider=saider)
+        Parameters:
+            regk (str): qb64 identifier prefix of the credential registry
+            saids (list): qb64 SAIDs of the credentials to issue
+            dts (list): iso8601 formatted date strings of issuance dates, one per SAID, now if None
+            aids (list): participants of a multisig group in the anchoring events
 
-            print("Waiting for TEL event witness receipts")
-            self.witDoer.msgs.append(dict(pre=hab.pre, sn=seqner.sn))
+        Returns:
+            list: (vcid, sn) of the issuance event of each credential in order of saids
 
-            self.rgy.reger.tpwe.add(keys=(vcid, rseq.qb64), val=(hab.kever.prefixer, seqner, saider))
-            return vcid, rseq.sn
-        else:
-            aids = aids if aids is not None else hab.aids
-            prefixer, seqner, saider = self.multisigIxn(hab, rseal)
-            self.counselor.start(aids=aids, pid=hab.phab.pre, prefixer=prefixer, seqner=seqner,
-                                 saider=saider)
+        """
+        registry = self.rgy.regs[regk]
+        dts = dts if dts is not None else [None] * len(saids)
+
+        issued = []
+        for idx in range(0, len(saids), self.MaxAnchors):
+            iserders = [registry.issue(said=said, dt=dt)
+                        for said, dt in zip(saids[idx:idx + self.MaxAnchors], dts[idx:idx + self.MaxAnchors])]
+            issued.extend(self.anchor(registry=registry, serders=iserders, aids=aids))
 
-            print(f"Waiting for TEL iss event mulisig anchoring event {seqner.sn}")
-            self.rgy.reger.tmse.add(keys=(vcid, rseq.qb64, iserder.said), val=(prefixer, seqner, saider))
-            return vcid, rseq.sn
+        return issued
 
     def revoke(self, regk, said, dt=None, aids=None):
         """
@@ -473,46 +484,61 @@ class Registrar(doing.DoDoer):
 
         """
         registry = self.rgy.regs[regk]
-        hab = registry.hab
 
         state = registry.tever.vcState(vci=said)
         if state is None or state.ked["et"] not in (coring.Ilks.iss, coring.Ilks.rev):
             raise kering.ValidationError(f"credential {said} not is correct state for revocation")
 
         rserder = registry.revoke(said=said, dt=dt)
+        return self.anchor(registry=registry, serders=[rserder], aids=aids)[0]
 
-        vcid = rserder.ked["i"]
-        rseq = coring.Seqner(snh=rserder.ked["s"])
-        rseal = SealEvent(vcid, rseq.snh, rserder.said)._asdict()
+    def anchor(self, registry, serders, aids=None):
+        """
+        Anchor the seals of credential TEL events serders in one key event of the registry issuer and
+        escrow them for witness receipts or for the multisig group
+
+        Parameters:
+            registry (Registry): credential registry of the TEL events
+            serders (list): Serder of each credential TEL event to anchor
+            aids (list): participants of a multisig group in the anchoring event
+
+        Returns:
+            list: (vcid, sn) of each TEL event
+
+        """
+        hab = registry.hab
+        rseqs = [coring.Seqner(snh=serder.ked["s"]) for serder in serders]
+        rseals = [SealEvent(serder.ked["i"], rseq.snh, serder.said)._asdict() for serder, rseq in zip(serders, rseqs)]
 
         if hab.phab is None:
             if registry.estOnly:
-                hab.rotate(data=[rseal])
+                hab.rotate(data=rseals)
             else:
-                hab.interact(data=[rseal])
+                hab.interact(data=rseals)
 
             seqner = coring.Seqner(sn=hab.kever.sn)
             saider = hab.kever.serder.saider
-            registry.anchorMsg(pre=vcid, regd=rserder.said, seqner=seqner, saider=saider)
+            for serder, rseq in zip(serders, rseqs):
+                registry.anchorMsg(pre=serder.ked["i"], regd=serder.said, seqner=seqner, saider=saider)
+                self.rgy.reger.tpwe.add(keys=(serder.ked["i"], rseq.qb64), val=(hab.kever.prefixer, seqner, saider))
 
             print("Waiting for TEL event witness receipts")
             self.witDoer.msgs.append(dict(pre=hab.pre, sn=seqner.sn))
-
-            self.rgy.reger.tpwe.add(keys=(vcid, rseq.qb64), val=(hab.kever.prefixer, seqner, saider))
-            return vcid, rseq.sn
         else:
             aids = aids if aids is not None else hab.aids
-            prefixer, seqner, saider = self.multisigIxn(hab, rseal)
+            prefixer, seqner, saider = self.multisigIxn(hab, rseals)
             self.counselor.start(aids=aids, pid=hab.phab.pre, prefixer=prefixer, seqner=seqner,
                                  saider=saider)
 
-            print(f"Waiting for TEL rev event mulisig anchoring event {seqner.sn}")
-            self.rgy.reger.tmse.add(keys=(vcid, rseq.qb64, rserder.said), val=(prefixer, seqner, saider))
-            return vcid, rseq.sn
+            print(f"Waiting for TEL {serders[0].ked['t']} event mulisig anchoring event {seqner.sn}")
+            for serder, rseq in zip(serders, rseqs):
+                self.rgy.reger.tmse.add(keys=(serder.ked["i"], rseq.qb64, serder.said), val=(prefixer, seqner, saider))
+
+        return [(serder.ked["i"], rseq.sn) for serder, rseq in zip(serders, rseqs)]
 
     @staticmethod
     def multisigIxn(hab, rseal):
-        ixn = hab.interact(data=[rseal])
+        ixn = hab.interact(data=rseal if isinstance(rseal, list) else [rseal])
         gserder = coring.Serder(raw=ixn)
 
         sn = gserder.sn
@@ -571,30 +597,42 @@ class Registrar(doing.DoDoer):
         that the event is complete.
 
         """
+        anchors = dict()  # anchoring event said to witnessed, TEL events anchored together are checked once
         for (regk, snq), (prefixer, seqner, saider) in self.rgy.reger.tpwe.getItemIter():  # partial witness escrow
-            kever = self.hby.kevers[prefixer.qb64]
-            dgkey = dbing.dgKey(prefixer.qb64b, saider.qb64)
-
-            # Load all the witness receipts we have so far
-            wigs = self.hby.db.getWigs(dgkey)
-            if kever.wits:
-                if len(wigs) == len(kever.wits):  # We have all of them, this event is finished
-                    hab = self.hby.habs[prefixer.qb64]
-                    witnessed = False
-                    for cue in self.witDoer.cues:
-                        if cue["pre"] == hab.pre and cue["sn"] == seqner.sn:
-                            witnessed = True
-
-                    if not witnessed:
-                        continue
-                else:
-                    continue
+            if saider.qb64 not in anchors:
+                anchors[saider.qb64] = self.witnessed(prefixer, seqner, saider)
+
+            if not anchors[saider.qb64]:
+                continue
 
             rseq = coring.Seqner(qb64=snq)
             self.rgy.reger.tpwe.rem(keys=(regk, snq))
 
             self.rgy.reger.tede.add(keys=(regk, rseq.qb64), val=(prefixer, seqner, saider))
 
+    def witnessed(self, prefixer, seqner, saider):
+        """ Returns True if anchoring key event has the receipts of all witnesses
+
+        Parameters:
+            prefixer (Prefixer): identifier of anchoring event
+            seqner (Seqner): sequence number of anchoring event
+            saider (Saider): SAID of anchoring event
+
+        """
+        kever = self.hby.kevers[prefixer.qb64]
+        if not kever.wits:
+            return True
+
+        # Load all the witness receipts we have so far
+        wigs = self.hby.db.getWigs(dbing.dgKey(prefixer.qb64b, saider.qb64))
+        if len(wigs) != len(kever.wits):
+            return False
+
+        # We have all of them, this event is finished once the receiptor is done with it
+        hab = self.hby.habs[prefixer.qb64]
+        return any(cue["pre"] == hab.pre and cue["sn"] == seqner.sn and cue.get("kin") != "timeout"
+                   for cue in self.witDoer.cues)
+
     def processMultisigEscrow(self):
         """
         Process escrow of group multisig events that do not have a full compliment of receipts
@@ -602,14 +640,21 @@ class Registrar(doing.DoDoer):
         that the event is complete.
 
         """
+        anchors = dict()  # anchoring event said to completed, TEL events anchored together are checked once
         for (regk, snq, regd), (prefixer, seqner, saider) in self.rgy.reger.tmse.getItemIter():  # multisig escrow
-            try:
-                if not self.counselor.complete(prefixer, seqner, saider):
-                    continue
-            except kering.ValidationError:
+            if saider.qb64 not in anchors:
+                try:
+                    anchors[saider.qb64] = self.counselor.complete(prefixer, seqner, saider)
+                except kering.ValidationError:
+                    anchors[saider.qb64] = None
+
+            if anchors[saider.qb64] is None:
                 self.rgy.reger.tmse.rem(keys=(regk, snq, regd))
                 continue
 
+            if not anchors[saider.qb64]:
+                continue
+
             rseq = coring.Seqner(qb64=snq)
 
             # Anchor the message, registry or otherwise
@@ -621,6 +666,7 @@ class Registrar(doing.DoDoer):
             self.rgy.reger.tede.add(keys=(regk, rseq.qb64), val=(prefixer, seqner, saider))
 
     def processDiseminationEscrow(self):
+        tevts = dict()  # anchoring event said to (prefixer, TEL events) sent to witnesses as one message
         for (regk, snq), (prefixer, seqner, saider) in self.rgy.reger.tede.getItemIter():  # group multisig escrow
             rseq = coring.Seqner(qb64=snq)
             dig = self.rgy.reger.getTel(key=snKey(pre=regk, sn=rseq.sn))
@@ -629,29 +675,48 @@ class Registrar(doing.DoDoer):
 
             self.rgy.reger.tede.rem(keys=(regk, snq))
 
-            tevt = bytearray()
+            _, tevt = tevts.setdefault(saider.qb64, (prefixer, bytearray()))
             for msg in self.rgy.reger.clonePreIter(pre=regk, fn=rseq.sn):
                 tevt.extend(msg)
 
+            self.rgy.reger.ctel.put(keys=(regk, rseq.qb64), val=saider)  # idempotent
+            self.rgy.reger.changed("ctel", regk)
+
+        for prefixer, tevt in tevts.values():
             print(f"Sending TEL events to witnesses")
             # Fire and forget the TEL event to the witnesses.  Consumers will have to query
             # to determine when the Witnesses have received the TEL events.
             self.witPub.msgs.append(dict(pre=prefixer.qb64, msg=tevt))
-            self.rgy.reger.ctel.put(keys=(regk, rseq.qb64), val=saider)  # idempotent
 
 
 class Credentialer(doing.DoDoer):
 
+    SweepInterval = 60.0  # seconds between full passes over all escrows
+
     def __init__(self, hby, rgy, registrar, verifier):
         self.hby = hby
         self.rgy = rgy
         self.registrar = registrar
         self.verifier = verifier
         self.postman = forwarding.Postman(hby=hby)
+        self.woken = set()  # (topic, said) of completed TEL events and saved credentials since last pass
+        self.swept = None  # monotonic time of last full pass over all escrows
+        self.rgy.reger.watch("ctel", self)
+        self.rgy.reger.watch("cred", self)
         doers = [self.postman, doing.doify(self.escrowDo)]
 
         super(Credentialer, self).__init__(doers=doers)
 
+    def changed(self, topic, key):
+        """ Wake credentials escrowed waiting on key of topic, called by database on write
+
+        Parameters:
+            topic (str): "ctel" for a completed TEL event or "cred" for a saved credential
+            key (str): qb64 prefix of TEL event or SAID of credential
+
+        """
+        self.woken.add((topic, key))
+
     def create(self, regname, recp, schema, source, rules, data):
         """  Create and validate a credential returning the fully populated Creder
 
@@ -737,7 +802,43 @@ class Credentialer(doing.DoDoer):
         dt = creder.subject["dt"] if "dt" in creder.subject else None
 
         vcid, seq = self.registrar.issue(regk=registry.regk, said=creder.said, dt=dt, aids=aids)
+        self.escrow(hab=hab, creder=creder, seq=seq, aids=aids)
+
+    def bulkIssue(self, creders, aids=None):
+        """ Issue many credentials of one registry anchored together and handle witness propagation and communication
 
+        Args:
+            creders (list): Creder of each credential to issue, all in the same registry
+            aids (list): optional participant list for multisig issuance
+
+        """
+        if not creders:
+            return
+
+        regks = set(creder.crd["ri"] for creder in creders)
+        if len(regks) != 1:
+            raise kering.ValidationError(f"bulk issuance from more than one registry {regks}")
+
+        registry = self.rgy.regs[regks.pop()]
+        hab = registry.hab
+        aids = aids if aids is not None else hab.aids
+        dts = [creder.subject["dt"] if "dt" in creder.subject else None for creder in creders]
+
+        issued = self.registrar.bulkIssue(regk=registry.regk, saids=[creder.said for creder in creders], dts=dts,
+                                          aids=aids)
+        for creder, (vcid, seq) in zip(creders, issued):
+            self.escrow(hab=hab, creder=creder, seq=seq, aids=aids)
+
+    def escrow(self, hab, creder, seq, aids):
+        """ Sign credential creder and escrow it until its issuance is anchored and signed by the group
+
+        Args:
+            hab (Hab): issuer environment
+            creder (Creder): Credential object to issue
+            seq (int): sequence number of issuance TEL event
+            aids (list): participant list for multisig issuance
+
+        """
         rseq = coring.Seqner(sn=seq)
         if hab.phab:
             craw = signing.ratify(hab=hab, serder=creder)
@@ -756,11 +857,25 @@ class Credentialer(doing.DoDoer):
 
             # escrow waiting for registry anchors to be complete
             self.rgy.reger.crie.put(keys=(creder.said, rseq.qb64), val=creder)
+            self.woken.add(("ctel", creder.said))  # anchors may already be complete
 
         parsing.Parser().parse(ims=craw, vry=self.verifier)
 
-    def processCredentialMissingSigEscrow(self):
-        for (said, snq), creder in self.rgy.reger.cmse.getItemIter():
+    @staticmethod
+    def escrowed(db, saids=None):
+        """ Returns iterator over items of escrow db, only of the credentials in saids when not None
+
+        Parameters:
+            db (Suber): escrow keyed by (credential SAID, issuance sn)
+            saids (Iterable): qb64 SAIDs of credentials to return items of, all when None
+
+        """
+        if saids is None:
+            return db.getItemIter()
+        return (item for said in sorted(saids) for item in db.getItemIter(keys=(said, "")))
+
+    def processCredentialMissingSigEscrow(self, saids=None):
+        for (said, snq), creder in self.escrowed(self.rgy.reger.cmse, saids):
             rseq = coring.Seqner(qb64=snq)
 
             # Look for the saved saider
@@ -775,9 +890,10 @@ class Credentialer(doing.DoDoer):
             kever = hab.kever
             # place in escrow to diseminate to other if witnesser and if there is an issuee
             self.rgy.reger.crie.put(keys=(creder.said, rseq.qb64), val=creder)
+            self.woken.add(("ctel", creder.said))  # anchors may already be complete
 
-    def processCredentialIssuedEscrow(self):
-        for (said, snq), creder in self.rgy.reger.crie.getItemIter():
+    def processCredentialIssuedEscrow(self, saids=None):
+        for (said, snq), creder in self.escrowed(self.rgy.reger.crie, saids):
             rseq = coring.Seqner(qb64=snq)
 
             if not self.registrar.complete(pre=said, sn=rseq.sn):
@@ -907,7 +1023,20 @@ class Credentialer(doing.DoDoer):
         """
         Process credential registry anchors:
 
+        Only credentials whose TEL event was completed or that were saved since the last pass
+        are reprocessed, except every .SweepInterval seconds when all escrowed credentials are.
+
         """
-        self.processCredentialIssuedEscrow()
-        self.processCredentialMissingSigEscrow()
+        now = time.monotonic()
+        if self.swept is None or now - self.swept >= self.SweepInterval:
+            self.swept = now
+            self.woken.clear()
+            issued = signed = None
+        else:
+            woken, self.woken = self.woken, set()
+            issued = [key for (topic, key) in woken if topic == "ctel"]
+            signed = [key for (topic, key) in woken if topic == "cred"]
+
+        self.processCredentialIssuedEscrow(saids=issued)
+        self.processCredentialMissingSigEscrow(saids=signed)
         self.processCredentialSentEscrow()
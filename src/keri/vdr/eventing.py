@@ -25,7 +25,7 @@ from ..db.dbing import dgKey, snKey
 from ..help import helping
 from ..kering import (MissingWitnessSignatureError, Version,
                       MissingAnchorError, ValidationError, OutOfOrderError, LikelyDuplicitousError)
-from ..vdr.viring import Reger
+from ..vdr.viring import Reger, CredentialStateRecord
 
 logger = help.ogler.getLogger()
 
@@ -966,6 +966,7 @@ class Tever:
                           saider=saider,
                           bigers=bigers,
                           baks=self.baks)
+            self.reger.states.pin(keys=self.prefixer.qb64, val=self.state())  # reload rotated state if evicted
 
             return
 
@@ -1209,40 +1210,17 @@ class Tever:
         Returns:
             status (Serder): transaction event state notification message
         """
-        digs = []
-        for _, dig in self.reger.getTelItemPreIter(pre=vci.encode("utf-8")):
-            digs.append(dig)
-
-        if len(digs) == 0:
+        rec = self.vcRecord(vci)
+        if rec is None:
             return None
 
-        vcsn = len(digs) - 1
-        vcdig = bytes(digs[-1])
-
-        dgkey = dbing.dgKey(vci, vcdig)  # get message
-        raw = self.reger.getTvt(key=dgkey)
-        serder = coring.Serder(raw=bytes(raw))
-
-        if self.noBackers:
-            vcilk = Ilks.iss if len(digs) == 1 else Ilks.rev
-            ra = dict()
-        else:
-            vcilk = Ilks.bis if len(digs) == 1 else Ilks.brv
-            ra = serder.ked["ra"]
-
-        dgkey = dbing.dgKey(vci, vcdig)
-        couple = self.reger.getAnc(dgkey)
-        ancb = bytearray(couple)
-        seqner = coring.Seqner(qb64b=ancb, strip=True)
-        saider = coring.Saider(qb64b=ancb, strip=True)
-
         return vcstate(vcpre=vci,
-                       said=vcdig.decode("utf-8"),
-                       sn=vcsn,
+                       said=rec.said,
+                       sn=rec.sn,
                        ri=self.prefixer.qb64,
-                       eilk=vcilk,
-                       ra=ra,
-                       a=dict(s=seqner.sn, d=saider.qb64),
+                       eilk=rec.ilk,
+                       ra=rec.ra,
+                       a=rec.anchor,
                        )
 
     def vcSn(self, vci):
@@ -1257,9 +1235,59 @@ class Tever:
             int: current TEL sequence number of credential or None if not found
 
         """
-        cnt = self.reger.cntTels(vci)
+        rec = self.vcRecord(vci)
+
+        return None if rec is None else rec.sn
+
+    def vcRecord(self, vci):
+        """ Returns CredentialStateRecord of latest TEL event of VC from the .reger.vcst index
+
+        Credentials logged before the index existed are indexed from their TEL on first lookup.
+
+        Parameters:
+          vci (str):  qb64 VC identifier
+
+        Returns:
+            CredentialStateRecord: latest event of credential or None if never issued
+
+        """
+        if (rec := self.reger.vcst.get(keys=vci)) is not None:
+            return rec
+
+        digs = []
+        for _, dig in self.reger.getTelItemPreIter(pre=vci.encode("utf-8")):
+            digs.append(dig)
+
+        if len(digs) == 0:
+            return None
+
+        dgkey = dbing.dgKey(vci, bytes(digs[-1]))  # get message
+        serder = coring.Serder(raw=bytes(self.reger.getTvt(key=dgkey)))
+        ancb = bytearray(self.reger.getAnc(dgkey))
+        seqner = coring.Seqner(qb64b=ancb, strip=True)
+        saider = coring.Saider(qb64b=ancb, strip=True)
 
-        return None if cnt == 0 else cnt - 1
+        return self.index(sn=len(digs) - 1, serder=serder, seqner=seqner, saider=saider)
+
+    def index(self, sn, serder, seqner, saider):
+        """ Pin and return CredentialStateRecord for VC TEL event serder in .reger.vcst
+
+        Parameters:
+            sn (int): is event sequence number
+            serder (Serder): is Serder instance of VC TEL event
+            seqner (Seqner): issuing event sequence number from controlling KEL.
+            saider (Saider): issuing event SAID from controlling KEL.
+
+        """
+        rec = CredentialStateRecord(ilk=serder.ked["t"],
+                                    sn=sn,
+                                    said=serder.said,
+                                    anchor=dict(s=seqner.sn, d=saider.qb64),
+                                    ra=serder.ked.get("ra", dict()))
+        self.reger.vcst.pin(keys=serder.pre, val=rec)
+        if rec.ilk in (Ilks.rev, Ilks.brv):
+            self.reger.logRevocation(regk=self.prefixer.qb64, said=serder.pre)
+        return rec
 
     def logEvent(self, pre, sn, serder, seqner, saider, bigers=None, baks=None):
         """ Update associated logs for verified event.
@@ -1290,6 +1318,9 @@ class Tever:
         self.reger.tets.pin(keys=(pre.decode("utf-8"), dig.decode("utf-8")), val=coring.Dater())
         self.reger.putTvt(key, serder.raw)
         self.reger.putTel(snKey(pre, sn), dig)
+        if serder.ked["t"] in (Ilks.iss, Ilks.rev, Ilks.bis, Ilks.brv):
+            self.index(sn=sn, serder=serder, seqner=seqner, saider=saider)
+        self.reger.changed("tel", pre.decode("utf-8"))
         logger.info("Tever state: %s Added to TEL valid event=\n%s\n",
                     pre, json.dumps(serder.ked, indent=1))
 
@@ -1388,18 +1419,15 @@ class Tever:
         if eserder.said != saider.qb64:
             return False
 
-        seal = eserder.ked["a"]
-        if seal is None or len(seal) != 1:
+        seals = eserder.ked["a"]
+        if not seals:
             return False
 
-        seal = seal[0]
-        spre = seal["i"]
-        ssn = seal["s"]
-        sdig = seal["d"]
-
-        if spre == serder.ked["i"] and ssn == serder.ked["s"] \
-                and serder.said == sdig:
-            return True
+        # anchoring event may anchor many TEL events, one seal each
+        for seal in seals:
+            if seal.get("i") == serder.ked["i"] and seal.get("s") == serder.ked["s"] \
+                    and seal.get("d") == serder.said:
+                return True
 
         return False
 
@@ -1687,6 +1715,11 @@ class Tevery:
                 if vcpre := qry["i"]:
                     tsn = tever.vcState(vcpre=vcpre)
                     self.cues.push(dict(kin="reply", route="/tsn/credential", data=tsn.ked, dest=source))
+        elif route == "revoked":
+            ri = qry["ri"]
+            if ri in self.tevers:
+                snapshot = self.reger.snapshot(ri)
+                self.cues.push(dict(kin="reply", route="/tsn/revoked", data=snapshot.sad, dest=source))
 
         else:
             raise ValidationError("invalid query message {} for evt = {}".format(ilk, ked))
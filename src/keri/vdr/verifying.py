@@ -7,6 +7,7 @@ VC verifier support
 """
 import datetime
 import logging
+import time
 from typing import Type
 
 from hio.help import decking
@@ -33,6 +34,9 @@ class Verifier:
     TimeoutBCE = 3600  # seconds to timeout missing issuer escrows
 
     CredentialExpiry = 3600
+    TimeoutChain = 600  # seconds a memoized chain verification is reused
+    MaxChains = 4096  # memoized chain verifications retained
+    SweepInterval = 60.0  # seconds between full passes over all escrows
 
     def __init__(self, hby, reger=None, creds=None, cues=None):
         """
@@ -49,6 +53,12 @@ class Verifier:
         self.reger = reger if reger is not None else Reger(name=self.hby.name, temp=True)
         self.creds = creds if creds is not None else decking.Deck()  # subclass of deque
         self.cues = cues if cues is not None else decking.Deck()  # subclass of deque
+        # credential SAID to (issuer, regk, issuer sn, TEL sn, state, expiry) of verified chain nodes
+        self.chains = dict()
+        self.waiting = dict()  # (topic, key) of missing dependency to set of (escrow, said) waiting for it
+        self.woken = set()  # (topic, key) of dependencies written since last .processEscrows
+        self.swept = None  # monotonic time of last full pass over all escrows
+        self.batch = None  # lookups shared by credentials of the batch in .processCredentials
 
         self.inited = False
         self.tvy = None
@@ -68,8 +78,12 @@ class Verifier:
         self.psr = parsing.Parser(framed=True, kvy=self.hby.kvy, tvy=self.tvy)
         self.resolver = scheming.CacheResolver(db=self.hby.db)
 
-        self.inited = True
+        self.hby.db.watch("kel", self)
+        self.hby.db.watch("schema", self)
+        self.reger.watch("tel", self)
+        self.reger.watch("cred", self)
 
+        self.inited = True
 
     @property
     def tevers(self):
@@ -77,6 +91,39 @@ class Verifier:
         """
         return self.reger.tevers
 
+    @property
+    def escrows(self):
+        """ Returns list of (escrow, timeout, etype) of each credential escrow in processing order
+        """
+        return [(self.reger.mce, self.TimeoutMRI, kering.MissingChainError),
+                (self.reger.mse, self.TimeoutMRI, kering.MissingSchemaError),
+                (self.reger.pse, self.TimeoutPSE, kering.MissingSignatureError),
+                (self.reger.mie, self.TimeoutMRI, kering.MissingIssuerError),
+                (self.reger.mre, self.TimeoutMRE, kering.MissingRegistryError)]
+
+    def changed(self, topic, key):
+        """ Wake credentials escrowed waiting on key of topic, called by database on write
+
+        Parameters:
+            topic (str): kind of data written, one of "kel", "schema", "tel" or "cred"
+            key (str): qb64 prefix or SAID of data written
+
+        """
+        if (topic, key) in self.waiting:
+            self.woken.add((topic, key))
+
+    def wait(self, db, creder, deps):
+        """ Record that credential creder escrowed in db is waiting on each (topic, key) in deps
+
+        Parameters:
+            db (Suber): escrow holding credential
+            creder (Creder): escrowed credential
+            deps (Iterable): (topic, key) of each missing dependency
+
+        """
+        for dep in deps:
+            self.waiting.setdefault(dep, set()).add((db, creder.said))
+
     def processMessages(self, creds=None):
         """ Process message dicts in msgs or if msgs is None in .msgs
 
@@ -87,8 +134,109 @@ class Verifier:
         if creds is None:
             creds = self.creds
 
+        batch = []
         while creds:
-            self.processCredential(**creds.pull())
+            batch.append(creds.pull())
+
+        if batch:
+            self.processCredentials(batch)
+
+    def processCredentials(self, creds):
+        """ Verify many credentials at once sharing lookups across the batch
+
+        Credentials are grouped by issuer, schema and registry so that schema resolution and
+        issuer key state resolution happen once per distinct schema and signing event, and
+        credentials chained to others in the batch are verified after them.
+
+        Parameters:
+            creds (Iterable): each entry is dict that matches call signature of .processCredential
+
+        Returns:
+            dict: credential SAID to verdict, None if verified and saved else the exception raised
+
+        """
+        creds = list(creds)
+        bysaid = {cred["creder"].said: cred for cred in creds}
+        ordered = sorted(creds, key=lambda c: (c["creder"].issuer, c["creder"].schema,
+                                               c["creder"].status or ""))
+
+        verdicts = dict()
+        self.batch = dict()
+        try:
+            for cred in self.depthFirst(ordered, bysaid):
+                said = cred["creder"].said
+                try:
+                    self.processCredential(**cred)
+                except Exception as ex:  # each credential gets its own verdict
+                    verdicts[said] = ex
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.exception("Verifier credential batch error: %s", ex)
+                else:
+                    verdicts[said] = None
+        finally:
+            self.batch = None
+
+        return verdicts
+
+    @staticmethod
+    def depthFirst(creds, bysaid):
+        """ Yield each of creds after the credentials of bysaid its edges chain to
+
+        Parameters:
+            creds (list): credential dicts in preferred order
+            bysaid (dict): credential SAID to credential dict of the batch
+
+        """
+        seen = set()
+        for cred in creds:
+            stack = [(cred, False)]
+            while stack:
+                cred, expanded = stack.pop()
+                said = cred["creder"].said
+                if expanded:
+                    yield cred
+                    continue
+                if said in seen:
+                    continue
+                seen.add(said)
+                stack.append((cred, True))
+                for node in reversed(Reger.nodes(cred["creder"])):
+                    if node in bysaid and node not in seen:
+                        stack.append((bysaid[node], False))
+
+    def schemer(self, schema):
+        """ Returns Schemer of schema SAID or None if not resolved, shared within a batch
+
+        Parameters:
+            schema (str): qb64 SAID of schema
+
+        """
+        if self.batch is not None and ("schema", schema) in self.batch:
+            return self.batch[("schema", schema)]
+
+        scraw = self.resolver.resolve(schema)
+        schemer = scheming.Schemer(raw=scraw) if scraw else None
+        if self.batch is not None and schemer is not None:
+            self.batch[("schema", schema)] = schemer
+        return schemer
+
+    def verifiers(self, pre, sn, dig):
+        """ Returns (tholder, verfers) of establishment event of pre at sn, shared within a batch
+
+        Parameters:
+            pre (str): qb64 identifier prefix of signer
+            sn (int): sequence number of signing establishment event
+            dig (str): qb64 SAID of signing establishment event
+
+        """
+        key = ("keys", pre, sn, dig)
+        if self.batch is not None and key in self.batch:
+            return self.batch[key]
+
+        verifiers = self.hby.resolveVerifiers(pre=pre, sn=sn, dig=dig)
+        if self.batch is not None:
+            self.batch[key] = verifiers
+        return verifiers
 
     def processCredential(self, creder, sadsigers=None, sadcigars=None):
         """ Credential data and signature(s) verification
@@ -133,13 +281,12 @@ class Verifier:
             # raise kering.InvalidCredentialStateError("..."))
 
         # Verify the credential against the schema
-        scraw = self.resolver.resolve(schema)
-        if not scraw:
+        schemer = self.schemer(schema)
+        if schemer is None:
             if self.escrowMSE(creder, sadsigers, sadcigars):
                 self.cues.append(dict(kin="query", q=dict(r="schema", said=schema)))
             raise kering.MissingSchemaError("schema {} not in cache".format(schema))
 
-        schemer = scheming.Schemer(raw=scraw)
         try:
             schemer.verify(creder.raw)
         except kering.ValidationError as ex:
@@ -167,7 +314,7 @@ class Verifier:
                 raise kering.MissingIssuerError("issuer identifier {} not in Kevers".format(prefixer.qb64))
 
             # Verify the signatures are valid and that the signature threshold as of the signing event is met
-            tholder, verfers = self.hby.resolveVerifiers(pre=prefixer.qb64, sn=seqner.sn, dig=saider.qb64)
+            tholder, verfers = self.verifiers(pre=prefixer.qb64, sn=seqner.sn, dig=saider.qb64)
             _, indices = core.eventing.verifySigs(creder.raw, sigers, verfers)
 
             if not tholder.satisfy(indices):  # We still don't have all the sigers, need to escrow
@@ -247,6 +394,7 @@ class Verifier:
         key = creder.saider.qb64b
 
         self.reger.logCred(creder, sadsigers, sadcigars)
+        self.wait(self.reger.mre, creder, [("tel", creder.status), ("tel", creder.said)])
         return self.reger.mre.put(keys=key, val=coring.Dater())
 
     def escrowMIE(self, creder, sadsigers, sadcigars):
@@ -261,6 +409,8 @@ class Verifier:
         key = creder.saider.qb64b
 
         self.reger.logCred(creder, sadsigers, sadcigars)
+        self.wait(self.reger.mie, creder, [("kel", prefixer.qb64) for (pather, prefixer, _, _, _) in sadsigers
+                                           if pather.bext == "-"])
         return self.reger.mie.put(keys=key, val=coring.Dater())
 
     def escrowMCE(self, creder, sadsigers, sadcigars):
@@ -275,6 +425,9 @@ class Verifier:
         key = creder.saider.qb64b
 
         self.reger.logCred(creder, sadsigers, sadcigars)
+        edges = creder.crd["e"] if isinstance(creder.crd["e"], list) else [creder.crd["e"]]
+        nodes = [node["n"] for edge in edges for label, node in edge.items() if label not in ('d', 'o')]
+        self.wait(self.reger.mce, creder, [(topic, node) for node in nodes for topic in ("cred", "tel")])
         return self.reger.mce.put(keys=key, val=coring.Dater())
 
     def escrowMSE(self, creder, sadsigers, sadcigars):
@@ -291,18 +444,35 @@ class Verifier:
         key = creder.saider.qb64b
 
         self.reger.logCred(creder, sadsigers, sadcigars)
+        self.wait(self.reger.mse, creder, [("schema", creder.schema)])
         return self.reger.mse.put(keys=key, val=coring.Dater())
 
     def processEscrows(self):
-        """ Process all escrows once each
+        """ Process escrowed credentials whose missing dependencies have been written
 
-        """
+        Escrowed credentials are recorded in .waiting against the registry, issuer key state,
+        chained credential or schema they are missing and are only reprocessed once .changed
+        wakes them. Every .SweepInterval seconds all escrows are processed once each instead,
+        to time out stale entries and to pick up dependencies written by other processes.
 
-        self._processEscrow(self.reger.mce, self.TimeoutMRI, kering.MissingChainError)
-        self._processEscrow(self.reger.mse, self.TimeoutMRI, kering.MissingSchemaError)
-        self._processEscrow(self.reger.pse, self.TimeoutPSE, kering.MissingSignatureError)
-        self._processEscrow(self.reger.mie, self.TimeoutMRI, kering.MissingIssuerError)
-        self._processEscrow(self.reger.mre, self.TimeoutMRE, kering.MissingRegistryError)
+        """
+        now = time.monotonic()
+        if self.swept is None or now - self.swept >= self.SweepInterval:
+            self.swept = now
+            self.waiting.clear()  # rebuilt as entries are escrowed again
+            self.woken.clear()
+            for db, timeout, etype in self.escrows:
+                self._processEscrow(db, timeout, etype)
+            return
+
+        entries = set()
+        while self.woken:
+            entries.update(self.waiting.pop(self.woken.pop(), ()))
+
+        for db, timeout, etype in self.escrows:
+            for said in sorted(said for (edb, said) in entries if edb is db):
+                if (dater := db.get(keys=said)) is not None:
+                    self._processEscrowed(db, said, dater, timeout, etype)
 
     def _processEscrow(self, db, timeout, etype: Type[Exception]):
         """ Generic credential escrow processing
@@ -314,38 +484,51 @@ class Verifier:
 
         """
         for (said,), dater in db.getItemIter():
-            creder, sadsigers, sadcigars = self.reger.cloneCred(said)
+            self._processEscrowed(db, said, dater, timeout, etype)
 
-            try:
+    def _processEscrowed(self, db, said, dater, timeout, etype: Type[Exception]):
+        """ Process one escrowed credential
 
-                dtnow = helping.nowUTC()
-                dte = helping.fromIso8601(dater.dts)
-                if (dtnow - dte) > datetime.timedelta(seconds=timeout):
-                    # escrow stale so raise ValidationError which unescrows below
-                    logger.info("Verifier unescrow error: Stale event escrow "
-                                " at said = %s\n", bytes(said))
+        Parameters:
+            db (LMDBer): escrow database table holding credential
+            said (str): qb64 SAID of escrowed credential
+            dater (Dater): time credential was escrowed
+            timeout (float): escrow specific message timeout
+            etype (TypeOf(Exception)): exception class to catch and ignore
 
-                    raise kering.ValidationError("Stale event escrow "
-                                                 "at said = {}.".format(bytes(said)))
+        """
+        creder, sadsigers, sadcigars = self.reger.cloneCred(said)
 
-                self.processCredential(creder, sadsigers, sadcigars)
+        try:
 
-            except etype as ex:
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.exception("Verifiery unescrow failed: %s\n", ex.args[0])
-                else:
-                    logger.error("Verifier unescrow failed: %s\n", ex.args[0])
-            except Exception as ex:  # log diagnostics errors etc
-                # error other than missing sigs so remove from PA escrow
-                db.rem(said)
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.exception("Verifier unescrowed: %s\n", ex.args[0])
-                else:
-                    logger.error("Verifier unescrowed: %s\n", ex.args[0])
+            dtnow = helping.nowUTC()
+            dte = helping.fromIso8601(dater.dts)
+            if (dtnow - dte) > datetime.timedelta(seconds=timeout):
+                # escrow stale so raise ValidationError which unescrows below
+                logger.info("Verifier unescrow error: Stale event escrow "
+                            " at said = %s\n", bytes(said))
+
+                raise kering.ValidationError("Stale event escrow "
+                                             "at said = {}.".format(bytes(said)))
+
+            self.processCredential(creder, sadsigers, sadcigars)
+
+        except etype as ex:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.exception("Verifiery unescrow failed: %s\n", ex.args[0])
             else:
-                db.rem(said)
-                logger.info("Verifier unescrow succeeded in valid group op: "
-                            "creder=\n%s\n", creder.pretty())
+                logger.error("Verifier unescrow failed: %s\n", ex.args[0])
+        except Exception as ex:  # log diagnostics errors etc
+            # error other than missing sigs so remove from PA escrow
+            db.rem(said)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.exception("Verifier unescrowed: %s\n", ex.args[0])
+            else:
+                logger.error("Verifier unescrowed: %s\n", ex.args[0])
+        else:
+            db.rem(said)
+            logger.info("Verifier unescrow succeeded in valid group op: "
+                        "creder=\n%s\n", creder.pretty())
 
     def saveCredential(self, creder, sadsigers, sadcigars):
         """ Write the credential and associated indicies to the database
@@ -364,6 +547,7 @@ class Verifier:
         # Look up indicies
         saider = creder.saider
         self.reger.saved.pin(keys=saider.qb64b, val=saider)
+        self.reger.changed("cred", saider.qb64)
         self.reger.issus.add(keys=issuer, val=saider)
         self.reger.schms.add(keys=schema, val=saider)
 
@@ -383,6 +567,10 @@ class Verifier:
     def verifyChain(self, nodeSaid):
         """ Verifies the node credential at the end of an edge
 
+        Verifications are memoized in .chains keyed by the node credential SAID and reused while
+        the issuer key state sn is unchanged and the node credential is not in the revocation snapshot
+        of its registry so an issuer rotation or a revocation of the node credential is always seen.
+
         Parameters:
             nodeSubject(str): qb64 of node credential subject
             nodeSaid: (str): qb64 SAID of node credential
@@ -391,6 +579,12 @@ class Verifier:
             Serder: transaction event state notification message
 
         """
+        if (chain := self.chains.get(nodeSaid)) is not None:
+            issuer, regk, sn, revoked, state, expiry = chain
+            if time.monotonic() < expiry and self.chainState(issuer, regk, nodeSaid) == (sn, revoked):
+                return state
+            del self.chains[nodeSaid]
+
         said = self.reger.saved.get(keys=nodeSaid)
         if said is None:
             return None
@@ -409,4 +603,24 @@ class Verifier:
         if state is None:
             return None
 
+        sn, revoked = self.chainState(creder.issuer, creder.status, nodeSaid)
+        if len(self.chains) >= self.MaxChains:
+            del self.chains[next(iter(self.chains))]  # oldest
+        self.chains[nodeSaid] = (creder.issuer, creder.status, sn, revoked, state,
+                                 time.monotonic() + self.TimeoutChain)
+
         return state
+
+    def chainState(self, issuer, regk, said):
+        """ Returns (issuer key state sn, revoked) that a memoized chain verification depends on
+
+        Both are read from memory, the revocation from the registry's revocation snapshot.
+
+        Parameters:
+            issuer (str): qb64 AID of credential issuer
+            regk (str): qb64 registry identifier of credential
+            said (str): qb64 SAID of credential
+
+        """
+        sn = self.hby.kevers[issuer].sn if issuer in self.hby.kevers else None
+        return sn, said in self.reger.snapshot(regk)
@@ -8,7 +8,9 @@ Provides public simple Verifiable Credential Issuance/Revocation Registry
 A special purpose Verifiable Data Registry (VDR)
 """
 
-from dataclasses import dataclass
+import contextlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from  ordered_set import OrderedSet as oset
 
 from ..db import koming, subing, escrowing
@@ -21,24 +23,42 @@ from ..help import helping
 from ..vc import proving
 
 
-class RegerDict(dict):
+class RegerDict(OrderedDict):
     """ Reger backed read through cache for registry state
 
-    Subclass of dict that has db as attribute and employs read through cache
-    from db Baser.stts of kever states to reload kever from state in database
-    if not in memory as dict item
+    Subclass of OrderedDict that has db as attribute and employs read through cache
+    from db Reger.states of registry states to reload tever from state in database
+    if not in memory as dict item.
+
+    Holds at most .size tevers, evicting the least recently used when full. Tevers of
+    locally managed registries in .reger.registries are pinned and never evicted since
+    they carry local context not in their state. Eviction only drops the in memory
+    tever, its state stays in the database to be reloaded on the next miss.
+
+    Attributes:
+        size (int): maximum number of tevers held other than pinned ones
+        hits (int): number of lookups found in memory
+        misses (int): number of lookups reloaded from the database
+        evictions (int): number of tevers evicted
+
     """
-    __slots__ = ('reger', 'db', 'klas')  # no .__dict__ just for db reference
+    __slots__ = ('reger', 'db', 'klas', 'size', 'hits', 'misses', 'evictions')
+
+    MaxTevers = 1024  # default .size
 
     def __init__(self, *pa, **kwa):
         super(RegerDict, self).__init__(*pa, **kwa)
         self.db = None
         self.reger = None
+        self.size = self.MaxTevers
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def __getitem__(self, k):
         from ..vdr import eventing
         try:
-            return super(RegerDict, self).__getitem__(k)
+            tever = super(RegerDict, self).__getitem__(k)
         except KeyError as ex:
             if not self.db or not self.reger:
                 raise ex  # reraise KeyError
@@ -48,12 +68,20 @@ class RegerDict(dict):
                 tever = eventing.Tever(stt=state, db=self.db, reger=self.reger)
             except kering.MissingEntryError:  # no kel event for keystate
                 raise ex  # reraise KeyError
+            self.misses += 1
             super(RegerDict, self).__setitem__(k, tever)
+            self.evict()
             return tever
 
+        self.hits += 1
+        self.move_to_end(k)
+        return tever
+
     def __setitem__(self, key, item):
         super(RegerDict, self).__setitem__(key, item)
+        self.move_to_end(key)
         self.reger.states.pin(keys=key, val=item.state())
+        self.evict()
 
     def __delitem__(self, key):
         super(RegerDict, self).__delitem__(key)
@@ -85,6 +113,17 @@ class RegerDict(dict):
         else:
             return self.__getitem__(k)
 
+    def evict(self):
+        """ Evict least recently used tevers not pinned until no more than .size are unpinned """
+        if len(self) <= self.size:
+            return
+
+        pinned = self.reger.registries if self.reger is not None else ()
+        unpinned = [key for key in self.keys() if key not in pinned]  # least recently used first
+        for key in unpinned[:max(0, len(unpinned) - self.size)]:
+            super(RegerDict, self).__delitem__(key)  # keep state in database
+            self.evictions += 1
+
 
 @dataclass
 class RegistryRecord:
@@ -94,6 +133,25 @@ class RegistryRecord:
     prefix: str
 
 
+@dataclass
+class CredentialStateRecord:
+    """ Latest TEL event of a credential keyed by credential SAID
+
+    Attributes:
+        ilk (str): ilk of latest event, one of iss, rev, bis or brv
+        sn (int): sequence number of latest event
+        said (str): qb64 SAID of latest event
+        anchor (dict): seal of anchoring KEL event with sequence number s and SAID d
+        ra (dict): registry seal of latest event for registries with backers
+
+    """
+    ilk: str
+    sn: int
+    said: str
+    anchor: dict
+    ra: dict = field(default_factory=dict)
+
+
 def openReger(name="test", **kwa):
     """ Returns contextmanager generated by openLMDB but with Baser instance
 
@@ -105,6 +163,29 @@ def openReger(name="test", **kwa):
     return dbing.openLMDB(cls=Reger, name=name, **kwa)
 
 
+@dataclass
+class RevocationSnapshot:
+    """ Revoked credentials of one registry held in memory for constant time status checks
+
+    Attributes:
+        regk (str): qb64 registry identifier
+        sn (int): number of revocations reflected, incremented by each revocation logged
+        saids (set): qb64 SAIDs of revoked credentials
+
+    """
+    regk: str
+    sn: int = 0
+    saids: set = field(default_factory=set)
+
+    def __contains__(self, said):
+        return said in self.saids
+
+    @property
+    def sad(self):
+        """ Returns dict of snapshot for export with the revoked SAIDs sorted """
+        return dict(i=self.regk, s=f"{self.sn:x}", r=sorted(self.saids))
+
+
 class Reger(dbing.LMDBer):
     """ Vaser sets up named sub databases for VIR
 
@@ -203,6 +284,7 @@ class Reger(dbing.LMDBer):
         """
 
         self.registries = oset()
+        self.snapshots = dict()  # registry identifier to RevocationSnapshot loaded from .rvks
         if "db" in kwa:
             self._tevers = RegerDict()
             self._tevers.reger = self  # assign db for read thorugh cache of kevers
@@ -287,6 +369,19 @@ class Reger(dbing.LMDBer):
                                  subkey='regs.',
                                  schema=RegistryRecord, )
 
+        # latest TEL event of each credential keyed by credential SAID, updated as TEL events are logged
+        self.vcst = koming.Komer(db=self,
+                                 subkey='vcst.',
+                                 schema=CredentialStateRecord, )
+
+        # revoked credential SAIDs keyed by registry identifier, sorted
+        self.rvks = subing.DupSuber(db=self, subkey='rvks.')
+
+        # derived indices built from existing data, keyed by sub db name to ISO-8601 datetime built
+        self.idxs = subing.Suber(db=self, subkey='idxs.')
+        if self.idxs.get(keys=("rvks",)) is None:  # database predates .rvks so index once
+            self.indexRevocations()
+
         # TEL partial witness escrow
         self.tpwe = subing.CatCesrIoSetSuber(db=self, subkey='tpwe.',
                                              klas=(coring.Prefixer, coring.Seqner, coring.Saider))
@@ -317,50 +412,204 @@ class Reger(dbing.LMDBer):
 
         return self.env
 
-    def cloneCreds(self, saids):
+    def snapshot(self, regk):
+        """ Returns RevocationSnapshot of registry regk, loaded from .rvks on first use
+
+        Kept current by .logRevocation as this process logs revocations. Revocations logged
+        by other processes sharing the database are seen once the snapshot is dropped from
+        .snapshots and reloaded.
+
+        Parameters:
+            regk (str): qb64 registry identifier
+
+        """
+        if (snapshot := self.snapshots.get(regk)) is None:
+            saids = set(self.rvks.get(keys=regk))
+            snapshot = RevocationSnapshot(regk=regk, sn=len(saids), saids=saids)
+            self.snapshots[regk] = snapshot
+        return snapshot
+
+    def logRevocation(self, regk, said):
+        """ Record credential said of registry regk as revoked in .rvks and in its snapshot if loaded
+
+        Parameters:
+            regk (str): qb64 registry identifier
+            said (str): qb64 SAID of revoked credential
+
+        """
+        if self.rvks.add(keys=regk, val=said) and (snapshot := self.snapshots.get(regk)) is not None:
+            snapshot.saids.add(said)
+            snapshot.sn += 1
+
+    def indexRevocations(self):
+        """ Index in .rvks every revocation already in the TELs of this database
+
+        Only events after inception can be revocations so only those are loaded.  Records in
+        .idxs that the index is built so later opens of the database do not scan the TELs again.
+
+        """
+        for pre, sn, dig in self.getAllOrdItemAllPreIter(self.tels):
+            if sn == 0:
+                continue
+
+            raw = self.getTvt(dbing.dgKey(pre, bytes(dig)))
+            if raw is None:
+                continue
+
+            serder = coring.Serder(raw=bytes(raw))
+            if serder.ked["t"] == coring.Ilks.rev:
+                self.logRevocation(regk=serder.ked["ri"], said=serder.pre)
+            elif serder.ked["t"] == coring.Ilks.brv:
+                self.logRevocation(regk=serder.ked["ra"]["i"], said=serder.pre)
+
+        self.idxs.pin(keys=("rvks",), val=helping.nowIso8601())
+
+    def cloneCreds(self, saids, cache=None):
         """ Returns fully expanded credential with chained credentials attached.
 
+        All credentials are read in one read transaction and a chained credential shared by
+        several credentials is only expanded once.
+
         Parameters:
            saids (list): of Saider objects:
+           cache (dict): qb64 SAID to fully expanded credential of those already expanded
 
         Returns:
             list: fully hydrated credentials with full chains provided
 
         """
+        cache = cache if cache is not None else dict()
         creds = []
-        for saider in saids:
-            key = saider.qb64
-            creder, sadsigers, sadcigars = self.cloneCred(said=key)
+        with self.reading():
+            for saider in saids:
+                key = saider.qb64
+                if key in cache:
+                    creds.append(cache[key])
+                    continue
+
+                creder, sadsigers, sadcigars = self.cloneCred(said=key)
+                chains = self.cloneCreds([coring.Saider(qb64=said) for said in self.nodes(creder)], cache=cache)
+
+                regk = creder.status
+                status = self.tevers[regk].vcState(saider.qb64)
+                cred = dict(
+                    sad=creder.crd,
+                    pre=creder.issuer,
+                    sadsigers=[dict(
+                        path=pather.bext,
+                        pre=prefixer.qb64,
+                        sn=seqner.sn,
+                        d=saider.qb64
+                    ) for (pather, prefixer, seqner, saider, sigers) in sadsigers],
+                    sadcigars=[dict(path=pather.bext, cigar=cigar.qb64) for (pather, cigar) in sadcigars],
+                    chains=chains,
+                    status=status.ked,
+                )
+
+                cache[key] = cred
+                creds.append(cred)
+        return creds
+
+    def graph(self, saids):
+        """ Returns Creders of the credentials in saids and of all their chained credentials
 
-            chainSaids = []
-            for k, p in creder.crd["e"].items():
-                if k == "d":
+        Each credential in our database is listed once, after every credential it is chained
+        to, so the credentials can be replayed in order. Chained credentials not in our
+        database are left out. Read in one read transaction.
+
+        Parameters:
+            saids (Iterable): qb64 SAIDs of credentials
+
+        Returns:
+            list: Creder of each credential in replay order
+
+        """
+        creders = dict()  # qb64 SAID to Creder in replay order
+        with self.reading():
+            stack = [(said, None) for said in reversed(list(saids))]
+            while stack:
+                said, creder = stack.pop()
+                if said in creders:
                     continue
 
-                if not isinstance(p, dict):
+                if creder is not None:  # its chained credentials are already listed
+                    creders[said] = creder
                     continue
 
-                chainSaids.append(coring.Saider(qb64=p["n"]))
-            chains = self.cloneCreds(chainSaids)
-
-            regk = creder.status
-            status = self.tevers[regk].vcState(saider.qb64)
-            cred = dict(
-                sad=creder.crd,
-                pre=creder.issuer,
-                sadsigers=[dict(
-                    path=pather.bext,
-                    pre=prefixer.qb64,
-                    sn=seqner.sn,
-                    d=saider.qb64
-                ) for (pather, prefixer, seqner, saider, sigers) in sadsigers],
-                sadcigars=[dict(path=pather.bext, cigar=cigar.qb64) for (pather, cigar) in sadcigars],
-                chains=chains,
-                status=status.ked,
-            )
-
-            creds.append(cred)
-        return creds
+                if (creder := self.creds.get(keys=(said,))) is None:
+                    continue
+
+                stack.append((said, creder))
+                stack.extend((node, None) for node in reversed(self.nodes(creder)))
+
+        return list(creders.values())
+
+    @staticmethod
+    def nodes(creder):
+        """ Returns qb64 SAIDs of the credentials creder is chained to by its edges ('e')
+
+        Parameters:
+            creder (Creder): credential
+
+        """
+        edges = creder.crd["e"] if isinstance(creder.crd["e"], list) else [creder.crd["e"]]
+        return [node["n"] for edge in edges for label, node in edge.items()
+                if label not in ('d', 'o') and isinstance(node, dict)]
+
+    def exportIter(self, saids, db=None, sigs=True, tels=True, chains=True):
+        """ Iterator of CESR messages exporting the credentials in saids
+
+        Streams, for each credential and with chains each credential it is chained to, the KEL
+        of its issuer when db is provided, its registry TEL and its own TEL with tels and then
+        the credential itself with its CESR proof signatures with sigs. Chained credentials come
+        before the credentials chained to them and each KEL, TEL and credential is output once
+        however many credentials share it.
+
+        The messages of each credential are read in one read transaction of each database
+        and the transactions are released before they are yielded, so a consumer that is slow
+        or never exhausts the iterator does not hold the shared read transaction of another
+        reader in this process nor pin old pages of the database.
+
+        Parameters:
+            saids (Iterable): qb64 SAIDs of credentials to export
+            db (Baser): database of issuer KELs, None means do not export KELs
+            sigs (bool): True means attach signatures to credentials
+            tels (bool): True means export registry and credential TELs
+            chains (bool): True means export chained credentials
+
+        Returns:
+            iterator: (kind, key, msg) triples where kind is "kel", "tel" or "acdc", key is the
+                qb64 prefix or SAID msg is for and msg is a bytearray CESR message
+
+        """
+        with self.reading():
+            if chains:
+                creders = self.graph(saids)
+            else:
+                creders = [self.creds.get(keys=(said,)) for said in saids]
+
+        seen = set()  # qb64 prefixes of KELs and TELs already output
+        for creder in creders:
+            msgs = []
+            with self.reading(), (db.reading() if db is not None else contextlib.nullcontext()):
+                if db is not None and creder.issuer not in seen:
+                    seen.add(creder.issuer)
+                    msgs.extend(("kel", creder.issuer, msg) for msg in db.clonePreIter(pre=creder.issuer))
+
+                if tels:
+                    for pre in (creder.status, creder.said):
+                        if pre is not None and pre not in seen:
+                            seen.add(pre)
+                            msgs.extend(("tel", pre, msg) for msg in self.clonePreIter(pre=pre))
+
+                msg = bytearray(creder.raw)
+                if sigs:
+                    _, sadsigers, sadcigars = self.cloneCred(said=creder.said)
+                    if sadsigers or sadcigars:
+                        msg = signing.provision(creder, sadsigers=sadsigers, sadcigars=sadcigars, pipelined=True)
+                msgs.append(("acdc", creder.said, msg))
+
+            yield from msgs
 
     def logCred(self, creder, sadsigers=None, sadcigars=None):
         """ Save the base credential and seals (est evt+sigs quad) with no indices.
@@ -486,6 +735,8 @@ class Reger(dbing.LMDBer):
     def sources(self, db, creder):
         """ Returns raw bytes of any source ('e') credential that is in our database
 
+        Each chained credential is returned once, after the credentials it is chained to.
+
         Parameters:
             db (LMDBer): table to search
             creder (Creder): root credential
@@ -494,27 +745,7 @@ class Reger(dbing.LMDBer):
             list: credential sources as resolved from `e` in creder.crd
 
         """
-        chains = creder.crd["e"]
-        saids = []
-        for key, source in chains.items():
-            if key == 'd':
-                continue
-
-            if not isinstance(source, dict):
-                continue
-
-            saids.append(source['n'])
-
-        sources = []
-        for said in saids:
-            screder, sadsigers, sadcigars = self.cloneCred(said=said)
-
-            craw = signing.provision(serder=screder, sadsigers=sadsigers, sadcigars=sadcigars)
-            del craw[screder.size:]
-            sources.append((screder, craw))
-            sources.extend(self.sources(db, screder))
-
-        return sources
+        return [(screder, bytearray(screder.raw)) for screder in self.graph(self.nodes(creder))]
 
     def putTvt(self, key, val):
         """
@@ -239,3 +239,37 @@ def test_standalone_kli_commands(helpers, capsys):
                           '  "broken-chain-escrow": [],\n'
                           '  "missing-schema-escrow": []\n'
                           '}\n')
+
+
+def test_witness_bench(capsys):
+    parser = multicommand.create_parser(commands)
+    args = parser.parse_args(["witness", "bench", "--witnesses", "2", "--controllers", "2", "--events", "3",
+                              "--tcp", "5710", "--http", "5810"])
+    assert args.handler is not None
+    doers = args.handler(args)
+    bencher = doers[0]
+
+    directing.runController(doers=doers, expire=10.0)
+
+    report = bencher.report
+    assert report["witnesses"] == 2
+    assert report["controllers"] == 2
+    assert report["events"] == 6
+    assert report["throughput"] > 0
+    assert 0 < report["p50"] <= report["p99"]
+    assert report["backlog"] >= 0
+    assert '"throughput"' in capsys.readouterr().out
+
+
+def test_witness_bench_workers():
+    parser = multicommand.create_parser(commands)
+    args = parser.parse_args(["witness", "bench", "--witnesses", "2", "--controllers", "2", "--events", "3",
+                              "--tcp", "5720", "--http", "5820", "--workers", "2"])
+    doers = args.handler(args)
+    bencher = doers[0]
+    assert len(bencher.procs) == 2
+
+    directing.runController(doers=doers, expire=30.0)
+
+    assert bencher.report["events"] == 6
+    assert all(not proc.is_alive() for proc in bencher.procs)
@@ -0,0 +1,74 @@
+# -*- encoding: utf-8 -*-
+"""
+tests.app.admitting module
+
+"""
+from keri.app import admitting
+
+
+def test_bucket():
+    bucket = admitting.Bucket(rate=2.0, burst=3.0, tokens=3.0, stamp=0.0)
+    assert bucket.take(0.0)
+    assert bucket.take(0.0)
+    assert bucket.take(0.0)
+    assert not bucket.take(0.0)
+    assert bucket.wait() == 0.5
+
+    assert bucket.take(0.5)  # refilled one token
+    assert not bucket.take(0.5)
+
+    assert bucket.take(100.0)  # refill is capped at burst
+    assert bucket.tokens == 2.0
+
+
+def test_admitter():
+    admitter = admitting.Admitter(rate=1.0, burst=2.0, ipRate=10.0, ipBurst=3.0, backlogHigh=100,
+                                  backlogMax=200, streamMax=3, aidStreams=2)
+
+    # per AID limit
+    assert admitter.admit(ip="1.1.1.1", aid="A", now=0.0) == (True, 0.0)
+    assert admitter.admit(ip="1.1.1.1", aid="A", now=0.0) == (True, 0.0)
+    assert admitter.admit(ip="1.1.1.1", aid="A", now=0.0) == (False, 1.0)
+
+    # per IP limit applies across AIDs
+    assert admitter.admit(ip="1.1.1.1", aid="B", now=0.0) == (False, 0.1)
+    assert admitter.admit(ip="2.2.2.2", aid="B", now=0.0) == (True, 0.0)
+
+    # priority sources are not rate limited by AID but still by IP address
+    for _ in range(3):
+        assert admitter.admit(ip="5.5.5.5", aid="A", priority=True, now=0.0) == (True, 0.0)
+    assert admitter.admit(ip="5.5.5.5", aid="A", priority=True, now=0.0) == (False, 0.1)
+
+    # backlog sheds non priority requests first
+    assert admitter.admit(ip="3.3.3.3", backlog=150, now=0.0) == (False, 1.0)
+    assert admitter.shed(backlog=150)
+    assert admitter.admit(ip="3.3.3.3", priority=True, backlog=150, now=0.0) == (True, 0.0)
+    assert admitter.admit(ip="3.3.3.3", priority=True, backlog=250, now=0.0) == (False, 1.0)
+    assert admitter.ips["3.3.3.3"].tokens == 2.0  # only the admitted priority request took a token
+
+    # mailbox streams
+    assert admitter.open("A", now=0.0)
+    assert admitter.open("A", now=1.0)
+    assert not admitter.open("A", now=1.0)
+    assert admitter.open("B", now=2.0)
+    assert not admitter.open("C", now=2.0)  # total limit
+    admitter.close("A", stamp=1.0)
+    assert admitter.streams == {"A": [0.0], "B": [2.0]}
+    assert admitter.open("C", now=3.0)
+    admitter.close("C")
+    admitter.close("C")
+    assert admitter.streams == {"A": [0.0], "B": [2.0]}
+
+    # slots of streams never closed expire
+    assert admitter.open("C", now=3.0)
+    assert not admitter.open("D", now=3.0)
+    assert admitter.open("D", now=admitter.streamAge + 1.0)
+    assert admitter.streams == {"B": [2.0], "C": [3.0], "D": [admitter.streamAge + 1.0]}
+    admitter.close("A", stamp=0.0)  # already expired
+    assert len(admitter.streams) == 3
+
+    # full buckets are pruned once the table is full
+    admitter.MaxSources = 2
+    assert len(admitter.ips) == 4
+    assert admitter.admit(ip="4.4.4.4", now=100.0) == (True, 0.0)
+    assert list(admitter.ips.keys()) == ["4.4.4.4"]
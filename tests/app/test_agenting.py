@@ -49,6 +49,47 @@ def test_withness_receiptor(seeder):
         assert rctDoer.done is True
 
 
+def test_witness_receiptor_timeout(seeder):
+    with habbing.openHby(name="wan", salt=coring.Salter(raw=b'wann-the-witness').qb64) as wanHby, \
+            habbing.openHby(name="wes", salt=coring.Salter(raw=b'wess-the-witness').qb64) as wesHby, \
+            habbing.openHby(name="pal", salt=coring.Salter(raw=b'0123456789abcdef').qb64) as palHby:
+
+        wanDoers = indirecting.setupWitness(alias="wan", hby=wanHby, tcpPort=5632, httpPort=5642)
+        wesHab = wesHby.makeHab(name="wes", transferable=False)  # wes is down, never started
+
+        wanHab = wanHby.habByName(name="wan")
+        seeder.seedWitEnds(palHby.db, witHabs=[wanHab, wesHab], protocols=[kering.Schemes.tcp])
+
+        palHab = palHby.makeHab(name="pal", wits=[wanHab.pre, wesHab.pre], toad=1, transferable=True)
+        exHab = palHby.makeHab(name="ex", wits=[wanHab.pre, wesHab.pre], toad=2, transferable=True)
+        witDoer = agenting.WitnessReceiptor(hby=palHby, timeout=1.0)
+        witDoer.msgs.append(dict(pre=palHab.pre))
+        witDoer.msgs.append(dict(pre=exHab.pre))
+
+        limit = 5.0
+        tock = 0.03125
+        doist = doing.Doist(limit=limit, tock=tock, doers=wanDoers + [witDoer])
+        doist.enter()
+        tymer = tyming.Tymer(tymth=doist.tymen(), duration=doist.limit)
+
+        while not tymer.expired:
+            doist.recur()
+            if doist.tyme > tock and witDoer.idle:
+                break
+            time.sleep(doist.tock)
+
+        doist.exit()
+
+        # cued once the toad was met and gave up on wes after the timeout
+        assert witDoer.idle
+        assert witDoer.cues.popleft() == dict(pre=palHab.pre)
+
+        # toad of two never met so the timeout is cued as a failure
+        assert witDoer.cues.popleft() == dict(pre=exHab.pre, kin="timeout", wits=[wesHab.pre])
+        assert witDoer.unanswered == {(palHab.pre, 0): [wesHab.pre], (exHab.pre, 0): [wesHab.pre]}
+        assert set(witDoer.latencies) == {wanHab.pre}
+
+
 class ReceiptDoer(doing.DoDoer):
     """ Test scenario of witness receipts. """
 
@@ -108,6 +149,14 @@ class ReceiptDoer(doing.DoDoer):
                 break
             yield self.tock
 
+        while not witDoer.idle:
+            yield self.tock
+
+        # Both events cued as complete and receipt latency tracked for every witness
+        assert len(witDoer.cues) == 2
+        assert set(witDoer.latencies) == {self.wanHab.pre, self.wilHab.pre, self.wesHab.pre}
+        assert witDoer.eventers == []
+
         self.remove([witDoer])
         return True
 
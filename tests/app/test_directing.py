@@ -12,7 +12,8 @@ from hio.core.tcp import clienting, serving
 
 from keri import help  # logger support
 from keri.app import habbing, directing
-from keri.core import eventing, coring
+from keri.core import eventing, coring, parsing
+from keri.db import dbing
 from keri.demo import demoing
 
 
@@ -218,3 +219,141 @@ def test_runcontroller_demo():
 
 if __name__ == "__main__":
     test_directing_basic()
+
+
+def test_flow_server_doer():
+    """
+    Test FlowServerDoer bounded, fair and pausable receives
+    """
+    server = serving.Server(host="", port=6101)
+    serverDoer = directing.FlowServerDoer(server=server, budget=10000, rxMax=20000)
+    beta = clienting.Client(host="localhost", port=6101)
+    gamma = clienting.Client(host="localhost", port=6101)
+
+    paused = set()
+    serverDoer.paused = lambda ca: ca in paused
+
+    doist = doing.Doist(tock=0.03125, real=True, limit=1.0)
+    doist.doers = [serverDoer, clienting.ClientDoer(client=beta), clienting.ClientDoer(client=gamma)]
+    doist.enter()
+    while not (beta.connected and gamma.connected and len(server.ixes) == 2):
+        doist.recur()
+
+    betaCa = beta.cs.getsockname()
+    gammaCa = gamma.cs.getsockname()
+    betaIx = server.ixes[betaCa]
+    gammaIx = server.ixes[gammaCa]
+
+    paused.add(gammaCa)
+    beta.tx(b"b" * 65536)
+    gamma.tx(b"g" * 65536)
+
+    # reads are bounded by budget per run and stop at rxMax, both to within one socket read
+    for _ in range(32):
+        before = len(betaIx.rxbs)
+        doist.recur()
+        assert len(betaIx.rxbs) - before < serverDoer.budget + betaIx.bs
+    assert serverDoer.rxMax <= len(betaIx.rxbs) < serverDoer.rxMax + betaIx.bs
+    assert len(gammaIx.rxbs) == 0  # paused connection is not read
+
+    # consuming the buffer and unpausing resumes reading
+    del betaIx.rxbs[:]
+    paused.clear()
+    for _ in range(32):
+        doist.recur()
+    assert serverDoer.rxMax <= len(betaIx.rxbs) < serverDoer.rxMax + betaIx.bs
+    assert serverDoer.rxMax <= len(gammaIx.rxbs) < serverDoer.rxMax + gammaIx.bs
+
+    doist.exit()
+    beta.close()
+    gamma.close()
+    server.close()
+
+
+def test_reuse_port_server():
+    """
+    Test ReusePortServer lets several servers, as in worker processes, listen on one port
+    """
+    alpha = directing.ReusePortServer(host="", port=6103)
+    beta = directing.ReusePortServer(host="", port=6103)
+    assert alpha.reopen()
+    assert beta.reopen()
+    assert alpha.ha[1] == beta.ha[1] == 6103
+
+    plain = serving.Server(host="", port=6103)  # listener without SO_REUSEPORT is refused
+    assert not plain.reopen()
+
+    client = clienting.Client(host="localhost", port=6103)
+    doist = doing.Doist(tock=0.03125, real=True, limit=1.0)
+    doist.doers = [serving.ServerDoer(server=alpha), serving.ServerDoer(server=beta),
+                   clienting.ClientDoer(client=client)]
+    doist.enter()
+    while not (client.connected and len(alpha.ixes) + len(beta.ixes) == 1):
+        doist.recur()
+
+    doist.exit()
+    client.close()
+    alpha.close()
+    beta.close()
+
+
+def test_directant_paused():
+    """
+    Test Directant watermarks used to pause reading
+    """
+    with habbing.openHby(name="wit", base="test") as hby:
+        hab = hby.makeHab(name="wit", transferable=False)
+        server = serving.Server(host="", port=6102)
+        directant = directing.Directant(hab=hab, server=server, cueHigh=2, escrowHigh=1)
+
+        ca = ("127.0.0.1", 50000)
+        assert not directant.paused(ca)
+        assert directant.escrowed() == 0
+
+        class Rant:
+            kevery = eventing.Kevery(db=hab.db)
+
+        directant.rants[ca] = Rant()
+        Rant.kevery.cues.extend([dict(kin="receipt")] * 3)
+        assert directant.paused(ca)
+        Rant.kevery.cues.clear()
+        assert not directant.paused(ca)
+
+        # only the connection whose sources fill the event escrows pauses once over the high watermark
+        with habbing.openHby(name="ctl", base="test") as ctlHby:
+            ctlHab = ctlHby.makeHab(name="ctl", transferable=True)
+            ctlHab.interact()
+            ixn = ctlHab.interact()
+
+            class Other:
+                kevery = eventing.Kevery(db=hab.db)
+
+            other = ("127.0.0.1", 50001)
+            directant.rants[other] = Other()
+            parsing.Parser().parse(ims=bytearray(ixn), kvy=Rant.kevery)  # out of order so escrowed
+            parsing.Parser().parse(ims=bytearray(ctlHab.makeOwnEvent(sn=0)), kvy=Other.kevery)
+            assert Rant.kevery.sources == Other.kevery.sources == {ctlHab.pre}
+
+            directant.weigh()
+            assert directant.backlog == 1
+            assert directant.loads == dict()
+            assert not directant.paused(ca)
+
+            directant.escrowHigh = 0
+            directant.weigh()
+            assert directant.loads == {ca: 1, other: 1}
+            assert directant.paused(ca) and directant.paused(other)
+
+            hab.db.delOoes(dbing.snKey(ctlHab.pre, 2))
+            directant.weigh()
+            assert directant.backlog == 0
+            assert directant.loads == dict()
+            assert directant.load(Rant.kevery) == 0
+            assert Rant.kevery.sources == set()  # sources without escrowed entries are forgotten
+            assert not directant.paused(ca) and not directant.paused(other)
+
+        # reactants of a worker sharing the database validate key events under the shared lock
+        directant = directing.Directant(hab=hab, server=server, shared=True)
+        rant = directing.Reactant(hab=hab, remoter=clienting.Client(host="127.0.0.1", port=6102),
+                                  shared=directant.shared)
+        assert rant.kevery.shared
@@ -6,6 +6,8 @@ tests.app.forwarding module
 """
 
 import time
+from collections import deque
+from types import SimpleNamespace
 
 from hio.base import doing, tyming
 
@@ -48,6 +50,10 @@ def test_postman(seeder):
         atc = hab.endorse(exn)
         del atc[:exn.size]
         pman.send(src=hab.pre, dest=recpHab.pre, topic="echo", serder=exn, attachment=atc)
+        exn = exchanging.exchange(route="/echo", payload=dict(msg="again"))
+        atc = hab.endorse(exn)
+        del atc[:exn.size]
+        pman.send(src=hab.pre, dest=recpHab.pre, topic="echo", serder=exn, attachment=atc)
 
         doers = wesDoers + [pman]
         limit = 1.0
@@ -69,11 +75,91 @@ def test_postman(seeder):
         for _, topic, msg in mbx.cloneTopicIter(topic=recpHab.pre + "/echo", fn=0):
             msgs.append(msg)
 
-        assert len(msgs) == 1
+        assert len(msgs) == 2
         serder = coring.Serder(raw=msgs[0])
         assert serder.ked["t"] == coring.Ilks.exn
         assert serder.ked["r"] == "/echo"
         assert serder.ked["a"] == dict(msg="test")
+        serder = coring.Serder(raw=msgs[1])
+        assert serder.ked["a"] == dict(msg="again")
+
+        # Both messages went to the same witness in one batch and were cued as delivered
+        assert [cue["said"] for cue in pman.cues] == [coring.Serder(raw=msg).said for msg in msgs]
+        assert pman.inflight == {}
+        assert pman.witers == {}
+
+        # Sender's KEL only introduced to the witness once per key state
+        key = (hab.pre, wesHab.pre)
+        assert pman.known == {key: hab.kever.serder.said}
+        assert pman.pending == {}
+        assert pman.introduce(hab, wesHab.pre) == bytearray()
+        hab.interact()
+        assert pman.introduce(hab, wesHab.pre) != bytearray()
+        assert pman.introduce(hab, wesHab.pre) == bytearray()  # already on a batch in flight
+
+        # a refused batch is cued but does not make its introduction known so the next batch introduces again
+        witer = SimpleNamespace(sent=[SimpleNamespace(status=500)], idle=True, msgs=[])
+        pman.witers[key] = witer
+        pman.inflight[key] = deque([(hab.kever.serder.said, [dict(said="Eabc")])])
+        pman.remove = lambda doers: None
+        pman.acknowledge(key, witer)
+        assert pman.cues[-1] == dict(said="Eabc")
+        assert pman.known[key] != hab.kever.serder.said
+        assert pman.pending == {}
+        assert pman.introduce(hab, wesHab.pre) != bytearray()
+
+
+class PipelinedWitnesser:
+    """ Witnesser stand in whose responses are added by the test """
+
+    def __init__(self):
+        self.msgs = deque()
+        self.sent = deque()
+        self.posted = 0
+
+    def post(self):
+        self.msgs.popleft()
+        self.posted += 1
+
+    @property
+    def idle(self):
+        return self.posted == len(self.sent)
+
+
+def test_postman_pipelined_batches():
+    with habbing.openHab(name="test", transferable=True, temp=True) as (hby, hab):
+        pman = forwarding.Postman(hby=hby)
+        pman.remove = lambda doers: None
+        key = (hab.pre, "Bwit")
+        witer = PipelinedWitnesser()
+        pman.witers[key] = witer
+        pman.inflight[key] = deque()
+        pman.acked[key] = 0
+
+        # two batches to the same witness, the second pipelined behind the first
+        for said in ("Eone", "Etwo"):
+            witer.msgs.append(bytearray())
+            pman.inflight[key].append((None, [dict(said=said)]))
+
+        witer.post()
+        pman.acknowledge(key, witer)  # first batch posted but not answered yet
+        assert len(pman.cues) == 0
+
+        witer.sent.append(SimpleNamespace(status=204))
+        pman.acknowledge(key, witer)
+        assert [cue["said"] for cue in pman.cues] == ["Eone"]
+        assert pman.witers == {key: witer}
+
+        witer.post()
+        pman.acknowledge(key, witer)  # second batch posted, witer busy again
+        assert len(pman.cues) == 1
+
+        witer.sent.append(SimpleNamespace(status=204))
+        pman.acknowledge(key, witer)
+        assert [cue["said"] for cue in pman.cues] == ["Eone", "Etwo"]
+        assert pman.witers == {}
+        assert pman.inflight == {}
+        assert pman.acked == {}
 
 
 def test_forward_handler():
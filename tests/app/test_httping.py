@@ -8,7 +8,10 @@ import falcon
 import pytest
 from falcon.testing import helpers
 
-from keri.app import habbing, httping
+from collections import deque
+from types import SimpleNamespace
+
+from keri.app import agenting, habbing, httping
 from keri.core import coring
 from keri.vdr import credentialing, verifying
 
@@ -194,5 +197,109 @@ def test_stream_cesr_request(mockHelpingNowUTC):
                                               b'EMeS0Jtlu-jargBw')
 
 
+def test_bulk_cesr_request(mockHelpingNowUTC):
+    with habbing.openHab(name="test", transferable=True, temp=True) as (hby, hab):
+        msgs = bytearray(hab.makeOwnEvent(sn=0))
+        msgs.extend(hab.interact())
+        msgs.extend(hab.interact())
+        size = len(msgs)
+
+        client = MockClient()
+        assert httping.bulkCESRRequest(client, msgs, path="/") == 1
+        assert len(msgs) == 0  # stream consumed
+        assert len(client.args) == 1
+
+        args = client.args.pop()
+        assert args["method"] == "POST"
+        assert args["path"] == "/"
+        assert len(args["body"]) == size
+        headers = args["headers"]
+        assert headers["Content-Type"] == httping.CESR_BULK_CONTENT_TYPE
+        assert headers["Content-Length"] == size
+
+        # the same stream split per message posts one request per message
+        msgs = bytearray(args["body"])
+        client = MockClient()
+        assert httping.streamCESRRequests(client, msgs) == 3
+        assert len(b"".join(bytes(arg["body"]) + bytes(arg["headers"]["CESR-ATTACHMENT"])
+                            for arg in client.args)) == size
+
+        # body is read into the parser buffer in one piece
+        rxbs = bytearray()
+        req = helpers.create_req(headers=dict(Content_Type=httping.CESR_BULK_CONTENT_TYPE), body=args["body"])
+        assert httping.readCesrHttpStream(req, rxbs, size=64) == size
+        assert rxbs == args["body"]
+
+        req = helpers.create_req(headers=dict(Content_Type=httping.CESR_BULK_CONTENT_TYPE), body=b"-AAB")
+        with pytest.raises(falcon.HTTPError):
+            httping.readCesrHttpStream(req, rxbs)
+
+        req = helpers.create_req(headers=dict(Content_Type=httping.CESR_CONTENT_TYPE), body=args["body"])
+        with pytest.raises(falcon.HTTPError):
+            httping.readCesrHttpStream(req, rxbs)
+
+        # bodies over the limit are refused with 413 without being buffered
+        rxbs = bytearray()
+        req = helpers.create_req(headers=dict(Content_Type=httping.CESR_BULK_CONTENT_TYPE), body=args["body"])
+        with pytest.raises(falcon.HTTPPayloadTooLarge):
+            httping.readCesrHttpStream(req, rxbs, size=64, limit=size - 1)
+        assert rxbs == bytearray()
+
+        # witnesses that refuse the bulk content type get the stream again one request per message
+        witer = agenting.HttpWitnesser(hab=hab, wit="BGKVzj4ve0VSd8z_AmvhLg4lqcC_9WYX90k03q-R_Ydo",
+                                       url="http://127.0.0.1:5999")
+        witer.client = MockClient()
+        witer.post(bytearray(args["body"]))
+        assert witer.posted == 1
+        assert witer.client.args[0]["headers"]["Content-Type"] == httping.CESR_BULK_CONTENT_TYPE
+
+        witer.respond(SimpleNamespace(status=415))
+        assert witer.bulk is False
+        assert witer.sent == deque()
+        assert witer.posted == 3
+        assert [arg["headers"]["Content-Type"] for arg in witer.client.args[1:]] == [httping.CESR_CONTENT_TYPE] * 3
+
+        for _ in range(3):
+            witer.respond(SimpleNamespace(status=204))
+        assert witer.idle
+
+        # a failing request for one message is retried and only then recorded with its failure
+        icp = httping.splitCESRStream(bytearray(args["body"]), limit=0)[0]
+        witer.post(bytearray(icp))
+        assert witer.posted == 4
+        for _ in range(witer.Retries):
+            witer.respond(SimpleNamespace(status=503))
+            assert not witer.idle
+        assert len(witer.client.args) == 5 + witer.Retries
+        witer.respond(SimpleNamespace(status=503))
+        assert witer.idle
+        assert witer.sent[-1].status == 503
+
+        # bulk requests too large or failing are resent one request per message without dropping bulk
+        witer = agenting.HttpWitnesser(hab=hab, wit="BGKVzj4ve0VSd8z_AmvhLg4lqcC_9WYX90k03q-R_Ydo",
+                                       url="http://127.0.0.1:5999")
+        witer.client = MockClient()
+        witer.post(bytearray(args["body"]))
+        witer.respond(SimpleNamespace(status=413))
+        assert witer.bulk is True
+        assert witer.sent == deque()
+        assert witer.posted == 3
+        for _ in range(3):
+            witer.respond(SimpleNamespace(status=200))
+        assert witer.idle
+
+        # streams longer than the limit are split over several requests on message boundaries
+        msgs = bytearray(args["body"])
+        client = MockClient()
+        assert httping.bulkCESRRequest(client, msgs, limit=2 * size // 3) == 2
+        assert b"".join(arg["body"] for arg in client.args) == args["body"]
+        for arg in client.args:
+            assert coring.Serder(raw=bytearray(arg["body"])).size > 0
+            assert arg["headers"]["Content-Length"] <= 2 * size // 3
+        bodies = httping.splitCESRStream(bytearray(args["body"]), limit=0)
+        assert len(bodies) == 3
+        assert b"".join(bodies) == args["body"]
+
+
 if __name__ == '__main__':
     test_parse_cesr_request()
@@ -5,10 +5,12 @@ tests.app.indirecting module
 """
 import json
 
+import falcon
 import pytest
+from falcon import testing
 from hio.help import decking
 
-from keri.app import indirecting, storing, habbing
+from keri.app import admitting, indirecting, storing, habbing, httping
 from keri.core import coring
 
 
@@ -116,3 +118,189 @@ def test_qrymailbox_iter():
         mb.iter.TimeoutMBX = 0  # Force the iter to timeout
         with pytest.raises(StopIteration):
             next(mbi)
+
+
+def test_mailbox_iter_subscription():
+    pre = "E83mbE6upuYnFlx68GmLYCQd7cCcwG_AtHM6dW_GT068"
+    mbx = storing.Mailboxer(temp=True)
+    msg = dict(i=pre, t="rct")
+
+    # Messages stored before the stream opens are picked up on first scan
+    mbx.storeMsg(topic=f"{pre}/receipt", msg=json.dumps(msg).encode("utf-8"))
+
+    mb = indirecting.MailboxIterable(mbx=mbx, pre=pre, topics={"/receipt": 0, "/multisig": 0}, retry=1000)
+    mbi = iter(mb)
+    assert mb.pending == {"/receipt", "/multisig"}
+    assert mb in mbx.subs[f"{pre}/receipt".encode("utf-8")]
+    assert mb in mbx.subs[f"{pre}/multisig".encode("utf-8")]
+
+    val = next(mbi)
+    assert val == b'retry: 1000\n\n'
+
+    val = next(mbi)
+    assert val.startswith(b'id: 0\nevent: /receipt\n')
+    assert mb.pending == set()
+
+    # Idle stream does not scan
+    val = next(mbi)
+    assert val == b''
+
+    # Only the topic that received a message is woken
+    mbx.storeMsg(topic=f"{pre}/multisig", msg=json.dumps(msg).encode("utf-8"))
+    assert mb.pending == {"/multisig"}
+    mbx.storeMsg(topic=f"{pre}/replay", msg=json.dumps(msg).encode("utf-8"))
+    assert mb.pending == {"/multisig"}
+
+    val = next(mbi)
+    assert val.startswith(b'id: 0\nevent: /multisig\n')
+    assert mb.topics == {"/receipt": 1, "/multisig": 1}
+
+    # Closing the stream removes the subscriptions
+    mb.close()
+    assert mbx.subs == {}
+
+    mbx.storeMsg(topic=f"{pre}/receipt", msg=json.dumps(msg).encode("utf-8"))
+    assert mb.pending == set()
+
+
+def test_mailbox_iter_shared():
+    pre = "E83mbE6upuYnFlx68GmLYCQd7cCcwG_AtHM6dW_GT068"
+    mbx = storing.Mailboxer(temp=True, shared=True)
+    msg = dict(i=pre, t="rct")
+
+    mb = indirecting.MailboxIterable(mbx=mbx, pre=pre, topics={"/receipt": 0, "/multisig": 0}, retry=1000)
+    mbi = iter(mb)
+    assert next(mbi) == b'retry: 1000\n\n'
+    assert next(mbi) == b''
+    assert mbx.lockDepth == 0
+
+    scans = []
+    clone = mbx.cloneTopicIter
+    mbx.cloneTopicIter = lambda topic, fn=0: scans.append(topic) or clone(topic, fn)
+
+    # A message stored by another worker process does not notify this stream
+    subs, mbx.subs = mbx.subs, dict()
+    mbx.storeMsg(topic=f"{pre}/receipt", msg=json.dumps(msg).encode("utf-8"))
+    mbx.subs = subs
+    assert mb.pending == set()
+
+    assert mbx.count(f"{pre}/receipt") == 1
+    assert mbx.count(f"{pre}/multisig") == 0
+
+    # but the change in mailbox version wakes the topics whose count changed
+    val = next(mbi)
+    assert val.startswith(b'id: 0\nevent: /receipt\n')
+    assert scans == [f"{pre}/receipt"]
+    assert next(mbi) == b''
+    assert scans == [f"{pre}/receipt"]
+
+    # a write to a topic of another stream does not rescan this one
+    mbx.storeMsg(topic=f"{pre}/replay", msg=json.dumps(msg).encode("utf-8"))
+    assert next(mbi) == b''
+    assert scans == [f"{pre}/receipt"]
+
+    mb.close()
+    mbx.close(clear=True)
+
+
+def test_http_end_bulk():
+    with habbing.openHab(name="test", transferable=True, temp=True) as (hby, hab):
+        msgs = bytearray(hab.makeOwnEvent(sn=0))
+        msgs.extend(hab.interact())
+
+        rxbs = bytearray()
+        app = falcon.App()
+        app.add_route("/", indirecting.HttpEnd(rxbs=rxbs))
+        client = testing.TestClient(app)
+
+        rep = client.simulate_post("/", body=bytes(msgs),
+                                   headers={"Content-Type": httping.CESR_BULK_CONTENT_TYPE})
+        assert rep.status == falcon.HTTP_204
+        assert rxbs == msgs
+
+
+def test_http_end_admission():
+    with habbing.openHby(name="test", temp=True) as hby:
+        wit = hby.makeHab(name="wit", transferable=False)
+        ctl = hby.makeHab(name="ctl", wits=[wit.pre], toad=1)
+        other = hby.makeHab(name="other")
+
+        rxbs = bytearray()
+        admitter = admitting.Admitter(rate=1.0, burst=1.0, backlogHigh=4096, backlogMax=65536, streamMax=1)
+        end = indirecting.HttpEnd(rxbs=rxbs, hab=wit, admitter=admitter)
+        app = falcon.App()
+        app.add_route("/", end)
+        client = testing.TestClient(app)
+        headers = {"Content-Type": httping.CESR_BULK_CONTENT_TYPE}
+
+        icp = other.makeOwnEvent(sn=0)
+        rep = client.simulate_post("/", body=bytes(icp), headers=headers)
+        assert rep.status == falcon.HTTP_204
+        rep = client.simulate_post("/", body=bytes(icp), headers=headers)
+        assert rep.status == falcon.HTTP_429
+        assert rep.headers["Retry-After"] == "1"
+        assert rxbs == icp
+
+        # events of controllers witnessed by wit are not rate limited
+        msgs = bytearray(ctl.makeOwnEvent(sn=0))
+        assert end.priority(coring.Serder(raw=bytes(msgs)))
+        for _ in range(3):
+            rep = client.simulate_post("/", body=bytes(msgs), headers=headers)
+            assert rep.status == falcon.HTTP_204
+        assert end.priority(coring.Serder(raw=bytes(ctl.interact())))
+        assert not end.priority(coring.Serder(raw=bytes(other.interact())))
+
+        # a large backlog sheds other requests before priority ones
+        rxbs.extend(bytes(8192))
+        rep = client.simulate_post("/", body=bytes(other.makeOwnEvent(sn=0)), headers=headers,
+                                   remote_addr="10.0.0.1")
+        assert rep.status == falcon.HTTP_503
+        rep = client.simulate_post("/", body=bytes(msgs), headers=headers)
+        assert rep.status == falcon.HTTP_204
+
+        # each message of a bulk request takes a token
+        rxbs.clear()
+        other.rotate()
+        msgs = bytearray(other.makeOwnEvent(sn=1))
+        msgs.extend(other.interact())
+        assert len(list(end.messages(msgs))) == 2
+        admitter.aids.clear()  # one token for the first message but none for the second
+        rep = client.simulate_post("/", body=bytes(msgs), headers=headers, remote_addr="10.0.0.2")
+        assert rep.status == falcon.HTTP_429
+        assert rxbs == bytearray()
+
+        # mailbox stream slots are released when the stream closes
+        assert admitter.open(ctl.pre)
+        assert not admitter.open(other.pre)
+        stream = indirecting.QryRpyMailboxIterable(cues=decking.Deck(), mbx=None, said="", admitter=admitter,
+                                                   aid=ctl.pre)
+        stream.close()
+        assert admitter.streams == {}
+
+        # queries refused a mailbox stream are not queued
+        qry = bytearray(ctl.query(pre=ctl.pre, src=wit.pre, route="/mbx"))
+        serder = coring.Serder(raw=bytes(qry))
+        qheaders = {"Content-Type": httping.CESR_CONTENT_TYPE,
+                    httping.CESR_ATTACHMENT_HEADER: bytes(qry[serder.size:]).decode("utf-8")}
+        admitter.admit = lambda **kwa: (True, 0.0)
+        assert admitter.open(other.pre)
+        rep = client.simulate_post("/", body=serder.raw, headers=qheaders)
+        assert rep.status == falcon.HTTP_503
+        assert rxbs == bytearray()
+
+        # slots are released when no reply to the query arrives and when the stream is dropped
+        admitter.streams.clear()
+        assert admitter.open(ctl.pre, now=1.0)
+        stream = indirecting.QryRpyMailboxIterable(cues=decking.Deck(), mbx=None, said="", timeout=0.0,
+                                                   admitter=admitter, aid=ctl.pre, stamp=1.0)
+        with pytest.raises(StopIteration):
+            next(stream)
+            next(stream)
+        assert admitter.streams == {}
+
+        assert admitter.open(ctl.pre, now=2.0)
+        stream = indirecting.QryRpyMailboxIterable(cues=decking.Deck(), mbx=None, said="", admitter=admitter,
+                                                   aid=ctl.pre, stamp=2.0)
+        assert next(stream) == b''
+        del stream
+        assert admitter.streams == {}
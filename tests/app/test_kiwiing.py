@@ -136,6 +136,19 @@ def test_credential_handlers(mockHelpingNowUTC, seeder):
         state = result.json[0]["status"]
         assert state["et"] == coring.Ilks.rev
 
+        # filtered and paged listings
+        result = client.simulate_get(path="/credentials/test", params=dict(type="issued", status="revoked",
+                                                                            schema=schema))
+        assert [cred["sad"]["d"] for cred in result.json] == [creder.said]
+        result = client.simulate_get(path="/credentials/test", params=dict(type="issued", status="issued"))
+        assert result.json == []
+        result = client.simulate_get(path="/credentials/test", params=dict(type="issued", after=creder.said))
+        assert result.json == []
+        result = client.simulate_get(path="/credentials/test", params=dict(type="issued", limit=0))
+        assert result.json == []
+        result = client.simulate_get(path="/credentials/test", params=dict(type="issued", offset=-1))
+        assert result.status == falcon.HTTP_400
+
 
 def test_multisig_incept():
     prefix = "ends_test"
@@ -1046,6 +1059,27 @@ def test_keystate_end():
         assert len(kel) == 1
 
 
+def test_presentation_verify_end():
+    with habbing.openHab(name="test", transferable=True, temp=True) as (hby, hab):
+        regery = credentialing.Regery(hby=hby, name="test", temp=True)
+        verifier = verifying.Verifier(hby=hby, reger=regery.reger)
+
+        app = falcon.App()
+        presentationEnd = kiwiing.PresentationEnd(rep=None, verifier=verifier)
+        app.add_route("/presentation/verify", presentationEnd, suffix="verify")
+        client = testing.TestClient(app)
+
+        result = client.simulate_post(path="/presentation/verify", body=json.dumps(dict()).encode("utf-8"))
+        assert result.status == falcon.HTTP_400
+
+        said = "EHfB6aCydzucwhKwN6Yr4zUxNSm4Ahefp17jIuquYIwc"
+        presentation = dict(presentation_submission=dict(descriptor_map=[]), verifiableCredential=[said])
+        body = json.dumps(dict(presentations=[presentation])).encode("utf-8")
+        result = client.simulate_post(path="/presentation/verify", body=body)
+        assert result.status == falcon.HTTP_200
+        assert result.json == {said: f"credential {said} not verified"}
+
+
 def test_schema_ends():
     with habbing.openHby(name="test", salt=coring.Salter(raw=b'0123456789abcdef').qb64) as hby:
         app = falcon.App()
@@ -3,6 +3,7 @@
 tests.peer.mailboxing
 
 """
+import datetime
 import os
 
 import lmdb
@@ -11,7 +12,8 @@ from keri.app import keeping
 from keri.core import coring
 from keri.db import dbing, basing
 from keri.peer import exchanging
-from keri.app.storing import Mailboxer
+from keri.app.storing import Mailboxer, RetentionPolicy
+from keri.help import helping
 
 
 def test_mailboxing():
@@ -108,6 +110,63 @@ def test_mailboxing():
         assert(len(msgs)) == 6
 
 
+def test_mailbox_retention():
+    """
+    Test Mailboxer retention policies and compaction
+    """
+    pre = "E4D919wF4oiG7ck6mnBWTRD_Z-Io0wZKCxL0zjx5je9I"
+    other = "EpDA1n-WiBA0A8YOqnKrB-wWQYYC49i5zY_qrIZIicQg"
+
+    with dbing.openLMDB(cls=Mailboxer) as mber:
+        for idx in range(10):
+            exn = exchanging.exchange("/credential/issue", payload=dict(a="b", b=idx),
+                                      date="2021-07-15T13:01:37.624492+00:00")
+            mber.storeMsg(topic=f"{pre}/receipt", msg=exn.raw)
+            mber.storeMsg(topic=f"{pre}/challenge", msg=exn.raw)
+        mber.storeMsg(topic=f"{other}/receipt", msg=b"other")
+
+        stats = mber.stats()
+        assert stats[pre]["topics"] == 2
+        assert stats[pre]["msgs"] == 20
+        assert stats[other] == dict(topics=1, msgs=1, size=5)
+
+        # No matching policy removes nothing
+        assert mber.compact([RetentionPolicy(topic="/multisig", count=1)]) == 0
+
+        # Count policy on /receipt only, in bounded batches
+        policies = [RetentionPolicy(topic="/receipt", count=4)]
+        assert mber.compact(policies, limit=4) == 4
+        assert mber.compact(policies, limit=4) == 2
+        assert mber.compact(policies, limit=4) == 0
+        fns = [fn for fn, _, _ in mber.cloneTopicIter(f"{pre}/receipt")]
+        assert fns == [6, 7, 8, 9]
+        assert len(mber.getTopicMsgs(f"{pre}/challenge")) == 10
+
+        # Messages shared with /challenge are still retrievable
+        assert [fn for fn, _, _ in mber.cloneTopicIter(f"{pre}/challenge")] == list(range(10))
+
+        # Acknowledged entries are removed but the last entry is always retained
+        mber.ackTopic(f"{pre}/challenge", 3)
+        mber.ackTopic(f"{pre}/challenge", 2)  # does not move backwards
+        assert mber.acks.get(keys=f"{pre}/challenge") == "3"
+        assert mber.compact([RetentionPolicy(acked=True)]) == 3
+        assert [fn for fn, _, _ in mber.cloneTopicIter(f"{pre}/challenge")] == list(range(3, 10))
+
+        # Shared message bodies are deleted when their last reference goes
+        assert mber.compact([RetentionPolicy(topic="/challenge", count=0)]) == 6
+        assert mber.stats()[pre]["msgs"] == 5
+        assert len(list(mber.msgs.getItemIter())) == 5
+
+        # Age based expiry
+        assert mber.compact([RetentionPolicy(age=60.0)]) == 0
+        later = helping.nowUTC() + datetime.timedelta(seconds=120)
+        assert mber.compact([RetentionPolicy(age=60.0)], now=later) == 3
+        assert [fn for fn, _, _ in mber.cloneTopicIter(f"{pre}/receipt")] == [9]
+
+        # Appends continue from the retained ordinal
+        mber.storeMsg(topic=f"{pre}/receipt", msg=b"new")
+        assert [fn for fn, _, _ in mber.cloneTopicIter(f"{pre}/receipt")] == [9, 10]
+
 
 if __name__ == '__main__':
     test_mailboxing()
@@ -292,6 +292,7 @@ def test_pathed_material(mockHelpingNowUTC):
         parser = parsing.Parser(exc=exc)
 
         parser.parseOne(ims=fwd)
+        exc.processQueues()
         assert len(handler.msgs) == 1
         msg = handler.msgs.popleft()
 
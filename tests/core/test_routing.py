@@ -0,0 +1,74 @@
+# -*- encoding: utf-8 -*-
+"""
+tests.core.test_routing module
+
+"""
+import pytest
+
+from keri import kering
+from keri.core import eventing, routing
+
+
+class Resource:
+    def __init__(self):
+        self.calls = []
+
+    def processReply(self, *, serder, saider, route, cigars=None, tsgs=None, **kwargs):
+        self.calls.append(("default", route, kwargs))
+
+    def processReplyEndRole(self, *, serder, saider, route, cigars=None, tsgs=None, **kwargs):
+        self.calls.append(("EndRole", route, kwargs))
+
+    def processReplyFixed(self, *, serder, saider, route, cigars=None, tsgs=None, **kwargs):
+        self.calls.append(("Fixed", route, kwargs))
+
+    def processReplySeq(self, *, serder, saider, route, cigars=None, tsgs=None, **kwargs):
+        self.calls.append(("Seq", route, kwargs))
+
+
+def test_router():
+    resource = Resource()
+    rtr = routing.Router()
+    rtr.addRoute("/end/role/{action}", resource, suffix="EndRole")
+    rtr.addRoute("/ksn/fixed", resource, suffix="Fixed")
+    rtr.addRoute("/ksn/{aid}/{sn:hex}", resource, suffix="Seq")
+    rtr.addRoute("/ksn/{aid}", resource)
+    rtr.addRoute("/ksn/{aid}/", resource, suffix="Fixed")  # same template as above so first one is kept
+
+    def dispatch(r):
+        rtr.dispatch(serder=eventing.reply(route=r, data=dict()), saider=None, cigars=None, tsgs=None)
+        return resource.calls.pop()
+
+    assert dispatch("/end/role/add") == ("EndRole", "/end/role/add", dict(action="add"))
+    assert dispatch("/END/Role/cut") == ("EndRole", "/END/Role/cut", dict(action="cut"))  # literals ignore case
+    assert dispatch("/ksn/fixed") == ("Fixed", "/ksn/fixed", dict())  # literal before parameter
+    assert dispatch("/ksn/Eabc") == ("default", "/ksn/Eabc", dict(aid="Eabc"))
+    assert dispatch("/ksn/Eabc/1f") == ("Seq", "/ksn/Eabc/1f", dict(aid="Eabc", sn=31))
+
+    for r in ("/ksn/Eabc/xyz", "/ksn", "/ksn/", "/end/role/add/more", "ksn/Eabc"):
+        with pytest.raises(kering.ValidationError):
+            dispatch(r)
+
+    assert rtr.stats == {"/end/role/{action}": 2, "/ksn/fixed": 1, "/ksn/{aid}": 1, "/ksn/{aid}/{sn:hex}": 1}
+    assert rtr.misses == 5
+
+    # trie and linear search agree on untyped routes
+    for r in ("/end/role/add", "/ksn/Eabc", "/ksn/fixed"):
+        route, _ = rtr._scan(r)
+        assert rtr._find(r)[0].template == route.template
+
+    with pytest.raises(kering.ConfigurationError):
+        rtr.addRoute("/tsn/{aid}/{sn:float}", resource)
+
+    # preregistered routes without a template are searched linearly
+    fields, regex = routing.compile_uri_template("/loc/{scheme}")
+    rtr = routing.Router(routes=[routing.Route(regex=regex, fields=fields, resource=resource)])
+    assert dispatch("/loc/http") == ("default", "/loc/http", dict(scheme="http"))
+    assert rtr.stats == {None: 1}
+
+    assert routing.decimal("12") == 12
+    assert routing.hexadecimal("a") == 10
+    with pytest.raises(ValueError):
+        routing.decimal("-1")
+    with pytest.raises(ValueError):
+        routing.hexadecimal("")
@@ -8,7 +8,7 @@ import json
 import pytest
 
 from keri.core.coring import MtrDex
-from keri.core.scheming import Schemer, JSONSchema, CacheResolver
+from keri.core.scheming import Schemer, JSONSchema, CacheResolver, ValidatorCache
 from keri.db import basing
 from keri.kering import ValidationError
 
@@ -211,6 +211,51 @@ def test_resolution():
             schemer.verify(badload)
 
 
+def test_validator_cache():
+    ref = (b'{'
+           b'   "$id": "Evcu66xr3s_x1k4IjwoQ3ZKEbfkdVLxLr7PW-67nYX4I", '
+           b'   "$schema": "http://json-schema.org/draft-07/schema#", '
+           b'   "type": "object", '
+           b'   "properties": {'
+           b'      "z": {"type": "number"}'
+           b'    }'
+           b'}')
+
+    sed = dict(type="object", properties=dict(xy={"$ref": "did:keri:Evcu66xr3s_x1k4IjwoQ3ZKEbfkdVLxLr7PW-67nYX4I"}))
+    sed["$schema"] = "http://json-schema.org/draft-07/schema#"
+    sed["$id"] = ""
+    scer = Schemer(sed=sed, code=MtrDex.Blake3_256)
+
+    validators = ValidatorCache(size=2)
+    with basing.openDB(name="edy") as db:
+        cache = CacheResolver(db=db)
+
+        # unresolved references are resolved lazily and not cached
+        validators.validator(scer.sed, resolver=cache)
+        assert validators.validators == {}
+
+        cache.add("Evcu66xr3s_x1k4IjwoQ3ZKEbfkdVLxLr7PW-67nYX4I", ref)
+        validator = validators.validator(scer.sed, resolver=cache)
+        assert list(validators.validators) == [scer.said]
+        assert validators.validator(scer.sed, resolver=cache) is validator
+
+    # cached validator carries its resolved references once the database is closed
+    assert validator.is_valid(dict(xy=dict(z=456)))
+    assert not validator.is_valid(dict(xy=dict(z="456")))
+
+    # least recently used validators are evicted
+    one = Schemer(sed={"$id": "", "type": "object"}, code=MtrDex.Blake3_256)
+    two = Schemer(sed={"$id": "", "type": "array"}, code=MtrDex.Blake3_256)
+    validators.validator(one.sed)
+    assert validators.validator(scer.sed) is validator
+    validators.validator(two.sed)
+    assert list(validators.validators) == [scer.said, two.said]
+
+    # schemas without a SAID are not cached
+    validators.validator(dict(type="object"))
+    assert len(validators.validators) == 2
+
+
 if __name__ == '__main__':
     test_json_schema()
     test_json_schema_dict()
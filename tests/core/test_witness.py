@@ -277,6 +277,57 @@ def test_indexed_witness_replay():
     """End Test"""
 
 
+def test_batched_witness_receipts():
+    """
+    Test a burst of events sent to witnesses in one stream and receipted with
+    one batched response stream per witness
+    """
+    salt = coring.Salter(raw=b'abcdef0123456789').qb64
+
+    with habbing.openHby(name="cam", base="test", salt=salt) as camHby, \
+         habbing.openHby(name="wes", base="test", salt=salt) as wesHby, \
+         habbing.openHby(name="wok", base="test", salt=salt) as wokHby:
+
+        wesHab = wesHby.makeHab(name='wes', isith='1', icount=1, transferable=False)
+        wesKvy = eventing.Kevery(db=wesHab.db, lax=False, local=False)
+        wokHab = wokHby.makeHab(name='wok', isith='1', icount=1, transferable=False)
+        wokKvy = eventing.Kevery(db=wokHab.db, lax=False, local=False)
+
+        wits = [wesHab.pre, wokHab.pre]
+        camHab = camHby.makeHab(name='cam', isith='1', icount=1, toad=2, wits=wits)
+        camKvy = eventing.Kevery(db=camHab.db, lax=False, local=False)
+
+        # one request carrying the inception and a burst of interactions
+        burst = bytearray(camHab.makeOwnInception())
+        for i in range(5):
+            burst.extend(camHab.interact(data=[dict(i=i)]))
+
+        rcts = []
+        for hab, kvy in ((wesHab, wesKvy), (wokHab, wokKvy)):
+            parsing.Parser().parse(ims=bytearray(burst), kvy=kvy)
+            assert kvy.kevers[camHab.pre].sn == 5
+            assert len(kvy.cues) == 6
+            rct = hab.processCues(kvy.cues)  # one response with receipts for all events
+            assert len(kvy.cues) == 0
+            rcts.append(rct)
+
+        for rct in rcts:  # each response parsed in a single pass
+            parsing.Parser().parse(ims=bytearray(rct), kvy=camKvy)
+
+        for sn in range(6):
+            dig = camHab.db.getKeLast(dbing.snKey(camHab.pre, sn))
+            assert len(camHab.db.getWigs(dbing.dgKey(camHab.pre, bytes(dig)))) == 2
+
+        # witness state lookup at the tip uses current key state, older sns walk the KEL
+        camHab.rotate(cuts=[wokHab.pre])
+        parsing.Parser().parse(ims=bytearray(camHab.makeOwnEvent(sn=6)), kvy=wesKvy)
+        assert [wit.qb64 for wit in wesKvy.fetchWitnessState(camHab.pre, 6)] == [wesHab.pre]
+        assert [wit.qb64 for wit in wesKvy.fetchWitnessState(camHab.pre, 3)] == wits
+
+    assert not os.path.exists(camHby.ks.path)
+    assert not os.path.exists(camHby.db.path)
+
+
 def test_nonindexed_witness_receipts():
     """
     Test event validation logic with witnesses on incept message
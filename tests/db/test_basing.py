@@ -10,7 +10,7 @@ import lmdb
 import pytest
 from hio.base import doing
 from keri.app import habbing
-from keri.core import coring, eventing
+from keri.core import coring, eventing, parsing
 from keri.core.coring import MtrDex
 from keri.core.coring import Serials, versify
 from keri.core.coring import Signer
@@ -1723,7 +1723,7 @@ def test_clean_baser():
         state = natHab.db.states.get(keys=natHab.pre)  # Serder instance
         assert state.sn == 6
         assert state.ked["f"] == '6'
-        assert natHab.db.env.stat()['entries'] == 58
+        assert natHab.db.env.stat()['entries'] == 63
 
         # test reopenDB with reuse  (because temp)
         with basing.reopenDB(db=natHab.db, reuse=True):
@@ -1732,7 +1732,7 @@ def test_clean_baser():
             assert ldig == natHab.kever.serder.saidb
             serder = coring.Serder(raw=bytes(natHab.db.getEvt(dbing.dgKey(natHab.pre,ldig))))
             assert serder.said == natHab.kever.serder.said
-            assert natHab.db.env.stat()['entries'] == 58
+            assert natHab.db.env.stat()['entries'] == 63
 
             # verify name pre kom in db
             data = natHab.db.habs.get(keys=natHab.name)
@@ -2140,5 +2140,59 @@ def test_baserdoer():
     """End Test"""
 
 
+def test_refresh_kevers():
+    """
+    Test reloading kevers when the key state in the database is later than the cached one
+    """
+    with habbing.openHab(name="test", transferable=True, temp=True) as (hby, hab):
+        state = hby.db.states.get(keys=hab.pre)
+        hab.interact()
+        later = hby.db.states.get(keys=hab.pre)
+        assert hab.kever.sn == 1
+
+        hby.db.refresh(hab.pre)  # cache current so kept
+        assert dict.__contains__(hby.db.kevers, hab.pre)
+
+        hby.db.refresh("EQf1hzB6s5saaQPdDAsEzSMEFoQx_WLsq93bjPu5wuqA")  # not cached is a noop
+
+        # state saved by another process differs from the cached kever
+        hby.db.states.pin(keys=hab.pre, val=state)
+        hby.db.refresh(hab.pre)
+        assert not dict.__contains__(hby.db.kevers, hab.pre)
+        assert hby.db.kevers[hab.pre].sn == 0  # reloaded from saved state
+        hby.db.states.pin(keys=hab.pre, val=later)
+        hby.db.refresh(hab.pre)
+        assert hby.db.kevers[hab.pre].sn == 1
+
+    # shared Kevery processes events under the database lock against fresh state
+    with habbing.openHby(name="wit", temp=True) as witHby, \
+            habbing.openHab(name="ctl", transferable=True, temp=True) as (ctlHby, ctlHab):
+        kvy = eventing.Kevery(db=witHby.db, lax=True, local=False, shared=True)
+        psr = parsing.Parser(kvy=kvy)
+        psr.parse(ims=ctlHab.makeOwnEvent(sn=0))
+        state = witHby.db.states.get(keys=ctlHab.pre)
+        psr.parse(ims=bytearray(ctlHab.interact()))
+
+        # another process logged sn 1 after this one cached the key state at sn 0
+        witHby.db.kevers[ctlHab.pre] = eventing.Kever(state=state, db=witHby.db)
+        assert witHby.db.kevers[ctlHab.pre].sn == 0
+        psr.parse(ims=bytearray(ctlHab.interact()))
+        assert witHby.db.lockDepth == 0
+        assert witHby.db.kevers[ctlHab.pre].sn == 2
+
+        # witness state and key state notices are read from fresh state too
+        witHby.db.kevers[ctlHab.pre] = eventing.Kever(state=state, db=witHby.db)
+        assert kvy.fetchWitnessState(ctlHab.pre, 2) == []
+        assert witHby.db.kevers[ctlHab.pre].sn == 2
+        witHby.db.kevers[ctlHab.pre] = eventing.Kever(state=state, db=witHby.db)
+        qry = eventing.query(route="ksn", query=dict(i=ctlHab.pre, src=ctlHab.pre))
+        kvy.processQuery(serder=qry, source=coring.Prefixer(qb64=ctlHab.pre))
+        assert kvy.cues[-1]["kin"] == "reply"
+        assert kvy.cues[-1]["serder"].ked["s"] == "2"
+        assert witHby.db.lockDepth == 0
+
+    """End Test"""
+
+
 if __name__ == "__main__":
     test_clean_baser()
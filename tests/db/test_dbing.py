@@ -794,5 +794,91 @@ def test_lmdber():
     """ End Test """
 
 
+def test_lmdber_locked():
+    """
+    Test LMDBer inter process lock
+    """
+    import fcntl
+
+    with openLMDB() as dber:
+        assert dber.lockDepth == 0
+        with dber.locked() as locker:
+            assert locker is dber
+            with dber.locked():  # reentrant within process
+                assert dber.lockDepth == 2
+            assert dber.lockDepth == 1
+
+            # another open of the lock file, as by another process, can not take the lock
+            with open(os.path.join(dber.path, "lock.keri"), "a") as other:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        assert dber.lockDepth == 0
+        assert dber.lockfile is None
+        with open(os.path.join(dber.path, "lock.keri"), "a") as other:
+            fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fcntl.flock(other, fcntl.LOCK_UN)
+
+    """ End Test """
+
+
+def test_lmdber_reading():
+    """
+    Test LMDBer reads sharing one read transaction
+    """
+    with openLMDB() as dber:
+        db = dber.env.open_db(key=b'beep.')
+        dbb = dber.env.open_db(key=b'boop.')
+        assert dber.putVal(db, b'a', b'1')
+        assert dber.putVal(dbb, b'b', b'2')
+
+        with dber.reading() as txn:
+            assert dber.rtxn is txn
+            with dber.reading() as inner:  # reentrant
+                assert inner is txn
+            assert dber.rtxn is txn
+
+            assert dber.setVal(db, b'a', b'3')  # writes not seen by snapshot
+            assert bytes(dber.getVal(db, b'a')) == b'1'
+            assert bytes(dber.getVal(dbb, b'b')) == b'2'
+            assert [(bytes(k), bytes(v)) for k, v in dber.getTopItemIter(db)] == [(b'a', b'1')]
+
+        assert dber.rtxn is None
+        assert bytes(dber.getVal(db, b'a')) == b'3'
+
+    """ End Test """
+
+
+def test_lmdber_watch():
+    """
+    Test LMDBer watchers told of changed data
+    """
+    class Watcher:
+        def __init__(self):
+            self.seen = []
+
+        def changed(self, topic, key):
+            self.seen.append((topic, key))
+
+    with openLMDB() as dber:
+        watcher = Watcher()
+        dber.watch("kel", watcher)
+        dber.changed("kel", "EA")
+        dber.changed("tel", "EB")  # not watched
+        assert watcher.seen == [("kel", "EA")]
+
+        dber.unwatch("kel", watcher)
+        assert "kel" not in dber.watchers
+        dber.changed("kel", "EC")
+        assert watcher.seen == [("kel", "EA")]
+
+        dber.watch("tel", watcher)
+        del watcher  # held weakly
+        assert len(dber.watchers["tel"]) == 0
+        dber.changed("tel", "ED")
+
+    """ End Test """
+
+
 if __name__ == "__main__":
     test_lmdber()
@@ -7,10 +7,12 @@ Includes Falcon ReST endpoints for testing purposes
 """
 import logging
 import time
+from collections import deque
 
 import falcon
 from falcon import testing
 from hio.base import tyming, doing
+from hio.core import http
 
 from keri import help, kering
 from keri.app import habbing
@@ -460,6 +462,18 @@ def test_get_oobi():
         assert serder.ked['a']['url'] == "http://127.0.0.1:5555"
         print(serder.pretty())
 
+        # Conditional request for unchanged key state is not modified
+        etag = rep.headers["ETag"]
+        assert rep.headers[ending.OOBI_AID_HEADER] == hab.pre
+        rep = client.simulate_get('/oobi', headers={"If-None-Match": etag})
+        assert rep.status == falcon.HTTP_NOT_MODIFIED
+        assert rep.content == b''
+
+        hab.interact()  # new key state changes the tag
+        rep = client.simulate_get('/oobi', headers={"If-None-Match": etag})
+        assert rep.status == falcon.HTTP_OK
+        assert rep.headers["ETag"] != etag
+
     """Done Test"""
 
 
@@ -522,5 +536,126 @@ def test_oobiery():
     """Done Test"""
 
 
+def test_oobiery_cache():
+    salt = coring.Salter(raw=b'0123456789abcdef').qb64
+    with habbing.openHby(name="oobi", base="test", salt=salt) as hby, \
+            habbing.openHby(name="pal", base="test", temp=True) as palHby:
+        hab = hby.makeHab(name="oobi")
+        msgs = bytearray()
+        msgs.extend(hab.makeEndRole(eid=hab.pre,
+                                    role=kering.Roles.controller,
+                                    stamp=help.nowIso8601()))
+        msgs.extend(hab.makeLocScheme(url='http://127.0.0.1:5661',
+                                      scheme=kering.Schemes.http,
+                                      stamp=help.nowIso8601()))
+        hab.psr.parse(ims=msgs)
+        palHby.psr.parse(ims=hab.makeOwnEvent(sn=0))
+
+        app = falcon.App()
+        ending.loadEnds(app, hby=hby, default=hab.pre)
+        server = http.Server(port=5661, app=app)
+        serverDoer = http.ServerDoer(server=server)
+
+        oobiery = ending.Oobiery(hby=palHby, limit=2, hostLimit=1)
+        parsed = []
+        parse = oobiery.parser.parse
+        oobiery.parser.parse = lambda ims: parsed.append(bytes(ims)) or parse(ims=ims)
+
+        url = f'http://127.0.0.1:5661/oobi/{hab.pre}/controller'
+        other = f'http://127.0.0.1:5661/oobi/{hab.pre}/controller?name=other'
+        palHby.db.oobis.pin(keys=(url,), val=basing.OobiRecord(date=helping.nowIso8601()))
+        palHby.db.oobis.pin(keys=(other,), val=basing.OobiRecord(date=helping.nowIso8601()))
+
+        doist = doing.Doist(limit=2.0, tock=0.03125, real=True)
+        doist.do(doers=[serverDoer, oobiery])
+
+        # Requests to one host are serialized by the host limit but both resolve
+        assert [cue["kin"] for cue in oobiery.cues] == ["resolved", "resolved"]
+        assert len(parsed) == 2
+        assert hab.pre in palHby.kevers
+        obr = palHby.db.roobi.get(keys=(url,))
+        assert obr.cid == hab.pre
+        assert obr.state == hab.kever.serder.said
+        assert oobiery.cached(url)
+
+        # Unchanged key state resolves from the cache with a conditional request
+        oobiery.cues.clear()
+        palHby.db.oobis.pin(keys=(url,), val=basing.OobiRecord(date=helping.nowIso8601()))
+        doist.do(doers=[serverDoer, oobiery])
+        assert [cue["kin"] for cue in oobiery.cues] == ["resolved"]
+        assert len(parsed) == 2
+
+        # Failed OOBIs back off exponentially
+        oobiery.backoff(url)
+        oobiery.backoff(url)
+        tries, due = oobiery.retries[url]
+        assert tries == 2
+        assert due == oobiery.tyme + 2 * oobiery.RetryDelay
+
+
+def test_oobiery_failures():
+    with habbing.openHby(name="pal", base="test", temp=True) as palHby:
+        oobiery = ending.Oobiery(hby=palHby, timeout=0.1)
+
+        class Client:
+            def __init__(self, response=None):
+                self.responses = deque([response] if response is not None else [])
+
+        def respond(status, ctype="application/json+cesr", errored=False):
+            return dict(status=status, headers={"Content-Type": ctype}, body=b"", errored=errored,
+                        error="refused" if errored else None)
+
+        base = "http://127.0.0.1:5662/oobi/"
+        failures = dict(notfound=Client(respond(404)), unavailable=Client(respond(503)),
+                        refused=Client(respond(None, errored=True)), silent=Client(),
+                        unknown=Client(respond(200, ctype="text/plain")))
+        for name, client in failures.items():
+            palHby.db.coobi.pin(keys=(base + name,), val=basing.OobiRecord(date=helping.nowIso8601()))
+            oobiery.clients[base + name] = (client, doing.Doer(), "127.0.0.1:5662", 0.0)
+
+        # a retried failure fails for good after RetryTries tries
+        flaky = base + "flaky"
+        palHby.db.coobi.pin(keys=(flaky,), val=basing.OobiRecord(date=helping.nowIso8601()))
+        oobiery.clients[flaky] = (Client(respond(503)), doing.Doer(), "127.0.0.1:5662", 0.0)
+        oobiery.retries[flaky] = (oobiery.RetryTries - 1, 0.0)
+
+        # URLs that are not OOBIs are not requested
+        bogus = "http://127.0.0.1:5662/bogus"
+        palHby.db.oobis.pin(keys=(bogus,), val=basing.OobiRecord(date=helping.nowIso8601()))
+
+        # 304 for a cached resolution that has since been removed requests it again without the etag
+        stale = base + "stale"
+        palHby.db.coobi.pin(keys=(stale,), val=basing.OobiRecord(date=helping.nowIso8601(), etag="abc"))
+        oobiery.clients[stale] = (Client(respond(304)), doing.Doer(), "127.0.0.1:5662", 0.0)
+
+        doist = doing.Doist(limit=0.25, tock=0.03125)
+        doist.do(doers=[oobiery])
+
+        # every failure is cued as failed
+        assert sorted(cue["oobi"] for cue in oobiery.cues) == sorted([base + name for name in failures] +
+                                                                     [flaky, bogus])
+        assert all(cue["kin"] == "failed" for cue in oobiery.cues)
+
+        # failures that may pass on retry are retried with backoff
+        for name in ("unavailable", "refused", "silent"):
+            assert palHby.db.eoobi.get(keys=(base + name,)) is not None
+            assert palHby.db.foobi.get(keys=(base + name,)) is None
+            assert oobiery.retries[base + name][0] == 1
+
+        # the rest fail for good
+        for url in (base + "notfound", base + "unknown", flaky, bogus):
+            assert palHby.db.foobi.get(keys=(url,)) is not None
+            assert palHby.db.eoobi.get(keys=(url,)) is None
+            assert palHby.db.oobis.get(keys=(url,)) is None
+            assert url not in oobiery.retries
+
+        assert palHby.db.roobi.get(keys=(stale,)) is None
+        obr = palHby.db.coobi.get(keys=(stale,)) or palHby.db.oobis.get(keys=(stale,))
+        assert obr.etag is None
+        assert not oobiery.cached(stale)
+
+        doist.exit()
+
+
 if __name__ == '__main__':
     test_signature_designature()
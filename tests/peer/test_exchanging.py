@@ -3,9 +3,14 @@
 tests.peer.test_exchanging module
 
 """
+from datetime import timedelta
+
+import pytest
 
 from keri.app import habbing, forwarding, storing, signing
-from keri.core import coring
+from keri.core import coring, parsing
+from keri.help import helping
+from keri.kering import ValidationError
 from keri.peer import exchanging
 
 
@@ -30,7 +35,11 @@ def test_exchanger():
                                indexed=True)
 
         exc.processEvent(serder=fwd, source=hab.kever.prefixer, sigers=exnsigs, sadsigs=[(sadsig.pather, sadsig.sigers)])
+        assert len(forwarder.msgs) == 0  # queued for verification off the parse path
+        assert len(exc.queues['/fwd']) == 1
 
+        exc.processQueues()
+        assert len(exc.queues['/fwd']) == 0
         assert len(forwarder.msgs) == 1
         msg = forwarder.msgs.popleft()
 
@@ -38,3 +47,126 @@ def test_exchanger():
         assert msg["modifiers"] == {'pre': 'EBCAFG', 'topic': '/delegation'}
         assert msg["pre"].qb64b == hab.kever.prefixer.qb64b
         assert msg["attachments"] == []
+
+        # replayed messages are rejected before any signature work
+        with pytest.raises(ValidationError):
+            exc.processEvent(serder=fwd, source=hab.kever.prefixer, sigers=exnsigs)
+        assert len(exc.queues['/fwd']) == 0
+        assert exc.stats['/fwd'].duplicates == 1
+
+        # delivery to a handler stops at its concurrency and new messages are dropped when its queue is full
+        forwarder.concurrency = 1
+        forwarder.queueSize = 2
+        fwds = [exchanging.exchange(route='/fwd', modifiers=dict(pre="EBCAFG", topic=f"/delegation{i}"),
+                                    payload=ser.ked) for i in range(3)]
+        for fwd in fwds[:2]:
+            exc.processEvent(serder=fwd, source=hab.kever.prefixer, sigers=hab.sign(ser=fwd.raw, indexed=True))
+        with pytest.raises(ValidationError):
+            exc.processEvent(serder=fwds[2], source=hab.kever.prefixer, sigers=hab.sign(ser=fwds[2].raw,
+                                                                                         indexed=True))
+
+        exc.processQueues()
+        assert len(forwarder.msgs) == 1
+        assert len(exc.queues['/fwd']) == 1
+
+        metrics = exc.metrics()['/fwd']
+        assert metrics["depth"] == 1
+        assert metrics["inflight"] == 1
+        assert (metrics["received"], metrics["duplicates"], metrics["dropped"], metrics["delivered"]) == (3, 1, 1, 2)
+        assert metrics["peak"] >= metrics["mean"] >= 0.0
+
+        forwarder.msgs.popleft()
+        exc.processQueues()
+        assert len(forwarder.msgs) == 1
+        assert exc.metrics()['/fwd']["depth"] == 0
+
+        # a forged non-trans signature is not escrowed so it does not block the genuine message
+        forwarder.msgs.popleft()
+        signer = coring.Signer(transferable=False)
+        fwd = exchanging.exchange(route='/fwd', modifiers=dict(pre="EBCAFG", topic="/nontrans"), payload=ser.ked)
+        forged = signer.sign(ser=fwds[0].raw)
+        exc.processEvent(serder=fwd, cigars=[forged])
+        exc.processQueues()
+        assert len(forwarder.msgs) == 0
+        assert exc.sender(fwd, cigars=[forged]) not in exc.seen
+
+        exc.processEvent(serder=fwd, cigars=[signer.sign(ser=fwd.raw)])
+        exc.processQueues()
+        assert len(forwarder.msgs) == 1
+
+
+def test_seener(monkeypatch):
+    now = helping.fromIso8601("2022-06-01T12:00:00.000000+00:00")
+    monkeypatch.setattr(helping, "nowUTC", lambda: now)
+
+    with habbing.openHby(name="seen", base="test") as hby:
+        seen = exchanging.Seener(db=hby.db, delta=timedelta(seconds=100), size=2)
+        seen.add(("Eabc", "Bsid"))
+        seen.add(("Edef", "Bsid"))
+        assert ("Eabc", "Bsid") in seen
+        assert ("Eabc", "Bred") not in seen  # same message from another sender
+        assert ("Exyz", "Bsid") not in seen
+
+        # oldest bucket is spilled to the database once memory is full and still seen
+        now += timedelta(seconds=20)
+        seen.add(("Exyz", "Bsid"))
+        assert len(seen) == 1
+        assert hby.db.esen.get(keys=("Eabc", "Bsid")) is not None
+        assert ("Eabc", "Bsid") in seen and ("Edef", "Bsid") in seen and ("Exyz", "Bsid") in seen
+
+        seen.discard(("Edef", "Bsid"))
+        assert ("Edef", "Bsid") not in seen
+
+        # everything expires once past the window
+        now += timedelta(seconds=150)
+        assert ("Eabc", "Bsid") not in seen
+        assert ("Exyz", "Bsid") not in seen
+        assert len(seen) == 0
+        assert hby.db.esen.get(keys=("Eabc", "Bsid")) is None
+
+
+def test_exchanger_escrow(monkeypatch):
+    now = helping.nowUTC()
+    monkeypatch.setattr(helping, "nowUTC", lambda: now)
+
+    with habbing.openHab(name="esid", base="test", salt=b'0123456789abcdef') as (sidHby, sidHab), \
+            habbing.openHab(name="ered", base="test", salt=b'abcdef0123456789') as (redHby, redHab), \
+            habbing.openHab(name="ewat", base="test", salt=b'0123456789abcdeg') as (watHby, watHab):
+        mbx = storing.Mailboxer(hby=sidHby, temp=True)
+        forwarder = forwarding.ForwardHandler(hby=sidHby, mbx=mbx)
+        exc = exchanging.Exchanger(hby=sidHby, handlers=[forwarder])
+
+        # red's key state is unknown so its message is escrowed waiting on red at sn 0
+        fwd = exchanging.exchange(route='/fwd', modifiers=dict(pre=sidHab.pre, topic="/red"), payload=dict())
+        exc.processEvent(serder=fwd, source=redHab.kever.prefixer, sigers=redHab.sign(ser=fwd.raw, indexed=True))
+        exc.processQueues()
+        assert len(forwarder.msgs) == 0
+        assert [keys for keys, _ in sidHby.db.epwt.getItemIter()] == [(redHab.pre, f"{0:032x}")]
+        assert len(list(sidHby.db.epst.getItemIter())) == 1
+
+        exc.processEscrow()  # first call is a full pass
+        assert exc.swept is not None
+        assert exc.escrowMetrics() == dict(escrowed=1, waiting=1, woken=0, unescrowed=0, expired=0)
+
+        # accepting red's key state wakes the escrowed message
+        for msg in redHby.db.clonePreIter(pre=redHab.pre):
+            parsing.Parser().parse(ims=bytearray(msg), kvy=sidHby.kvy)
+        assert redHab.pre in exc.woken
+
+        exc.processEscrow()
+        assert len(forwarder.msgs) == 1
+        assert exc.escrowMetrics() == dict(escrowed=0, waiting=0, woken=0, unescrowed=1, expired=0)
+
+        # escrowed messages expire by the time index
+        fwd = exchanging.exchange(route='/fwd', modifiers=dict(pre=sidHab.pre, topic="/wat"), payload=dict())
+        exc.processEvent(serder=fwd, source=watHab.kever.prefixer, sigers=watHab.sign(ser=fwd.raw, indexed=True))
+        exc.processQueues()
+        assert exc.escrowMetrics()["escrowed"] == 1
+
+        now += timedelta(seconds=exc.TimeoutPSE + 1)
+        exc.processEscrow()
+        assert exc.escrowMetrics()["escrowed"] == 0
+        assert exc.expired == 1
+        assert list(sidHby.db.epst.getItemIter()) == []
+        assert exc.escrowMetrics()["waiting"] == 0
+        assert list(sidHby.db.epwt.getItemIter()) == []
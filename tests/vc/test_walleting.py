@@ -8,7 +8,8 @@ from keri.app import habbing, signing
 from keri.core import coring, scheming, parsing
 from keri.core.eventing import SealEvent
 from keri.vc.proving import credential
-from keri.vdr import verifying, credentialing
+from keri.vc.walleting import Wallet
+from keri.vdr import verifying, credentialing, viring
 
 
 def test_wallet(seeder, mockCoringRandomNonce):
@@ -88,3 +89,43 @@ def test_wallet(seeder, mockCoringRandomNonce):
         schema = verifier.reger.schms.get(schema)
         assert len(schema) == 1
         assert schema[0].qb64 == creder.said
+
+
+def test_wallet_query():
+    with viring.openReger() as reger:
+        wallet = Wallet(reger=reger)
+        saids = [coring.Saider(sad=dict(d="", n=i), label=coring.Ids.d).qb64 for i in range(6)]
+        ordered = sorted(saids)
+        for i, said in enumerate(saids):
+            saider = coring.Saider(qb64=said)
+            reger.saved.pin(keys=said, val=saider)
+            reger.schms.add(keys="ESchema0" if i < 4 else "ESchema1", val=saider)
+            reger.issus.add(keys="EIssuer0" if i % 2 == 0 else "EIssuer1", val=saider)
+            reger.subjs.add(keys="ESubject", val=saider)
+            reger.vcst.pin(keys=said, val=viring.CredentialStateRecord(ilk=coring.Ilks.rev if i == 0 else coring.Ilks.iss,
+                                                                        sn=0, said=said, anchor=dict()))
+
+        def query(**kwa):
+            return [saider.qb64 for saider in wallet.query(**kwa)]
+
+        assert query() == ordered
+        assert query(subject="ESubject") == ordered
+        assert query(schema="ESchema0") == sorted(saids[:4])
+        assert query(schema="ESchema0", issuer="EIssuer0") == sorted([saids[0], saids[2]])
+        assert query(schema="ESchema0", issuer="EIssuer0", status="issued") == [saids[2]]
+        assert query(issuer="EIssuer1", status="revoked") == []
+        assert query(schema="EUnknown") == []
+
+        # offset and limit pages
+        assert query(subject="ESubject", offset=2, limit=3) == ordered[2:5]
+        assert query(subject="ESubject", limit=0) == []
+
+        # cursor pages
+        page = query(subject="ESubject", limit=4)
+        assert page == ordered[:4]
+        assert query(subject="ESubject", after=page[-1]) == ordered[4:]
+        assert query(after=page[-1], limit=1) == ordered[4:5]
+
+        assert wallet.status(saids[0]) == "revoked"
+        assert wallet.status(saids[1]) == "issued"
+        assert wallet.status("EUnknown") is None
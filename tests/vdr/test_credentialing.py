@@ -0,0 +1,47 @@
+# -*- encoding: utf-8 -*-
+"""
+tests.vdr.credentialing module
+
+"""
+from keri.app import habbing, grouping
+from keri.core import coring
+from keri.vdr import credentialing
+
+
+def test_bulk_issue():
+    with habbing.openHby(name="bulk", temp=True) as hby:
+        hab = hby.makeHab(name="issuer")
+        rgy = credentialing.Regery(hby=hby, name="bulk", temp=True)
+        registrar = credentialing.Registrar(hby=hby, rgy=rgy, counselor=grouping.Counselor(hby=hby))
+
+        registry = registrar.incept(name="test", pre=hab.pre)
+        rgy.processEscrows()
+        registrar.processEscrows()
+        assert registrar.complete(pre=registry.regk, sn=0)
+        assert len(registrar.witPub.msgs) == 1
+        registrar.witPub.msgs.clear()
+        registrar.witDoer.msgs.clear()
+
+        saids = [coring.Saider(sad=dict(d="", n=i), label=coring.Ids.d).qb64 for i in range(3)]
+        registrar.MaxAnchors = 2
+        sn = hab.kever.sn
+        issued = registrar.bulkIssue(regk=registry.regk, saids=saids)
+        assert issued == [(said, 0) for said in saids]
+
+        # seals are anchored MaxAnchors at a time in one interaction event each
+        assert hab.kever.sn == sn + 2
+        anchors = [coring.Serder(raw=hab.makeOwnEvent(sn=sn + 1)), coring.Serder(raw=hab.makeOwnEvent(sn=sn + 2))]
+        assert [[seal["i"] for seal in anchor.ked["a"]] for anchor in anchors] == [saids[:2], saids[2:]]
+        assert list(registrar.witDoer.msgs) == [dict(pre=hab.pre, sn=sn + 1), dict(pre=hab.pre, sn=sn + 2)]
+
+        rgy.processEscrows()
+        registrar.processEscrows()
+        for said in saids:
+            assert registrar.complete(pre=said, sn=0)
+            assert registry.tever.vcState(said).ked["et"] == coring.Ilks.iss
+
+        # TEL events anchored together are sent to the witnesses together
+        assert len(registrar.witPub.msgs) == 2
+        assert [coring.Serder(raw=msg["msg"]).pre for msg in registrar.witPub.msgs] == [saids[0], saids[2]]
+
+        rgy.close()
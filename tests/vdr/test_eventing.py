@@ -742,6 +742,26 @@ def test_tevery():
         assert status.ked["et"] == Ilks.rev
         assert status.sn == 1
 
+        # status is read from the credential state index maintained as events are logged
+        rec = reg.vcst.get(keys=vcdig.decode("utf-8"))
+        assert rec.ilk == Ilks.rev
+        assert rec.sn == 1
+        assert rec.said == rev.said
+        assert rec.anchor == dict(s=seqner.sn, d=diger.qb64)
+        assert rec.ra == {}
+        assert tev.vcSn(vcdig.decode("utf-8")) == 1
+        assert status.ked["d"] == rev.said
+        assert status.ked["a"] == dict(s=seqner.sn, d=diger.qb64)
+
+        # credentials logged without the index are indexed from their TEL on first lookup
+        reg.vcst.rem(keys=vcdig.decode("utf-8"))
+        backfilled = tev.vcState(vcdig.decode("utf-8"))
+        assert (backfilled.ked["et"], backfilled.ked["d"], backfilled.ked["a"]) == (Ilks.rev, rev.said, status.ked["a"])
+        assert reg.vcst.get(keys=vcdig.decode("utf-8")) == rec
+
+        assert tev.vcState("EKnown_rNhUCEYRvV_ywlUPlcSYDJpTshkNZTtDTbGZM") is None
+        assert tev.vcSn("EKnown_rNhUCEYRvV_ywlUPlcSYDJpTshkNZTtDTbGZM") is None
+
 
 def test_tevery_process_escrow(mockCoringRandomNonce):
     with basing.openDB() as db, keeping.openKS() as kpr, viring.openReger() as reg:
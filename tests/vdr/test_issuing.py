@@ -44,6 +44,29 @@ def test_issuer(mockHelpingNowUTC):
         issuer.anchorMsg(pre=rev.pre, regd=rev.said, seqner=seqner, saider=hab.kever.serder.saider)
         regery.processEscrows()
 
+        snapshot = regery.reger.snapshot(issuer.regk)
+        assert creder.said in snapshot
+        assert snapshot.sn == 1
+
+        serder = coring.Serder(raw=issuer.revocations())
+        assert serder.ked["r"] == f"/tsn/revoked/{issuer.regk}"
+        assert serder.ked["a"] == dict(i=issuer.regk, s="1", r=[creder.said])
+
+        # revocations already in TELs are indexed when opening a database without the index
+        regery.reger.rvks.rem(keys=issuer.regk)
+        regery.reger.snapshots.clear()
+        assert creder.said not in regery.reger.snapshot(issuer.regk)
+        regery.reger.snapshots.clear()
+        regery.reger.indexRevocations()
+        assert creder.said in regery.reger.snapshot(issuer.regk)
+
+        # the index is only built once for a database, reopening does not scan the TELs again
+        assert regery.reger.idxs.get(keys=("rvks",)) is not None
+        regery.reger.rvks.rem(keys=issuer.regk)
+        regery.reger.reopen()
+        regery.reger.snapshots.clear()
+        assert creder.said not in regery.reger.snapshot(issuer.regk)
+
         with basing.openDB(name="bob") as db, keeping.openKS(name="bob") as kpr:
             hby, hab = buildHab(db, kpr)
             # issuer, not allowed to issue backers
@@ -227,6 +250,52 @@ def test_issuer(mockHelpingNowUTC):
     """ End Test """
 
 
+def test_tever_cache():
+    with basing.openDB(name="bob") as db, keeping.openKS(name="bob") as kpr:
+        hby, hab = buildHab(db, kpr)
+        regery = credentialing.Regery(hby=hby, name="bob", temp=True)
+
+        regs = []
+        for name in ("local", "remote"):
+            issuer = regery.makeRegistry(prefix=hab.pre, name=name, noBackers=True)
+            rseal = SealEvent(issuer.regk, "0", issuer.regd)._asdict()
+            hab.interact(data=[rseal])
+            seqner = coring.Seqner(sn=hab.kever.sn)
+            issuer.anchorMsg(pre=issuer.regk, regd=issuer.regd, seqner=seqner, saider=hab.kever.serder.saider)
+            regery.processEscrows()
+            regs.append(issuer.regk)
+
+        local, remote = regs
+        tevers = regery.reger.tevers
+        assert list(tevers.keys()) == [local, remote]
+
+        # registry learned from another issuer is not pinned so is evicted, local registry is pinned
+        regery.reger.registries.discard(remote)
+        tevers.size = 0
+        tevers.evict()
+        assert list(tevers.keys()) == [local]
+        assert tevers.evictions == 1
+
+        hits = tevers.hits
+        tever = tevers[local]
+        assert tever.regk == local
+        assert tevers.hits == hits + 1
+
+        # evicted tever is reloaded from its state in the database
+        tevers.size = 1
+        tever = tevers[remote]
+        assert tever.regk == remote
+        assert tever.sn == 0
+        assert tevers.misses == 1
+        assert list(tevers.keys()) == [local, remote]
+
+        tevers.size = 0
+        tevers.evict()
+        assert remote in tevers  # read through
+        assert list(tevers.keys()) == [local]
+        assert tevers.misses == 2
+
+
 def buildHab(db, ks, name="test"):
     """Utility to setup Habery and Hab for testing purposes
     Returns:
@@ -12,7 +12,7 @@ from keri.core import eventing as ceventing, scheming
 from keri.core import parsing, coring
 from keri.core.eventing import SealEvent
 from keri.help import helping
-from keri.vc import proving
+from keri.vc import proving, protocoling
 from keri.vdr import verifying, credentialing, eventing
 
 
@@ -77,15 +77,31 @@ def test_verifier(seeder):
         assert cue["kin"] == "telquery"
         q = cue["q"]
         assert q["ri"] == issuer.regk
+
+        # first pass sweeps all escrows, credential stays escrowed waiting on its issuance
+        verifier.processEscrows()
+        assert verifier.swept is not None
+        assert (verifier.reger.mre, creder.said) in verifier.waiting[("tel", creder.said)]
+        verifier.cues.clear()
+
+        # unrelated writes do not wake the escrowed credential
+        hab.interact()
+        verifier.processEscrows()
+        assert verifier.woken == set()
+        assert regery.reger.mre.get(keys=creder.said) is not None
+
         iss = issuer.issue(said=creder.said)
         rseal = SealEvent(iss.pre, "0", iss.said)._asdict()
         hab.interact(data=[rseal])
         seqner = coring.Seqner(sn=hab.kever.sn)
         issuer.anchorMsg(pre=iss.pre, regd=iss.said, seqner=seqner, saider=hab.kever.serder.saider)
         regery.processEscrows()
+        assert ("tel", creder.said) in verifier.woken
 
         # Now that the credential has been issued, process escrows and it will find the TEL event
         verifier.processEscrows()
+        assert regery.reger.mre.get(keys=creder.said) is None
+        assert ("tel", creder.said) not in verifier.waiting
 
         assert len(verifier.cues) == 1
         cue = verifier.cues.popleft()
@@ -524,6 +540,123 @@ def test_verifier_chained_credential(seeder):
         assert cue["kin"] == "saved"
         assert cue["creder"].raw == vLeiCreder.raw
 
+        # verification of Ron's credential as a chain node is memoized by issuer sn and revocation
+        issuer, regk, sn, revoked, state, _ = vicverfer.chains[creder.said]
+        assert (issuer, regk, sn, revoked) == (ron.pre, roniss.regk, ron.kever.sn, False)
+        assert vicverfer.verifyChain(creder.said) is state
+
+        # chained credentials are exported first and shared KELs, TELs and credentials only once
+        assert [c.said for c in vicreg.reger.graph([vLeiCreder.said, creder.said])] == [creder.said,
+                                                                                         vLeiCreder.said]
+        items = list(vicreg.reger.exportIter(saids=[vLeiCreder.said, creder.said], db=vicHby.db))
+        keys = []
+        for kind, key, msg in items:
+            if (kind, key) not in keys:
+                keys.append((kind, key))
+        assert keys == [("kel", ron.pre), ("tel", roniss.regk), ("tel", creder.said), ("acdc", creder.said),
+                        ("kel", ian.pre), ("tel", ianiss.regk), ("tel", vLeiCreder.said),
+                        ("acdc", vLeiCreder.said)]
+        kind, key, msg = items[-1]
+        assert msg.startswith(vLeiCreder.raw)
+        assert len(msg) > len(vLeiCreder.raw)  # with signatures
+        assert vicreg.reger.rtxn is None
+        assert vicHby.db.rtxn is None
+
+        # no read transaction is held while a partly consumed export is suspended
+        exporter = vicreg.reger.exportIter(saids=[creder.said], db=vicHby.db)
+        next(exporter)
+        assert vicreg.reger.rtxn is None
+        assert vicHby.db.rtxn is None
+        exporter.close()
+
+        cache = dict()
+        vLeiCred = vicreg.reger.cloneCreds([vLeiCreder.saider], cache=cache)[0]
+        cred = vicreg.reger.cloneCreds([creder.saider], cache=cache)[0]
+        assert vLeiCred["chains"][0] is cred
+
+        # batch verification orders chained credentials first and shares schema and key state lookups
+        creds = [dict(creder=vLeiCreder, sadsigers=vLeiSadsigers, sadcigars=vLeiSadcigars),
+                 dict(creder=creder, sadsigers=sadsigers, sadcigars=sadcigars)]
+        bysaid = {cred["creder"].said: cred for cred in creds}
+        assert [c["creder"].said for c in vicverfer.depthFirst(creds, bysaid)] == [creder.said, vLeiCreder.said]
+        verdicts = protocoling.verifyPresentations(vicverfer, creds=creds)
+        assert verdicts == {creder.said: None, vLeiCreder.said: None}
+        assert vicverfer.batch is None
+        vicverfer.cues.clear()
+
+        # several presentations sharing a chain, one with a credential whose signature does not verify
+        forgedCreder = proving.credential(issuer=ian.pre,
+                                          schema=vLeiSchema,
+                                          subject=d,
+                                          status=ianiss.regk,
+                                          source=chain,
+                                          rules=[dict(usageDisclaimer="Use with care.")])
+        forgedSadsigers, forgedSadcigars = signing.signPaths(hab=ian, serder=forgedCreder, paths=[[]])
+        forgedSadsigers = [(pather, prefixer, seqner, saider,
+                            [coring.Siger(raw=bytes(64), code=siger.code, index=siger.index) for siger in sigers])
+                           for (pather, prefixer, seqner, saider, sigers) in forgedSadsigers]
+        iss = ianiss.issue(said=forgedCreder.said)
+        rseal = SealEvent(iss.pre, "0", iss.said)._asdict()
+        ian.interact(data=[rseal])
+        seqner = coring.Seqner(sn=ian.kever.sn)
+        ianiss.anchorMsg(pre=iss.pre, regd=iss.said, seqner=seqner, saider=ian.kever.serder.saider)
+        ianreg.processEscrows()
+        for msg in ian.db.clonePreIter(pre=ian.pre):
+            parsing.Parser().parse(ims=bytearray(msg), kvy=vickvy, tvy=victvy)
+        for msg in ianverfer.reger.clonePreIter(pre=forgedCreder.said):
+            parsing.Parser().parse(ims=bytearray(msg), kvy=vickvy, tvy=victvy)
+
+        presentations = [
+            protocoling.presentationExchangeExn(db=vicHby.db, reger=vicreg.reger,
+                                                credentials=[(vLeiCreder, vLeiSadsigers, vLeiSadcigars)]),
+            protocoling.presentationExchangeExn(db=vicHby.db, reger=vicreg.reger,
+                                                credentials=[(creder, sadsigers, sadcigars)]),
+            dict(presentation_submission=dict(descriptor_map=[]),
+                 verifiableCredential=[forgedCreder.said, creder.said]),
+        ]
+        creds.append(dict(creder=forgedCreder, sadsigers=forgedSadsigers, sadcigars=forgedSadcigars))
+        verdicts = protocoling.verifyPresentations(vicverfer, creds=creds, presentations=presentations)
+        assert verdicts[vLeiCreder.said] is None
+        assert verdicts[creder.said] is None
+        assert isinstance(verdicts[forgedCreder.said], kering.MissingSignatureError)
+        assert vicverfer.chains[creder.said][4] is not None  # shared chain verified once
+        creds.pop()
+        vicverfer.cues.clear()
+
+        # received presentation proofs are verified as one batch and only verified credentials are proven
+        proofHandler = protocoling.PresentationProofHandler(verifier=vicverfer)
+        for payload in presentations:
+            proofHandler.msgs.append(dict(pre=han.pre, payload=payload))
+        tyme = 0.0
+        proofDo = proofHandler.do(tymth=lambda: tyme)
+        next(proofDo)
+        next(proofDo)
+        assert list(proofHandler.proofs) == [(han.pre, creder.said), (han.pre, vLeiCreder.said),
+                                             (han.pre, creder.said), (han.pre, creder.said)]
+
+        # proof of a credential not yet saved by the Verifier is held and proven once it is saved
+        assert proofHandler.held == {(han.pre, forgedCreder.said): 0.0}
+        proofHandler.proofs.clear()
+        next(proofDo)
+        assert len(proofHandler.proofs) == 0
+        vicreg.reger.creds.put(keys=forgedCreder.said, val=forgedCreder)
+        vicreg.reger.saved.pin(keys=forgedCreder.said, val=forgedCreder.saider)
+        next(proofDo)
+        assert list(proofHandler.proofs) == [(han.pre, forgedCreder.said)]
+        assert proofHandler.held == {}
+        vicreg.reger.saved.rem(keys=forgedCreder.said)
+        vicreg.reger.creds.rem(keys=forgedCreder.said)
+
+        # and rejected once held too long
+        proofHandler.proofs.clear()
+        proofHandler.msgs.append(dict(pre=han.pre, payload=presentations[2]))
+        next(proofDo)
+        assert list(proofHandler.proofs) == [(han.pre, creder.said)]
+        tyme += proofHandler.TimeoutHeld + 1
+        next(proofDo)
+        assert proofHandler.held == {}
+        assert list(proofHandler.proofs) == [(han.pre, creder.said)]
+
         # Revoke Ian's issuer credential and vic should no longer be able to verify
         # Han's credential that's linked to it
         rev = roniss.revoke(said=creder.said)
@@ -544,4 +677,18 @@ def test_verifier_chained_credential(seeder):
         with pytest.raises(kering.RevokedChainError):
             vicverfer.processCredential(vLeiCreder, sadsigers=vLeiSadsigers, sadcigars=vLeiSadcigars)
 
+        payload = protocoling.presentationExchangeExn(db=vicHby.db, reger=vicreg.reger,
+                                                      credentials=[(vLeiCreder, vLeiSadsigers, vLeiSadcigars)])
+        payload["verifiableCredential"].append(ron.pre)  # not a held credential
+        verdicts = protocoling.verifyPresentations(vicverfer, creds=creds, presentations=[payload])
+        assert isinstance(verdicts[vLeiCreder.said], kering.RevokedChainError)
+        assert isinstance(verdicts[creder.said], kering.InvalidCredentialStateError)
+        assert isinstance(verdicts[ron.pre], kering.MissingEntryError)
+
+        # the revocation and issuer interaction invalidated the memoized verification
+        issuer, regk, sn, revoked, state, _ = vicverfer.chains[creder.said]
+        assert (sn, revoked) == (ron.kever.sn, True)
+        assert creder.said in vicreg.reger.snapshot(roniss.regk)
+        assert state.ked["et"] == coring.Ilks.rev
+
     """End Test"""